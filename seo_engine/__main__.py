@@ -0,0 +1,7 @@
+"""Allow ``python -m seo_engine``."""
+
+import sys
+
+from seo_engine.cli import main
+
+sys.exit(main())
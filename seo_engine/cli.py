@@ -0,0 +1,278 @@
+"""Command-line entry point for SEO intake.
+
+Subcommand handlers import their stages on demand, so ``seo-intake --help``
+and single-stage runs never pay for BeautifulSoup or unused stages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any, List, Optional
+
+
+def _read_bytes(path: Optional[str]) -> Optional[bytes]:
+    if not path:
+        return None
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def _emit(payload: Any, output: Optional[str]) -> None:
+    from seo_engine.utils.json_stable import json_dump_stable, json_dumps_stable
+
+    if output:
+        json_dump_stable(payload, output)
+    else:
+        sys.stdout.write(json_dumps_stable(payload))
+        sys.stdout.write("\n")
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    from seo_engine.pipeline import run_pipeline
+    from seo_engine.render.clipboard import ClipboardBudget
+    from seo_engine.utils.dag import DagReport
+    from seo_engine.utils.guard import ResourceLimits
+
+    report = DagReport()
+    artifacts_dir = run_pipeline(
+        _read_bytes(args.sitemap) or b"",
+        [_read_bytes(path) or b"" for path in args.html],
+        args.out,
+        keyword_csv=_read_bytes(args.keywords),
+        performance_csv=_read_bytes(args.performance),
+        dish_state_path=args.dish_state,
+        verify_incremental=args.verify_incremental,
+        token_stats_path=args.token_stats,
+        site=args.site,
+        run_id=args.run_id,
+        sqlite_artifacts=args.sqlite,
+        artifact_format=args.format,
+        profile=args.profile,
+        clipboard_budget=ClipboardBudget() if args.clipboard_summary else None,
+        max_workers=args.workers,
+        use_processes=args.processes,
+        stage_report=report,
+        fetch_locations=args.fetch_locations,
+        keyword_positions=args.keyword_positions,
+        fetch_cache_dir=args.fetch_cache,
+        extractors=tuple(args.extract),
+        limits=None
+        if not args.guard
+        else ResourceLimits(
+            max_bytes=args.max_bytes,
+            max_seconds=args.max_seconds,
+            max_elements=args.max_elements,
+        ),
+        checkpoint_dir=args.checkpoint_dir,
+    )
+    if args.stage_report:
+        from seo_engine.utils.json_stable import json_dumps_stable
+
+        sys.stderr.write(json_dumps_stable(report.to_dict()))
+        sys.stderr.write("\n")
+    print(artifacts_dir)
+    return 0
+
+
+def _cmd_sitemap(args: argparse.Namespace) -> int:
+    from seo_engine.ingest.canonical import UrlCanonicalizer
+    from seo_engine.ingest.sitemap import parse_sitemap_entries
+
+    canonicalizer = UrlCanonicalizer()
+    entries: List[Any] = []
+    excluded: List[str] = []
+    for path in args.sitemap:
+        found, skipped = parse_sitemap_entries(_read_bytes(path) or b"", canonicalizer=canonicalizer)
+        entries.extend({"url": url, "lastmod": lastmod} for url, lastmod in found)
+        excluded.extend(skipped)
+    _emit(
+        {
+            "urls": entries,
+            "excluded": excluded,
+            "duplicate_urls_dropped": canonicalizer.duplicates_dropped,
+        },
+        args.output,
+    )
+    return 0
+
+
+def _cmd_core_pages(args: argparse.Namespace) -> int:
+    from seo_engine.ingest.sitemap import parse_sitemap, split_item_urls
+    from seo_engine.pipeline import _stable_core_pages
+    from seo_engine.select.core_pages import rank_core_pages
+
+    urls, _ = parse_sitemap(_read_bytes(args.sitemap) or b"")
+    _, non_item_urls = split_item_urls(urls)
+    _emit({"urls": _stable_core_pages(rank_core_pages(non_item_urls))}, args.output)
+    return 0
+
+
+def _cmd_dishes(args: argparse.Namespace) -> int:
+    from seo_engine.ingest.sitemap import parse_sitemap, split_item_urls
+    from seo_engine.select.dishes import build_dish_taxonomy
+
+    urls, _ = parse_sitemap(_read_bytes(args.sitemap) or b"")
+    item_urls, _ = split_item_urls(urls)
+    _emit({"dishes": build_dish_taxonomy(item_urls)}, args.output)
+    return 0
+
+
+def _cmd_locations(args: argparse.Namespace) -> int:
+    from seo_engine.extract.dedupe import LocationDedupeAudit
+    from seo_engine.extract.locations import extract_locations
+
+    audit = LocationDedupeAudit()
+    locations = extract_locations([_read_bytes(path) or b"" for path in args.html], audit=audit)
+    _emit({"locations": locations, "merges": audit.decisions}, args.output)
+    return 0
+
+
+def _cmd_ahrefs(args: argparse.Namespace) -> int:
+    from seo_engine.ingest.ahrefs import build_ahrefs_overview
+
+    overview = build_ahrefs_overview(_read_bytes(args.keywords), _read_bytes(args.performance))
+    _emit({"overview": overview}, args.output)
+    return 0
+
+
+def _cmd_diff(args: argparse.Namespace) -> int:
+    from seo_engine.diff.artifacts import write_diff
+
+    print(write_diff(args.old, args.new, args.out))
+    return 0
+
+
+def _cmd_publish(args: argparse.Namespace) -> int:
+    from seo_engine.store.artifact_store import ArtifactStore
+
+    manifest = ArtifactStore(args.store).publish_run(args.artifacts, args.site, args.date, run_id=args.run_id)
+    print(manifest["run_id"])
+    return 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from seo_engine.service import serve
+
+    serve(args.work_dir, host=args.host, port=args.port, workers=args.workers, queue_size=args.queue_size)
+    return 0
+
+
+def _extractor_choices() -> List[str]:
+    from seo_engine.extract.registry import available_extractors
+
+    # Location extraction always runs; the rest are opt-in.
+    return [name for name in available_extractors() if name != "locations"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the ``seo-intake`` argument parser."""
+
+    parser = argparse.ArgumentParser(prog="seo-intake", description="SEO intake pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run the full pipeline.")
+    run.add_argument("--sitemap", required=True, help="Sitemap XML file.")
+    run.add_argument("--html", nargs="*", default=[], help="Location HTML files.")
+    run.add_argument("--keywords", help="Ahrefs keyword CSV export.")
+    run.add_argument("--performance", help="Ahrefs performance CSV export.")
+    run.add_argument(
+        "--keyword-positions",
+        action="store_true",
+        help="Also write every keyword's best position (needed to diff keyword movement).",
+    )
+    run.add_argument("--out", required=True, help="Output directory.")
+    run.add_argument("--format", choices=("json", "jsonl"), default="json", help="Artifact format.")
+    run.add_argument("--sqlite", action="store_true", help="Also write artifacts.sqlite.")
+    run.add_argument("--dish-state", help="Incremental dish taxonomy state file.")
+    run.add_argument("--verify-incremental", action="store_true", help="Check incremental taxonomy.")
+    run.add_argument("--token-stats", help="SQLite database for unknown dish tokens.")
+    run.add_argument("--site", help="Site name for token statistics.")
+    run.add_argument("--run-id", help="Run identifier for token statistics.")
+    run.add_argument("--profile", action="store_true", help="Save per-stage CPU and memory profiles.")
+    run.add_argument("--clipboard-summary", action="store_true", help="Write a size-capped clipboard summary.")
+    run.add_argument("--workers", type=int, help="Concurrent stage workers (1 runs serially).")
+    run.add_argument("--processes", action="store_true", help="Extract locations in a worker process.")
+    run.add_argument("--fetch-locations", action="store_true", help="Fetch location pages listed in the sitemap.")
+    run.add_argument("--fetch-cache", help="Directory caching fetched pages for conditional GETs.")
+    run.add_argument(
+        "--checkpoint-dir",
+        help="Directory for stage checkpoints; rerunning the same inputs resumes an interrupted run.",
+    )
+    run.add_argument(
+        "--extract",
+        action="append",
+        default=[],
+        choices=_extractor_choices(),
+        help="Extra HTML extractor sharing the location parse (repeatable).",
+    )
+    run.add_argument(
+        "--guard",
+        action="store_true",
+        help="Parse documents in killable workers under the --max-* limits.",
+    )
+    run.add_argument("--max-bytes", type=int, default=50 * 1024 * 1024, help="Guarded: skip larger documents.")
+    run.add_argument("--max-seconds", type=float, default=60.0, help="Guarded: per-document parse time limit.")
+    run.add_argument("--max-elements", type=int, default=1_000_000, help="Guarded: per-document element limit.")
+    run.add_argument("--stage-report", action="store_true", help="Print stage timings and critical path to stderr.")
+    run.set_defaults(handler=_cmd_run)
+
+    sitemap = subparsers.add_parser("sitemap", help="Parse and deduplicate sitemap URLs.")
+    sitemap.add_argument("sitemap", nargs="+", help="Sitemap XML files (children of one index).")
+    sitemap.add_argument("-o", "--output", help="Write JSON here instead of stdout.")
+    sitemap.set_defaults(handler=_cmd_sitemap)
+
+    core_pages = subparsers.add_parser("core-pages", help="Rank core pages from a sitemap.")
+    core_pages.add_argument("sitemap", help="Sitemap XML file.")
+    core_pages.add_argument("-o", "--output", help="Write JSON here instead of stdout.")
+    core_pages.set_defaults(handler=_cmd_core_pages)
+
+    dishes = subparsers.add_parser("dishes", help="Build the dish taxonomy from a sitemap.")
+    dishes.add_argument("sitemap", help="Sitemap XML file.")
+    dishes.add_argument("-o", "--output", help="Write JSON here instead of stdout.")
+    dishes.set_defaults(handler=_cmd_dishes)
+
+    locations = subparsers.add_parser("locations", help="Extract locations from HTML files.")
+    locations.add_argument("html", nargs="+", help="Location HTML files.")
+    locations.add_argument("-o", "--output", help="Write JSON here instead of stdout.")
+    locations.set_defaults(handler=_cmd_locations)
+
+    ahrefs = subparsers.add_parser("ahrefs", help="Summarize Ahrefs CSV exports.")
+    ahrefs.add_argument("--keywords", help="Ahrefs keyword CSV export.")
+    ahrefs.add_argument("--performance", help="Ahrefs performance CSV export.")
+    ahrefs.add_argument("-o", "--output", help="Write JSON here instead of stdout.")
+    ahrefs.set_defaults(handler=_cmd_ahrefs)
+
+    diff = subparsers.add_parser("diff", help="Diff two artifacts directories.")
+    diff.add_argument("old", help="Previous artifacts directory.")
+    diff.add_argument("new", help="Current artifacts directory.")
+    diff.add_argument("--out", required=True, help="Directory for diff.json and diff_summary.txt.")
+    diff.set_defaults(handler=_cmd_diff)
+
+    publish = subparsers.add_parser("publish", help="Publish artifacts into a content-addressed store.")
+    publish.add_argument("artifacts", help="Artifacts directory.")
+    publish.add_argument("--store", required=True, help="Artifact store root.")
+    publish.add_argument("--site", required=True, help="Site name.")
+    publish.add_argument("--date", required=True, help="Run date (YYYY-MM-DD).")
+    publish.add_argument("--run-id", help="Explicit run identifier.")
+    publish.set_defaults(handler=_cmd_publish)
+
+    serve = subparsers.add_parser("serve", help="Run the local job service.")
+    serve.add_argument("--work-dir", required=True, help="Directory for job inputs and artifacts.")
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address.")
+    serve.add_argument("--port", type=int, default=8765, help="Bind port.")
+    serve.add_argument("--workers", type=int, default=2, help="Warm worker processes.")
+    serve.add_argument("--queue-size", type=int, default=8, help="Queued jobs before returning 503.")
+    serve.set_defaults(handler=_cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``seo-intake`` command."""
+
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
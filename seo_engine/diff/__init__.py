@@ -0,0 +1 @@
+"""Run-to-run comparison helpers."""
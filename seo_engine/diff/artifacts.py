@@ -0,0 +1,254 @@
+"""Diff two runs' artifacts with streaming sorted-merge comparisons.
+
+Artifacts are read in whichever format each run wrote (``json`` or
+``jsonl``); a run missing one of them is an error rather than "no changes".
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from seo_engine.extract.dedupe import address_key
+from seo_engine.render.diff_summary import render_diff_summary
+from seo_engine.utils.json_stable import json_dump_stable
+from seo_engine.utils.jsonl import find_artifact, iter_artifact_records, load_artifact
+
+_SENTINEL: Dict[str, Any] = {}
+
+
+def _core_page_key(page: Dict[str, Any]) -> Tuple[float, str]:
+    """Mirror the ``_stable_core_pages`` ordering."""
+
+    return (-(page.get("score") or 0), page.get("url") or "")
+
+
+def diff_core_pages(old_pages: Iterator[Dict[str, Any]], new_pages: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare two core page streams sorted by ``(-score, url)``.
+
+    Both streams are consumed once in lockstep. A page whose score changed
+    shows up at different positions on each side; only those unmatched pages
+    are held in memory until they can be paired by URL.
+    """
+
+    changed: List[Dict[str, Any]] = []
+    pending_removed: Dict[str, Dict[str, Any]] = {}
+    pending_added: Dict[str, Dict[str, Any]] = {}
+    rescored: List[Dict[str, Any]] = []
+    unchanged = 0
+
+    def _removed(page: Dict[str, Any]) -> None:
+        url = page.get("url") or ""
+        if url in pending_added:
+            rescored.append({"url": url, "before": page, "after": pending_added.pop(url)})
+        else:
+            pending_removed[url] = page
+
+    def _added(page: Dict[str, Any]) -> None:
+        url = page.get("url") or ""
+        if url in pending_removed:
+            rescored.append({"url": url, "before": pending_removed.pop(url), "after": page})
+        else:
+            pending_added[url] = page
+
+    old_page = next(old_pages, _SENTINEL)
+    new_page = next(new_pages, _SENTINEL)
+    while old_page is not _SENTINEL or new_page is not _SENTINEL:
+        if new_page is _SENTINEL:
+            _removed(old_page)
+            old_page = next(old_pages, _SENTINEL)
+            continue
+        if old_page is _SENTINEL:
+            _added(new_page)
+            new_page = next(new_pages, _SENTINEL)
+            continue
+        old_key = _core_page_key(old_page)
+        new_key = _core_page_key(new_page)
+        if old_key == new_key:
+            if old_page == new_page:
+                unchanged += 1
+            else:
+                changed.append({"url": old_key[1], "before": old_page, "after": new_page})
+            old_page = next(old_pages, _SENTINEL)
+            new_page = next(new_pages, _SENTINEL)
+        elif old_key < new_key:
+            _removed(old_page)
+            old_page = next(old_pages, _SENTINEL)
+        else:
+            _added(new_page)
+            new_page = next(new_pages, _SENTINEL)
+
+    return {
+        "added": sorted(pending_added),
+        "removed": sorted(pending_removed),
+        "changed": sorted(changed + rescored, key=lambda entry: entry["url"]),
+        "unchanged_count": unchanged,
+    }
+
+
+def _location_address(location: Dict[str, Any]) -> str:
+    return location.get("full_address") or location.get("street") or ""
+
+
+def _location_label(location: Dict[str, Any]) -> str:
+    parts = [location.get("location_name") or "", _location_address(location)]
+    return " — ".join(part for part in parts if part)
+
+
+def _location_key(location: Dict[str, Any]) -> Tuple[str, str]:
+    # Only locations without any address fall back to their name.
+    return address_key(location) or ("", " ".join((location.get("location_name") or "").lower().split()))
+
+
+def _unmatched(
+    locations: List[Dict[str, Any]],
+    other_keys: Set[Tuple[str, str]],
+) -> List[Dict[str, Any]]:
+    return [location for location in locations if _location_key(location) not in other_keys]
+
+
+def diff_locations(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare locations, reporting additions, removals and moves.
+
+    Locations are matched by normalized address (street plus postal code,
+    see ``address_key``), so chains whose stores all carry the brand name
+    stay distinct; only locations without an address are matched by name.
+    Unmatched locations whose name is unique among the
+    unmatched ones on both sides are reported as moved.
+    """
+
+    old_keys = set(map(_location_key, old))
+    new_keys = set(map(_location_key, new))
+    old_unmatched = _unmatched(old, new_keys)
+    new_unmatched = _unmatched(new, old_keys)
+
+    old_names = Counter(location.get("location_name") or "" for location in old_unmatched)
+    new_names = Counter(location.get("location_name") or "" for location in new_unmatched)
+    new_by_name = {location.get("location_name") or "": location for location in new_unmatched}
+    moved = []
+    paired: Set[str] = set()
+    for location in old_unmatched:
+        name = location.get("location_name") or ""
+        if name and old_names[name] == 1 and new_names[name] == 1:
+            paired.add(name)
+            moved.append(
+                {
+                    "location_name": name,
+                    "before": _location_address(location),
+                    "after": _location_address(new_by_name[name]),
+                }
+            )
+    return {
+        "added": sorted(
+            _location_label(location)
+            for location in new_unmatched
+            if (location.get("location_name") or "") not in paired
+        ),
+        "removed": sorted(
+            _location_label(location)
+            for location in old_unmatched
+            if (location.get("location_name") or "") not in paired
+        ),
+        "moved": sorted(moved, key=lambda entry: entry["location_name"]),
+    }
+
+
+def diff_dish_categories(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return categories whose counts differ between runs."""
+
+    old_counts = {entry.get("category"): entry.get("count") or 0 for entry in old}
+    new_counts = {entry.get("category"): entry.get("count") or 0 for entry in new}
+    changes = []
+    for category in sorted(old_counts.keys() | new_counts.keys()):
+        before = old_counts.get(category, 0)
+        after = new_counts.get(category, 0)
+        if before != after:
+            changes.append({"category": category, "before": before, "after": after, "delta": after - before})
+    return changes
+
+
+def diff_keywords(old: Iterable[Dict[str, Any]], new: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare keyword positions of two streams sorted by keyword.
+
+    The streams are the ``keywords`` sections of ``keyword_positions.json``
+    (one best-ranking row per keyword) and are consumed once in lockstep.
+    """
+
+    old_entries = iter(old)
+    new_entries = iter(new)
+    added: List[str] = []
+    removed: List[str] = []
+    moved: List[Dict[str, Any]] = []
+    old_entry = next(old_entries, _SENTINEL)
+    new_entry = next(new_entries, _SENTINEL)
+    while old_entry is not _SENTINEL or new_entry is not _SENTINEL:
+        old_keyword = old_entry.get("keyword") if old_entry is not _SENTINEL else None
+        new_keyword = new_entry.get("keyword") if new_entry is not _SENTINEL else None
+        if new_keyword is None or (old_keyword is not None and old_keyword < new_keyword):
+            removed.append(old_keyword or "")
+            old_entry = next(old_entries, _SENTINEL)
+            continue
+        if old_keyword is None or new_keyword < old_keyword:
+            added.append(new_keyword)
+            new_entry = next(new_entries, _SENTINEL)
+            continue
+        before: Optional[int] = old_entry.get("position")
+        after: Optional[int] = new_entry.get("position")
+        if before != after:
+            delta = None if before is None or after is None else before - after
+            moved.append({"keyword": new_keyword, "before": before, "after": after, "delta": delta})
+        old_entry = next(old_entries, _SENTINEL)
+        new_entry = next(new_entries, _SENTINEL)
+    return {"added": added, "removed": removed, "moved": moved}
+
+
+def _diff_keyword_positions(old_dir: str, new_dir: str) -> Optional[Dict[str, Any]]:
+    filename = "keyword_positions.json"
+    if find_artifact(old_dir, filename) is None and find_artifact(new_dir, filename) is None:
+        return None
+    return diff_keywords(
+        iter_artifact_records(old_dir, filename, ("keywords",)),
+        iter_artifact_records(new_dir, filename, ("keywords",)),
+    )
+
+
+def diff_artifacts(old_dir: str, new_dir: str) -> Dict[str, Any]:
+    """Diff two artifacts directories.
+
+    Core pages and keyword positions are streamed; the remaining artifacts
+    are small and loaded whole. Raises ``ValueError`` if either run lacks
+    one of the compared artifacts. ``keyword_positions.json`` is opt-in
+    (``--keyword-positions``): when neither run has it, ``"keywords"`` is
+    ``None``.
+    """
+
+    old_dishes = load_artifact(old_dir, "dish_taxonomy.json").get("dishes", {})
+    new_dishes = load_artifact(new_dir, "dish_taxonomy.json").get("dishes", {})
+    return {
+        "core_pages": diff_core_pages(
+            iter_artifact_records(old_dir, "core_pages.json", ("urls",)),
+            iter_artifact_records(new_dir, "core_pages.json", ("urls",)),
+        ),
+        "locations": diff_locations(
+            load_artifact(old_dir, "locations.json").get("locations", []),
+            load_artifact(new_dir, "locations.json").get("locations", []),
+        ),
+        "dish_categories": diff_dish_categories(
+            old_dishes.get("categories", []),
+            new_dishes.get("categories", []),
+        ),
+        "keywords": _diff_keyword_positions(old_dir, new_dir),
+    }
+
+
+def write_diff(old_dir: str, new_dir: str, out_dir: str) -> str:
+    """Write ``diff.json`` and ``diff_summary.txt`` and return the JSON path."""
+
+    diff = diff_artifacts(old_dir, new_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    diff_path = os.path.join(out_dir, "diff.json")
+    json_dump_stable(diff, diff_path)
+    with open(os.path.join(out_dir, "diff_summary.txt"), "w", encoding="utf-8") as handle:
+        handle.write(render_diff_summary(diff))
+    return diff_path
@@ -0,0 +1,286 @@
+"""Blocking-index deduplication for extracted locations."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+FUZZY_STREET_THRESHOLD = 0.9
+
+_STREET_SUFFIXES: Dict[str, str] = {
+    "street": "st",
+    "str": "st",
+    "avenue": "ave",
+    "av": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "parkway": "pkwy",
+    "highway": "hwy",
+    "square": "sq",
+    "terrace": "ter",
+    "circle": "cir",
+    "plaza": "plz",
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "northeast": "ne",
+    "northwest": "nw",
+    "southeast": "se",
+    "southwest": "sw",
+}
+# Street tokens that tell otherwise similar addresses apart; they must match
+# exactly, and only the remaining street name is compared fuzzily.
+_DIRECTIONALS = {"n", "s", "e", "w", "ne", "nw", "se", "sw"}
+_UNIT_DESIGNATORS = {"suite", "ste", "unit", "apt", "apartment", "#", "no", "number", "fl", "floor"}
+_PUNCTUATION_RE = re.compile(r"[.,;:]")
+_HASH_UNIT_RE = re.compile(r"#\s*")
+_POSTAL_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+
+@dataclass
+class LocationDedupeAudit:
+    """Merge decisions made while deduplicating locations."""
+
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+
+    def record_merge(
+        self,
+        kept: Dict[str, Any],
+        merged: Dict[str, Any],
+        reason: str,
+        score: Optional[float] = None,
+    ) -> None:
+        """Record that ``merged`` was folded into ``kept``."""
+
+        self.decisions.append(
+            {
+                "kept": _describe(kept),
+                "merged": _describe(merged),
+                "reason": reason,
+                "score": score,
+            }
+        )
+
+
+def _describe(location: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "location_name": location.get("location_name") or "",
+        "full_address": location.get("full_address") or location.get("street") or "",
+        "phone": location.get("phone") or "",
+    }
+
+
+def normalize_street(street: str) -> str:
+    """Normalize a street line: suffixes, unit designators and punctuation."""
+
+    text = _PUNCTUATION_RE.sub(" ", street.lower())
+    text = _HASH_UNIT_RE.sub("# ", text)
+    tokens: List[str] = []
+    for token in text.split():
+        if token in _UNIT_DESIGNATORS:
+            tokens.append("unit")
+        else:
+            tokens.append(_STREET_SUFFIXES.get(token, token))
+    return " ".join(tokens)
+
+
+def normalize_phone(phone: str) -> str:
+    """Return the phone digits, dropping a leading NANP country code."""
+
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) == 11 and digits.startswith("1"):
+        return digits[1:]
+    return digits
+
+
+def _postal5(location: Dict[str, Any]) -> str:
+    postal = location.get("postal") or ""
+    if not postal:
+        match = _POSTAL_RE.search(location.get("city_state_zip") or "")
+        postal = match.group(1) if match else ""
+    return postal[:5]
+
+
+def address_key(location: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Return a location's normalized ``(street, postal5)`` identity, if any.
+
+    Falls back to the normalized ``full_address`` when there is no street
+    line, and returns ``None`` for locations without any address.
+    """
+
+    street = normalize_street(location.get("street") or "")
+    if street:
+        return street, _postal5(location)
+    full_address = normalize_street(location.get("full_address") or "")
+    return (full_address, "") if full_address else None
+
+
+def _house_number(normalized_street: str) -> str:
+    first = normalized_street.split(" ", 1)[0] if normalized_street else ""
+    return first if first[:1].isdigit() else ""
+
+
+def _street_parts(normalized_street: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], str]:
+    """Split a normalized street into directionals, unit numbers and the name."""
+
+    tokens = normalized_street.split()
+    if tokens and _house_number(normalized_street):
+        tokens = tokens[1:]
+    directionals: List[str] = []
+    units: List[str] = []
+    rest: List[str] = []
+    after_unit = False
+    for token in tokens:
+        if token == "unit":
+            after_unit = True
+            continue
+        if after_unit:
+            units.append(token)
+        elif token in _DIRECTIONALS:
+            directionals.append(token)
+        else:
+            rest.append(token)
+        after_unit = False
+    return tuple(directionals), tuple(units), " ".join(rest)
+
+
+@dataclass
+class _Candidate:
+    """Normalized view of a kept location used for comparisons."""
+
+    index: int
+    street: str
+    house_number: str
+    directionals: Tuple[str, ...]
+    units: Tuple[str, ...]
+    street_name: str
+    postal: str
+    phone: str
+    name: str
+
+
+def _candidate(index: int, location: Dict[str, Any]) -> _Candidate:
+    street = normalize_street(location.get("street") or "")
+    directionals, units, street_name = _street_parts(street)
+    return _Candidate(
+        index=index,
+        street=street,
+        house_number=_house_number(street),
+        directionals=directionals,
+        units=units,
+        street_name=street_name,
+        postal=_postal5(location),
+        phone=normalize_phone(location.get("phone") or ""),
+        name=" ".join((location.get("location_name") or "").lower().split()),
+    )
+
+
+def _blocking_keys(candidate: _Candidate) -> List[Tuple[str, ...]]:
+    keys: List[Tuple[str, ...]] = []
+    if candidate.postal:
+        keys.append(("postal", candidate.postal, candidate.house_number))
+    if candidate.phone:
+        keys.append(("phone", candidate.phone))
+    return keys
+
+
+def _match(left: _Candidate, right: _Candidate) -> Optional[Tuple[str, Optional[float]]]:
+    if left.street and right.street:
+        if (left.house_number, left.directionals, left.units) != (
+            right.house_number,
+            right.directionals,
+            right.units,
+        ):
+            return None
+        if left.postal and right.postal and left.postal != right.postal:
+            return None
+        if left.street == right.street:
+            return "normalized_address", None
+        ratio = SequenceMatcher(None, left.street_name, right.street_name).ratio()
+        if ratio >= FUZZY_STREET_THRESHOLD:
+            return "fuzzy_address", round(ratio, 4)
+        return None
+    if left.phone and left.phone == right.phone and left.name and left.name == right.name:
+        return "phone_and_name", None
+    return None
+
+
+def _exact_key(location: Dict[str, Any]) -> Tuple[str, ...]:
+    street = " ".join((location.get("street") or "").split())
+    city_state_zip = " ".join((location.get("city_state_zip") or "").split())
+    phone = re.sub(r"\D", "", location.get("phone") or "")
+    email = " ".join((location.get("email") or "").split()).lower()
+    if street and city_state_zip:
+        return (street, city_state_zip, phone, email)
+    return (location.get("location_name") or "", phone, email)
+
+
+def _fill_missing(kept: Dict[str, Any], merged: Dict[str, Any]) -> None:
+    for key in ("phone", "email"):
+        if not kept.get(key) and merged.get(key):
+            kept[key] = merged[key]
+
+
+def dedupe_locations(
+    locations: List[Dict[str, Any]],
+    audit: Optional[LocationDedupeAudit] = None,
+) -> List[Dict[str, Any]]:
+    """Collapse duplicate locations, keeping the first occurrence.
+
+    Phone and email missing from a kept location are filled from its
+    duplicates on a copy; the input dicts are not modified.
+
+    Exact duplicates are dropped first. Remaining candidates are bucketed by
+    postal code (plus house number) and by phone digits, and fuzzy matching
+    only runs against earlier locations sharing a bucket.
+    """
+
+    kept: List[Dict[str, Any]] = []
+    candidates: List[_Candidate] = []
+    exact_index: Dict[Tuple[str, ...], int] = {}
+    buckets: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+    copied: Set[int] = set()
+
+    for location in locations:
+        key = _exact_key(location)
+        if key in exact_index:
+            if audit is not None:
+                audit.record_merge(kept[exact_index[key]], location, "exact")
+            continue
+
+        candidate = _candidate(len(kept), location)
+        keys = _blocking_keys(candidate)
+        peers = sorted({index for block in keys for index in buckets.get(block, ())})
+        match_index: Optional[int] = None
+        for index in peers:
+            result = _match(candidates[index], candidate)
+            if result is None:
+                continue
+            match_index = index
+            if audit is not None:
+                audit.record_merge(kept[index], location, result[0], result[1])
+            break
+
+        if match_index is not None:
+            if match_index not in copied:
+                # Copy before filling so the caller's dicts are never modified.
+                kept[match_index] = dict(kept[match_index])
+                copied.add(match_index)
+            _fill_missing(kept[match_index], location)
+            exact_index[key] = match_index
+            continue
+
+        exact_index[key] = candidate.index
+        kept.append(location)
+        candidates.append(candidate)
+        for block in keys:
+            buckets[block].append(candidate.index)
+    return kept
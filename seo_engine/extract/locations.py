@@ -2,28 +2,22 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+
+from seo_engine.extract.dedupe import LocationDedupeAudit, dedupe_locations
+from seo_engine.extract.structured_data import extract_jsonld_locations
+from seo_engine.extract.registry import Extractor, extract_document, extract_documents, register_extractor, walk
+from seo_engine.utils.guard import GuardedRunner
 
 
 def _clean_text(text: str | None) -> str:
     return "" if text is None else " ".join(text.split())
 
 
-def _normalize_space(text: str) -> str:
-    return " ".join(text.split())
-
-
-def _normalize_phone_digits(phone: str) -> str:
-    return re.sub(r"\D", "", phone)
-
-
-def _normalize_email(email: str) -> str:
-    return _normalize_space(email).lower()
-
-
 def _parse_city_state_zip(text: str) -> Tuple[str, str, str]:
     cleaned = _clean_text(text)
     match = re.match(
@@ -49,11 +43,25 @@ def _find_city_state_zip(address_lines: List[str]) -> Tuple[str, str, str, str]:
     return "", "", "", ""
 
 
-def _confidence_level(street: str, city: str, region: str, postal: str) -> str:
+def _confidence_level(
+    street: str,
+    city: str,
+    region: str,
+    postal: str,
+    source: str = "dom",
+) -> str:
     has_street = bool(street)
     has_city_region = bool(city and region)
     has_city_postal = bool(city and postal)
     has_full = bool(city and region and postal)
+    if source == "jsonld":
+        # Structured data labels each address part explicitly, so a street
+        # with either city or postal code is as trustworthy as a full DOM match.
+        if has_street and (city or postal):
+            return "high"
+        if has_street or city:
+            return "medium"
+        return "low"
     if has_street and has_full:
         return "high"
     if has_street and (has_city_region or has_city_postal):
@@ -61,70 +69,169 @@ def _confidence_level(street: str, city: str, region: str, postal: str) -> str:
     return "low"
 
 
-def extract_locations(html_files: List[bytes]) -> List[Dict[str, Any]]:
+def _extract_jsonld_locations(html: bytes) -> List[Dict[str, Any]]:
+    locations: List[Dict[str, Any]] = []
+    for location in extract_jsonld_locations(html):
+        location["confidence"] = _confidence_level(
+            location["street"],
+            location["city"],
+            location["region"],
+            location["postal"],
+            source="jsonld",
+        )
+        locations.append(location)
+    return locations
+
+
+def _is_location_name(tag: Tag) -> bool:
+    return tag.name == "span" and "location-name" in (tag.get("class") or [])
+
+
+def _is_link(tag: Tag, scheme: str) -> bool:
+    href = tag.get("href") if tag.name == "a" else None
+    return bool(href) and href.startswith(scheme)
+
+
+@dataclass
+class _Frame:
+    """Per-element state for the single document walk.
+
+    ``address``, ``tel`` and ``mail`` hold the first matching descendant in
+    document order, which is what ``Tag.find`` would return.
+    """
+
+    tag: Tag
+    address: Optional[Tag] = None
+    tel: Optional[Tag] = None
+    mail: Optional[Tag] = None
+    names: List[Tuple[int, Tag]] = field(default_factory=list)
+
+
+def _merge_into_parent(frame: _Frame, parent: _Frame) -> None:
+    tag = frame.tag
+    if parent.address is None:
+        parent.address = tag if tag.name == "address" else frame.address
+    if parent.tel is None:
+        parent.tel = tag if _is_link(tag, "tel:") else frame.tel
+    if parent.mail is None:
+        parent.mail = tag if _is_link(tag, "mailto:") else frame.mail
+
+
+def _address_lines(address: Optional[Tag]) -> List[str]:
+    lines: List[str] = []
+    if address is None:
+        return lines
+    for span in address.find_all("span"):
+        line = _clean_text(span.get_text())
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _dom_location(name_span: Tag, frame: _Frame) -> Dict[str, Any]:
+    address_lines = _address_lines(frame.address)
+    phone = _clean_text(frame.tel.get_text()) if frame.tel else ""
+    email = ""
+    if frame.mail and frame.mail.get("href"):
+        email = _clean_text(frame.mail["href"].replace("mailto:", ""))
+    street = address_lines[0] if address_lines else ""
+    city_state_zip, city, region, postal = _find_city_state_zip(address_lines)
+    full_address = ""
+    if street and city_state_zip:
+        if city and region and postal:
+            full_address = f"{street}, {city}, {region} {postal}"
+        else:
+            full_address = f"{street}, {city_state_zip}"
+    return {
+        "location_name": _clean_text(name_span.get_text()),
+        "street": street,
+        "city_state_zip": city_state_zip,
+        "city": city,
+        "region": region,
+        "postal": postal,
+        "full_address": full_address,
+        "confidence": _confidence_level(street, city, region, postal),
+        "phone": phone,
+        "email": email,
+    }
+
+
+@register_extractor
+class LocationsExtractor(Extractor):
+    """Extract locations from JSON-LD, or else from one walk over the DOM.
+
+    The container of each ``span.location-name`` is its parent element. While
+    walking, every element's frame collects the first address and tel/mailto
+    links below it; when a container closes, its name spans are resolved
+    against that frame, so the page is traversed once regardless of how many
+    location cards it holds.
+    """
+
+    name = "locations"
+    artifact = "locations.json"
+
+    def __init__(self) -> None:
+        self.structured: List[Dict[str, Any]] = []
+        self.found: List[Tuple[int, Dict[str, Any]]] = []
+        self.frames: List[_Frame] = []
+        self.order = 0
+
+    def prescan(self, html: bytes) -> bool:
+        self.structured = _extract_jsonld_locations(html)
+        return bool(self.structured)
+
+    def start(self, tag: Tag) -> None:
+        if self.frames and _is_location_name(tag):
+            self.frames[-1].names.append((self.order, tag))
+            self.order += 1
+        self.frames.append(_Frame(tag=tag))
+
+    def end(self, tag: Tag) -> None:
+        frame = self.frames.pop()
+        for index, name_span in frame.names:
+            self.found.append((index, _dom_location(name_span, frame)))
+        if self.frames:
+            _merge_into_parent(frame, self.frames[-1])
+
+    def result(self) -> List[Dict[str, Any]]:
+        if self.structured:
+            return self.structured
+        self.found.sort(key=lambda entry: entry[0])
+        return [location for _, location in self.found]
+
+
+def _extract_dom_locations(html: bytes) -> List[Dict[str, Any]]:
+    extractor = LocationsExtractor()
+    walk(BeautifulSoup(html, "html.parser"), [extractor])
+    return extractor.result()
+
+
+def extract_document_locations(html: bytes) -> List[Dict[str, Any]]:
+    """Extract the (not yet deduplicated) locations of one HTML document."""
+
+    return extract_document(html, ("locations",))["locations"]
+
+
+def extract_locations(
+    html_files: Iterable[bytes],
+    audit: Optional[LocationDedupeAudit] = None,
+    guard: Optional[GuardedRunner] = None,
+) -> List[Dict[str, Any]]:
     """Extract locations from HTML files.
 
-    Expected pattern:
+    Pages embedding schema.org businesses in JSON-LD are read from that
+    structured data without building a DOM. Other pages fall back to the
+    expected markup pattern:
     - span.location-name
     - address spans
     - tel/mailto links
+
+    Duplicates across pages are collapsed by ``dedupe_locations``. With a
+    ``guard``, each document is parsed in its resource-limited worker and
+    documents that overrun are skipped (see ``guard.skipped``).
     """
 
     locations: List[Dict[str, Any]] = []
-    seen_keys: set[Tuple[str, ...]] = set()
-    for html in html_files:
-        soup = BeautifulSoup(html, "html.parser")
-        for name_span in soup.select("span.location-name"):
-            container = name_span.find_parent()
-            address_lines = []
-            if container:
-                address = container.find("address")
-                if address:
-                    for span in address.find_all("span"):
-                        line = _clean_text(span.get_text())
-                        if line:
-                            address_lines.append(line)
-            tel_link = None
-            mail_link = None
-            if container:
-                tel_link = container.find("a", href=lambda href: href and href.startswith("tel:"))
-                mail_link = container.find("a", href=lambda href: href and href.startswith("mailto:"))
-            phone = _clean_text(tel_link.get_text()) if tel_link else ""
-            email = ""
-            if mail_link and mail_link.get("href"):
-                email = _clean_text(mail_link["href"].replace("mailto:", ""))
-            street = address_lines[0] if address_lines else ""
-            city_state_zip, city, region, postal = _find_city_state_zip(address_lines)
-            full_address = ""
-            if street and city_state_zip:
-                if city and region and postal:
-                    full_address = f"{street}, {city}, {region} {postal}"
-                else:
-                    full_address = f"{street}, {city_state_zip}"
-            location_name = _clean_text(name_span.get_text())
-            normalized_street = _normalize_space(street)
-            normalized_city_state_zip = _normalize_space(city_state_zip)
-            normalized_phone = _normalize_phone_digits(phone)
-            normalized_email = _normalize_email(email)
-            if normalized_street and normalized_city_state_zip:
-                key = (normalized_street, normalized_city_state_zip, normalized_phone, normalized_email)
-            else:
-                key = (location_name, normalized_phone, normalized_email)
-            if key in seen_keys:
-                continue
-            seen_keys.add(key)
-            locations.append(
-                {
-                    "location_name": location_name,
-                    "street": street,
-                    "city_state_zip": city_state_zip,
-                    "city": city,
-                    "region": region,
-                    "postal": postal,
-                    "full_address": full_address,
-                    "confidence": _confidence_level(street, city, region, postal),
-                    "phone": phone,
-                    "email": email,
-                }
-            )
-    return locations
+    for _, results in extract_documents(html_files, ("locations",), guard=guard):
+        locations.extend(results["locations"])
+    return dedupe_locations(locations, audit=audit)
@@ -0,0 +1,56 @@
+"""Page title and meta tag extraction for core pages."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from bs4 import Tag
+
+from seo_engine.extract.registry import Extractor, register_extractor
+
+
+def _clean_text(text: Optional[str]) -> str:
+    return "" if text is None else " ".join(text.split())
+
+
+@register_extractor
+class PageMetaExtractor(Extractor):
+    """Collect title, meta description, robots, canonical link and H1s."""
+
+    name = "page_meta"
+    artifact = "page_meta.json"
+
+    def __init__(self) -> None:
+        self.meta: Dict[str, Any] = {
+            "title": "",
+            "description": "",
+            "robots": "",
+            "canonical": "",
+            "lang": "",
+            "h1": "",
+            "h1_count": 0,
+        }
+        self._seen_title = False
+
+    def start(self, tag: Tag) -> None:
+        if tag.name == "html" and not self.meta["lang"]:
+            self.meta["lang"] = _clean_text(tag.get("lang"))
+        elif tag.name == "meta":
+            name = (tag.get("name") or "").lower()
+            if name in ("description", "robots") and not self.meta[name]:
+                self.meta[name] = _clean_text(tag.get("content"))
+        elif tag.name == "link" and not self.meta["canonical"]:
+            if "canonical" in [rel.lower() for rel in tag.get("rel") or []]:
+                self.meta["canonical"] = (tag.get("href") or "").strip()
+
+    def end(self, tag: Tag) -> None:
+        if tag.name == "title" and not self._seen_title:
+            self._seen_title = True
+            self.meta["title"] = _clean_text(tag.get_text())
+        elif tag.name == "h1":
+            if not self.meta["h1_count"]:
+                self.meta["h1"] = _clean_text(tag.get_text())
+            self.meta["h1_count"] += 1
+
+    def result(self) -> Dict[str, Any]:
+        return dict(self.meta)
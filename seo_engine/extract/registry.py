@@ -0,0 +1,159 @@
+"""Single-parse extractor registry for HTML documents.
+
+Each registered ``Extractor`` gets a fresh instance per document. Extractors
+may first answer from the raw bytes in ``prescan`` (e.g. JSON-LD); the rest
+share one BeautifulSoup parse and receive ``start``/``end`` events from a
+single depth-first walk, so enabling more extractors never adds a parse.
+The pipeline writes each extractor's per-document results to its
+``artifact``. BeautifulSoup is imported on the first parse, so listing
+extractors stays cheap.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import importlib
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from seo_engine.utils.arena import BufferRef, as_bytes
+from seo_engine.utils.guard import GuardedRunner
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+# Modules defining the built-in extractors, imported on first use.
+BUILTIN_EXTRACTORS = {
+    "locations": "seo_engine.extract.locations",
+    "page_meta": "seo_engine.extract.page_meta",
+}
+
+_REGISTRY: Dict[str, Type["Extractor"]] = {}
+
+
+class Extractor(ABC):
+    """Base class for per-document extractors.
+
+    Subclasses set ``name`` and ``artifact`` (the JSON filename their
+    results are written to) and implement ``result``.
+    """
+
+    name = ""
+    artifact = ""
+
+    def prescan(self, html: bytes) -> bool:
+        """Return True if the raw bytes already answered; skips the walk."""
+
+        return False
+
+    def start(self, tag: Tag) -> None:
+        """Handle an element opening."""
+
+    def end(self, tag: Tag) -> None:
+        """Handle an element closing (after all of its descendants)."""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Return this document's result."""
+
+
+def register_extractor(cls: Type[Extractor]) -> Type[Extractor]:
+    """Class decorator adding an extractor to the registry."""
+
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no name")
+    if not cls.artifact:
+        raise ValueError(f"{cls.__name__} has no artifact")
+    _REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_extractor(name: str) -> Type[Extractor]:
+    """Return the extractor class registered as ``name``."""
+
+    if name not in _REGISTRY and name in BUILTIN_EXTRACTORS:
+        importlib.import_module(BUILTIN_EXTRACTORS[name])
+    if name not in _REGISTRY:
+        raise ValueError(f"Unknown extractor: {name!r}")
+    return _REGISTRY[name]
+
+
+def available_extractors() -> List[str]:
+    """Return the names of built-in and registered extractors."""
+
+    return sorted(set(BUILTIN_EXTRACTORS) | set(_REGISTRY))
+
+
+def iter_tag_events(root: Tag) -> Iterator[Tuple[str, Tag]]:
+    """Yield ``("start", tag)`` and ``("end", tag)`` events depth-first."""
+
+    from bs4 import Tag
+
+    stack = [(root, iter(root.contents))]
+    yield "start", root
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if isinstance(child, Tag):
+                yield "start", child
+                stack.append((child, iter(child.contents)))
+                break
+        else:
+            stack.pop()
+            yield "end", node
+
+
+def walk(root: Tag, extractors: Sequence[Extractor]) -> None:
+    """Dispatch one walk of ``root`` to every extractor."""
+
+    if len(extractors) == 1:
+        extractor = extractors[0]
+        for event, tag in iter_tag_events(root):
+            if event == "start":
+                extractor.start(tag)
+            else:
+                extractor.end(tag)
+        return
+    for event, tag in iter_tag_events(root):
+        if event == "start":
+            for extractor in extractors:
+                extractor.start(tag)
+        else:
+            for extractor in extractors:
+                extractor.end(tag)
+
+
+def extract_document(html: bytes, names: Sequence[str] = ("locations",)) -> Dict[str, Any]:
+    """Run the named extractors over one document with at most one parse."""
+
+    extractors = [get_extractor(name)() for name in names]
+    walking = [extractor for extractor in extractors if not extractor.prescan(html)]
+    if walking:
+        from bs4 import BeautifulSoup
+
+        walk(BeautifulSoup(html, "html.parser"), walking)
+    return {extractor.name: extractor.result() for extractor in extractors}
+
+
+def extract_documents(
+    html_files: Iterable[Union[bytes, BufferRef]],
+    names: Sequence[str] = ("locations",),
+    guard: Optional[GuardedRunner] = None,
+    start: int = 0,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(index, results)`` per document, skipping guarded overruns.
+
+    Indexes count from ``start``, so batches of one stream keep their
+    document numbering. Documents may be ``InputArena`` refs.
+    """
+
+    names = tuple(names)
+    for name in names:
+        get_extractor(name)
+    for index, html in enumerate(html_files, start):
+        if guard is None:
+            yield index, extract_document(as_bytes(html), names)
+            continue
+        results, reason = guard.run(partial(extract_document, names=names), html, source=f"html[{index}]")
+        if reason is None:
+            yield index, results
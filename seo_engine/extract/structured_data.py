@@ -0,0 +1,124 @@
+"""Schema.org JSON-LD scanning for location extraction."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterator, List
+
+_JSONLD_SCRIPT_RE = re.compile(
+    rb"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+BUSINESS_TYPES = {
+    "Bakery",
+    "BarOrPub",
+    "CafeOrCoffeeShop",
+    "FastFoodRestaurant",
+    "FoodEstablishment",
+    "LocalBusiness",
+    "Restaurant",
+    "Store",
+}
+
+
+def _clean_text(value: Any) -> str:
+    if value is None or isinstance(value, (dict, list)):
+        return ""
+    return " ".join(str(value).split())
+
+
+def iter_jsonld_blocks(html: bytes) -> Iterator[Any]:
+    """Yield decoded JSON-LD payloads found in raw HTML bytes.
+
+    Blocks are located with a byte-level scan, so no DOM is built. Blocks
+    that fail to decode are skipped.
+    """
+
+    for match in _JSONLD_SCRIPT_RE.finditer(html):
+        raw = match.group(1).strip()
+        if not raw:
+            continue
+        try:
+            yield json.loads(raw.decode("utf-8", errors="replace"))
+        except ValueError:
+            continue
+
+
+def _types(node: Dict[str, Any]) -> List[str]:
+    value = node.get("@type")
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [entry for entry in value if isinstance(entry, str)]
+    return []
+
+
+def _iter_businesses(payload: Any) -> Iterator[Dict[str, Any]]:
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if BUSINESS_TYPES.intersection(_types(node)) and node.get("address"):
+            yield node
+            continue
+        stack.extend(reversed([value for value in node.values() if isinstance(value, (dict, list))]))
+
+
+def _first_address(address: Any) -> Any:
+    if isinstance(address, list):
+        return address[0] if address else None
+    return address
+
+
+def _business_to_location(business: Dict[str, Any]) -> Dict[str, str]:
+    address = _first_address(business.get("address"))
+    street = city = region = postal = ""
+    if isinstance(address, dict):
+        street = _clean_text(address.get("streetAddress"))
+        city = _clean_text(address.get("addressLocality"))
+        region = _clean_text(address.get("addressRegion"))
+        postal = _clean_text(address.get("postalCode"))
+    elif isinstance(address, str):
+        street = _clean_text(address)
+    if len(region) == 2:
+        region = region.upper()
+    city_state_zip = ""
+    if city and (region or postal):
+        city_state_zip = f"{city}, {' '.join(part for part in (region, postal) if part)}"
+    elif city or postal:
+        city_state_zip = city or postal
+    full_address = ", ".join(part for part in (street, city_state_zip) if part)
+    email = _clean_text(business.get("email"))
+    if email.lower().startswith("mailto:"):
+        email = email[len("mailto:") :]
+    return {
+        "location_name": _clean_text(business.get("name")),
+        "street": street,
+        "city_state_zip": city_state_zip,
+        "city": city,
+        "region": region,
+        "postal": postal,
+        "full_address": full_address,
+        "phone": _clean_text(business.get("telephone")),
+        "email": email,
+    }
+
+
+def extract_jsonld_locations(html: bytes) -> List[Dict[str, str]]:
+    """Return locations declared as schema.org businesses in JSON-LD.
+
+    The returned records lack ``confidence``; callers assign it based on
+    the extraction source.
+    """
+
+    locations: List[Dict[str, str]] = []
+    for payload in iter_jsonld_blocks(html):
+        for business in _iter_businesses(payload):
+            locations.append(_business_to_location(business))
+    return locations
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import codecs
 import csv
-from typing import Any, Dict, Iterable, List, Optional
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 
 def _read_csv_rows(csv_bytes: Optional[bytes]) -> List[Dict[str, Any]]:
@@ -48,23 +50,51 @@ def _first_value(row: Dict[str, Any], keys: Iterable[str]) -> Optional[str]:
     return None
 
 
+def _keyword_entry(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    keyword = _first_value(row, ("Keyword", "keyword"))
+    if not keyword:
+        return None
+    return {
+        "keyword": keyword,
+        "volume": _as_int(_first_value(row, ("Volume", "Search volume", "Search Volume"))),
+        "position": _as_int(_first_value(row, ("Position", "Pos"))),
+        "url": _first_value(row, ("URL", "Target", "Page")),
+    }
+
+
+def _stream_encoding(csv_bytes: bytes) -> str:
+    if csv_bytes.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    if b"\x00" in csv_bytes[:2]:
+        return "utf-16-le" if csv_bytes[1:2] == b"\x00" else "utf-16-be"
+    return "utf-8-sig"
+
+
+def iter_keyword_rows(csv_bytes: Optional[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield every keyword row of an Ahrefs export without materializing it.
+
+    Rows are decoded incrementally, so memory stays flat for multi-million
+    row exports.
+    """
+
+    if not csv_bytes:
+        return
+    text = io.TextIOWrapper(io.BytesIO(csv_bytes), encoding=_stream_encoding(csv_bytes), newline="")
+    header = text.readline()
+    delimiter = "\t" if "\t" in header else ","
+    text.seek(0)
+    for row in csv.DictReader(text, delimiter=delimiter):
+        entry = _keyword_entry(row)
+        if entry is not None:
+            yield entry
+
+
 def _parse_top_keywords(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     keywords: List[Dict[str, Any]] = []
     for row in rows:
-        keyword = _first_value(row, ("Keyword", "keyword"))
-        if not keyword:
-            continue
-        volume = _as_int(_first_value(row, ("Volume", "Search volume", "Search Volume")))
-        position = _as_int(_first_value(row, ("Position", "Pos")))
-        url = _first_value(row, ("URL", "Target", "Page"))
-        keywords.append(
-            {
-                "keyword": keyword,
-                "volume": volume,
-                "position": position,
-                "url": url,
-            }
-        )
+        entry = _keyword_entry(row)
+        if entry is not None:
+            keywords.append(entry)
     if any(entry.get("volume") is not None for entry in keywords):
         keywords.sort(key=lambda item: item.get("volume") or 0, reverse=True)
     return keywords[:10]
@@ -0,0 +1,152 @@
+"""URL canonicalization and fingerprint-based deduplication."""
+
+from __future__ import annotations
+
+from array import array
+from hashlib import blake2b
+from typing import Optional
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+TRACKING_PARAMS = {"dclid", "fbclid", "gclid", "mc_cid", "mc_eid", "msclkid", "_ga", "_gl"}
+TRACKING_PREFIXES = ("utm_",)
+
+_EMPTY = 0
+_MAX_LOAD = 0.7
+
+
+def _is_tracking_param(name: str) -> bool:
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a canonical form of an absolute URL.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    query parameters and trailing slashes (except on the root path).
+    """
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    if hostport.startswith("["):
+        host, _, rest = hostport.partition("]")
+        host += "]"
+        port = rest[1:] if rest.startswith(":") else ""
+    else:
+        host, _, port = hostport.partition(":")
+    netloc = f"{userinfo}{at}{host.lower()}"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    # Kept pairs stay exactly as encoded, so dropping a tracking parameter
+    # never changes how the rest of the query is spelled.
+    query = "&".join(
+        pair
+        for pair in parts.query.split("&")
+        if pair and not _is_tracking_param(unquote_plus(pair.split("=", 1)[0]))
+    )
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_fingerprint(canonical_url: str) -> int:
+    """Return a 64-bit fingerprint of a canonical URL, ignoring its scheme.
+
+    http and https variants of the same URL share a fingerprint. Zero is
+    reserved as the empty-slot marker of ``FingerprintSet`` and is remapped.
+    """
+
+    _, _, rest = canonical_url.partition("://")
+    digest = blake2b(rest.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class FingerprintSet:
+    """Open-addressing set of 64-bit fingerprints stored in a flat array.
+
+    Each slot costs 8 bytes, so 10M URLs fit in roughly 128-256 MB instead of
+    the gigabytes a ``set`` of URL strings needs.
+
+    Collision policy: two distinct URLs with the same fingerprint are treated
+    as duplicates and the later one is dropped. With 64-bit fingerprints the
+    chance of any collision among n URLs is about n**2 / 2**65 (roughly
+    3e-6 for 10M URLs); the cost of one is a single missing URL, never a
+    crash or a corrupted artifact.
+    """
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the slot array."""
+
+        return self._slots.itemsize * len(self._slots)
+
+    def add(self, fingerprint: int) -> bool:
+        """Insert a non-zero fingerprint; return ``False`` if already present."""
+
+        if (self._count + 1) > _MAX_LOAD * len(self._slots):
+            self._grow()
+        slots = self._slots
+        mask = self._mask
+        index = fingerprint & mask
+        while True:
+            current = slots[index]
+            if current == _EMPTY:
+                slots[index] = fingerprint
+                self._count += 1
+                return True
+            if current == fingerprint:
+                return False
+            index = (index + 1) & mask
+
+    def __contains__(self, fingerprint: int) -> bool:
+        slots = self._slots
+        mask = self._mask
+        index = fingerprint & mask
+        while True:
+            current = slots[index]
+            if current == _EMPTY:
+                return False
+            if current == fingerprint:
+                return True
+            index = (index + 1) & mask
+
+    def _grow(self) -> None:
+        old_slots = self._slots
+        size = len(old_slots) * 2
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+        for fingerprint in old_slots:
+            if fingerprint != _EMPTY:
+                self.add(fingerprint)
+
+
+class UrlCanonicalizer:
+    """Canonicalize URLs and drop repeats across one or more sitemaps."""
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        self.seen = FingerprintSet(capacity)
+        self.duplicates_dropped = 0
+
+    def add(self, url: str) -> Optional[str]:
+        """Return the canonical URL, or ``None`` if it was already seen."""
+
+        canonical = canonicalize_url(url)
+        if self.seen.add(url_fingerprint(canonical)):
+            return canonical
+        self.duplicates_dropped += 1
+        return None
@@ -0,0 +1,495 @@
+"""Concurrent HTTP fetcher for location pages.
+
+A small asyncio HTTP/1.1 client on the standard library: keep-alive
+connections pooled per host, a per-host request rate limit, conditional GET
+against an on-disk ETag/Last-Modified cache, and retry with exponential
+backoff for connection errors, 429 and 5xx responses. A ``FetchSession``
+keeps the event loop, pools and cache alive across several fetch streams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import queue
+import ssl
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from seo_engine.utils.json_stable import json_dump_stable_atomic, json_load
+from seo_engine.utils.locks import file_lock
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_RETRY_AFTER = 60.0
+
+
+@dataclass
+class FetchConfig:
+    """Connection, rate and retry settings for ``AsyncFetcher``."""
+
+    max_concurrency: int = 16
+    max_connections_per_host: int = 4
+    requests_per_second: Optional[float] = 5.0
+    timeout: float = 20.0
+    retries: int = 3
+    backoff: float = 0.5
+    max_redirects: int = 5
+    max_body_bytes: int = 10 * 1024 * 1024
+    user_agent: str = "seo-intake/0.1"
+    # Results in flight or fetched but not yet consumed; bounds memory when
+    # an early URL is slow and later bodies arrive out of order.
+    max_pending: int = 64
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one URL."""
+
+    url: str
+    status: int = 0
+    body: bytes = b""
+    final_url: str = ""
+    from_cache: bool = False
+    attempts: int = 0
+    error: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (200 <= self.status < 300 or self.from_cache)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary without the body."""
+
+        return {
+            "url": self.url,
+            "status": self.status,
+            "from_cache": self.from_cache,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class FetchCache:
+    """On-disk cache of response bodies and their validators.
+
+    The cache directory may be shared by concurrent runs: bodies are written
+    through unique temporary files, and ``save`` merges this run's entries
+    into the index under a file lock.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.bodies_dir = os.path.join(cache_dir, "bodies")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock_path = os.path.join(cache_dir, "index.lock")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self._stored: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.index_path):
+            self.index = json_load(self.index_path)
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.bodies_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Return conditional request headers for ``url``."""
+
+        entry = self.index.get(url)
+        if not entry or not os.path.exists(self._body_path(url)):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url: str) -> bytes:
+        with open(self._body_path(url), "rb") as handle:
+            return handle.read()
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.bodies_dir)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(body)
+            os.replace(tmp_path, self._body_path(url))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.index[url] = self._stored[url] = {"etag": etag, "last_modified": last_modified}
+
+    def save(self) -> None:
+        """Merge entries stored by this run into the on-disk index."""
+
+        if not self._stored:
+            return
+        with file_lock(self.lock_path):
+            index = json_load(self.index_path) if os.path.exists(self.index_path) else {}
+            index.update(self._stored)
+            json_dump_stable_atomic(index, self.index_path)
+        self.index = index
+        self._stored = {}
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    """Keep-alive connections to one ``(scheme, host, port)``."""
+
+    def __init__(self, scheme: str, host: str, port: int, limit: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self._slots = asyncio.Semaphore(limit)
+        self._idle: List[_Connection] = []
+
+    async def acquire(self, timeout: float) -> _Connection:
+        await self._slots.acquire()
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.writer.is_closing() and not conn.reader.at_eof():
+                return conn
+            conn.close()
+        try:
+            ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host,
+                    self.port,
+                    ssl=ssl_context,
+                    server_hostname=self.host if ssl_context else None,
+                ),
+                timeout,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        return _Connection(reader, writer)
+
+    def release(self, conn: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+class _RateLimiter:
+    """Space requests to one host at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def _read_chunked(reader: asyncio.StreamReader, limit: int) -> bytes:
+    parts: List[bytes] = []
+    size_total = 0
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(parts)
+        size_total += size
+        if size_total > limit:
+            raise ValueError(f"Response body exceeds {limit} bytes")
+        parts.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_response(reader: asyncio.StreamReader, limit: int) -> Tuple[int, Dict[str, str], bytes, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before response")
+    parts = status_line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ValueError(f"Malformed status line: {status_line!r}")
+    version, status = parts[0], int(parts[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    if status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        body = await _read_chunked(reader, limit)
+    elif "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > limit:
+            raise ValueError(f"Response body exceeds {limit} bytes")
+        body = await reader.readexactly(length)
+    else:
+        body = await reader.read(limit + 1)
+        while len(body) <= limit:
+            chunk = await reader.read(limit + 1 - len(body))
+            if not chunk:
+                break
+            body += chunk
+        if len(body) > limit:
+            raise ValueError(f"Response body exceeds {limit} bytes")
+        reusable = False
+    return status, headers, body, reusable
+
+
+def _retry_delay(config: FetchConfig, attempt: int, headers: Dict[str, str]) -> float:
+    retry_after = headers.get("retry-after", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    return config.backoff * (2 ** (attempt - 1))
+
+
+class AsyncFetcher:
+    """Fetch URLs concurrently with pooled connections per host."""
+
+    def __init__(self, config: Optional[FetchConfig] = None, cache: Optional[FetchCache] = None) -> None:
+        self.config = config or FetchConfig()
+        self.cache = cache
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._limiters: Dict[str, _RateLimiter] = {}
+
+    def _pool(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        if key not in self._pools:
+            self._pools[key] = _HostPool(scheme, host, port, self.config.max_connections_per_host)
+            self._limiters.setdefault(host, _RateLimiter(self.config.requests_per_second))
+        return self._pools[key]
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        pool = self._pool(parts.scheme, parts.hostname, port)
+        await self._limiters[parts.hostname].wait()
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        host_header = parts.netloc.rsplit("@", 1)[-1]
+        lines = [f"GET {target} HTTP/1.1", f"Host: {host_header}", f"User-Agent: {self.config.user_agent}"]
+        lines.extend(["Accept-Encoding: identity", "Connection: keep-alive"])
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        conn = await pool.acquire(self.config.timeout)
+        reusable = False
+        try:
+            conn.writer.write(request)
+            await conn.writer.drain()
+            status, response_headers, body, reusable = await asyncio.wait_for(
+                _read_response(conn.reader, self.config.max_body_bytes),
+                self.config.timeout,
+            )
+            return status, response_headers, body
+        finally:
+            pool.release(conn, reusable)
+
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetch ``url`` following redirects, retrying transient failures."""
+
+        result = FetchResult(url=url)
+        current = url
+        redirects = 0
+        while True:
+            validators = self.cache.validators(current) if self.cache else {}
+            result.attempts += 1
+            try:
+                status, headers, body = await self._request(current, validators)
+            except (OSError, EOFError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                status, headers, body = 0, {}, b""
+                result.error = f"{type(exc).__name__}: {exc}"
+            else:
+                result.error = None
+
+            retryable = result.error is not None or status in RETRY_STATUSES
+            if retryable and result.attempts <= self.config.retries:
+                await asyncio.sleep(_retry_delay(self.config, result.attempts, headers))
+                continue
+            if status in REDIRECT_STATUSES and headers.get("location"):
+                redirects += 1
+                if redirects > self.config.max_redirects:
+                    result.error = "Too many redirects"
+                    break
+                current = urljoin(current, headers["location"])
+                continue
+
+            result.status = status
+            result.headers = headers
+            result.final_url = current
+            if status == 304 and self.cache:
+                result.body = self.cache.body(current)
+                result.from_cache = True
+            elif 200 <= status < 300:
+                result.body = body
+                if self.cache:
+                    self.cache.store(current, headers, body)
+            elif result.error is None and status:
+                result.error = f"HTTP {status}"
+            break
+        return result
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[FetchResult]:
+        """Fetch every URL concurrently and return results in input order."""
+
+        slots = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def bounded(url: str) -> FetchResult:
+            async with slots:
+                return await self.fetch(url)
+
+        return list(await asyncio.gather(*(bounded(url) for url in urls)))
+
+    def close(self) -> None:
+        """Close idle pooled connections."""
+
+        for pool in self._pools.values():
+            pool.close()
+        if self.cache:
+            self.cache.save()
+
+
+class FetchSession:
+    """Event loop thread, connection pools and cache shared by fetch streams.
+
+    Each ``iter_pages`` call streams its URLs in input order; calls may
+    follow each other (e.g. one per batch) without reconnecting or
+    reloading the cache, which is saved on ``close``.
+    """
+
+    def __init__(self, config: Optional[FetchConfig] = None, cache_dir: Optional[str] = None) -> None:
+        self.config = config or FetchConfig()
+        self._fetcher = AsyncFetcher(self.config, FetchCache(cache_dir) if cache_dir else None)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="seo-intake-fetch", daemon=True)
+        self._thread.start()
+
+    def iter_pages(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """Fetch ``urls`` concurrently, yielding results in input order.
+
+        Each result is handed to the caller as soon as it and every earlier
+        URL have completed. At most ``config.max_pending`` results are in
+        flight or waiting to be consumed at any time.
+        """
+
+        url_list = list(urls)
+        results: "queue.Queue[Tuple[int, Optional[FetchResult]]]" = queue.Queue()
+        state: Dict[str, asyncio.Semaphore] = {}
+
+        async def main() -> None:
+            # URLs start in input order, so the next one to consume has
+            # always started and a full window cannot stall the consumer.
+            window = state["window"] = asyncio.Semaphore(max(1, self.config.max_pending))
+            slots = asyncio.Semaphore(self.config.max_concurrency)
+
+            async def one(index: int, url: str) -> None:
+                async with slots:
+                    results.put((index, await self._fetcher.fetch(url)))
+
+            tasks = []
+            for index, url in enumerate(url_list):
+                await window.acquire()
+                tasks.append(asyncio.ensure_future(one(index, url)))
+            await asyncio.gather(*tasks)
+
+        future = asyncio.run_coroutine_threadsafe(main(), self._loop)
+        future.add_done_callback(lambda _: results.put((-1, None)))
+        buffered: Dict[int, FetchResult] = {}
+        next_index = 0
+        try:
+            while next_index < len(url_list):
+                index, result = results.get()
+                if result is None:
+                    break
+                buffered[index] = result
+                while next_index in buffered:
+                    self._loop.call_soon_threadsafe(state["window"].release)
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            future.cancel()
+        if next_index < len(url_list) and not future.cancelled() and future.exception() is not None:
+            raise future.exception()  # type: ignore[misc]
+
+    def close(self) -> None:
+        """Close pooled connections, save the cache and stop the loop."""
+
+        async def shutdown() -> None:
+            self._fetcher.close()
+            await asyncio.sleep(0)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> "FetchSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def iter_fetched_pages(
+    urls: Iterable[str],
+    config: Optional[FetchConfig] = None,
+    cache_dir: Optional[str] = None,
+) -> Iterator[FetchResult]:
+    """Fetch ``urls`` concurrently in a one-off session, yielding in input order."""
+
+    with FetchSession(config, cache_dir) as session:
+        yield from session.iter_pages(urls)
+
+
+def fetch_pages(
+    urls: Iterable[str],
+    config: Optional[FetchConfig] = None,
+    cache_dir: Optional[str] = None,
+) -> List[FetchResult]:
+    """Fetch ``urls`` and return every result in input order."""
+
+    return list(iter_fetched_pages(urls, config=config, cache_dir=cache_dir))
@@ -0,0 +1,84 @@
+"""Streaming site statistics gathered during the sitemap pass."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from seo_engine.utils.sketches import HyperLogLog, SpaceSaving, hash64
+
+# Exact per-key counters stop adding keys beyond this many and count the
+# rest under ``OTHER_KEY``, so memory stays fixed for any sitemap size.
+MAX_TRACKED_KEYS = 256
+OTHER_KEY = "(other)"
+MAX_DEPTH = 10
+PREFIX_DEPTH = 3
+
+
+def _bump(counter: Dict[str, int], key: str) -> None:
+    if key in counter or len(counter) < MAX_TRACKED_KEYS:
+        counter[key] = counter.get(key, 0) + 1
+    else:
+        counter[OTHER_KEY] = counter.get(OTHER_KEY, 0) + 1
+
+
+def _sorted_counts(counter: Dict[str, int]) -> Dict[str, int]:
+    return dict(sorted(counter.items(), key=lambda item: (-item[1], item[0])))
+
+
+class SiteStats:
+    """Fixed-memory URL statistics: hosts, sections, depth and sketches."""
+
+    def __init__(self, precision: int = 12, prefix_capacity: int = 64, top_prefixes: int = 20) -> None:
+        self.url_count = 0
+        self.hosts: Dict[str, int] = {}
+        self.sections: Dict[str, int] = {}
+        self.depths: Dict[str, int] = {}
+        self.slugs = HyperLogLog(precision)
+        self.segments = HyperLogLog(precision)
+        self.prefixes = SpaceSaving(prefix_capacity)
+        self.top_prefixes = top_prefixes
+
+    def add(self, url: str) -> None:
+        """Count one canonical URL."""
+
+        self.url_count += 1
+        _, _, rest = url.partition("://")
+        host, slash, path = rest.partition("/")
+        path = path.split("?", 1)[0].split("#", 1)[0]
+        segments = [segment for segment in path.split("/") if segment]
+        _bump(self.hosts, host)
+        _bump(self.sections, f"/{segments[0]}" if segments else "/")
+        depth = len(segments)
+        depth_key = str(depth) if depth < MAX_DEPTH else f"{MAX_DEPTH}+"
+        self.depths[depth_key] = self.depths.get(depth_key, 0) + 1
+        prefix = ""
+        hashed = 0
+        for index, segment in enumerate(segments):
+            hashed = hash64(segment)
+            self.segments.add_hash(hashed)
+            if index < PREFIX_DEPTH and index < depth - 1:
+                prefix = f"{prefix}/{segment}"
+                self.prefixes.add(prefix)
+        if segments:
+            self.slugs.add_hash(hashed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics in ``SiteFacts`` field names."""
+
+        domains: List[str] = [host for host in _sorted_counts(self.hosts) if host != OTHER_KEY]
+        return {
+            "domain": domains[0] if domains else None,
+            "domains": domains,
+            "url_count": self.url_count,
+            "urls_per_host": _sorted_counts(self.hosts),
+            "urls_per_section": _sorted_counts(self.sections),
+            "depth_histogram": dict(
+                sorted(self.depths.items(), key=lambda item: int(item[0].rstrip("+")))
+            ),
+            "distinct_slugs_estimate": self.slugs.count(),
+            "distinct_path_segments_estimate": self.segments.count(),
+            "top_path_prefixes": [
+                {"prefix": prefix, "count": count, "error": error}
+                for prefix, count, error in self.prefixes.top(self.top_prefixes)
+            ],
+        }
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import io
 import xml.etree.ElementTree as ET
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
+from seo_engine.ingest.canonical import UrlCanonicalizer
+from seo_engine.ingest.site_stats import SiteStats
+
 
 def _is_malformed_url(url: str) -> bool:
     parsed = urlparse(url)
@@ -19,20 +23,73 @@ def _is_malformed_url(url: str) -> bool:
     return False
 
 
-def parse_sitemap(sitemap_xml: bytes) -> Tuple[List[str], List[str]]:
-    """Parse sitemap XML bytes into a list of URLs and excluded URLs."""
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_sitemap_entries(
+    sitemap_xml: bytes,
+    canonicalizer: Optional[UrlCanonicalizer] = None,
+    stats: Optional[SiteStats] = None,
+) -> Tuple[List[Tuple[str, Optional[str]]], List[str]]:
+    """Parse sitemap XML bytes into ``(url, lastmod)`` entries and excluded URLs.
+
+    The document is parsed incrementally and ``<url>`` elements are released
+    as soon as they are read. URLs are canonicalized and repeats dropped;
+    pass the same ``canonicalizer`` for every child of a sitemap index to
+    deduplicate across them and to read ``duplicates_dropped`` afterwards.
+    Kept URLs are also counted into ``stats`` when given.
+    """
 
-    root = ET.fromstring(sitemap_xml)
-    urls: List[str] = []
+    if canonicalizer is None:
+        canonicalizer = UrlCanonicalizer()
+    entries: List[Tuple[str, Optional[str]]] = []
     excluded: List[str] = []
-    for url in root.findall(".//{*}url/{*}loc"):
-        if url.text:
-            loc = url.text.strip()
-            if _is_malformed_url(loc):
-                excluded.append(loc)
-            else:
-                urls.append(loc)
-    return urls, excluded
+    path: List[str] = []
+    parents: List[ET.Element] = []
+    loc: Optional[str] = None
+    lastmod: Optional[str] = None
+    for event, element in ET.iterparse(io.BytesIO(sitemap_xml), events=("start", "end")):
+        if event == "start":
+            name = _local_name(element.tag)
+            if name == "url":
+                loc = None
+                lastmod = None
+            path.append(name)
+            parents.append(element)
+            continue
+        name = path.pop()
+        parents.pop()
+        in_url = bool(path) and path[-1] == "url"
+        if name == "loc" and in_url and element.text:
+            loc = element.text.strip()
+        elif name == "lastmod" and in_url and element.text:
+            lastmod = element.text.strip() or None
+        elif name == "url":
+            if loc:
+                if _is_malformed_url(loc):
+                    excluded.append(loc)
+                else:
+                    canonical = canonicalizer.add(loc)
+                    if canonical is not None:
+                        entries.append((canonical, lastmod))
+                        if stats is not None:
+                            stats.add(canonical)
+            loc = None
+            element.clear()
+            if parents:
+                parents[-1].remove(element)
+    return entries, excluded
+
+
+def parse_sitemap(
+    sitemap_xml: bytes,
+    canonicalizer: Optional[UrlCanonicalizer] = None,
+) -> Tuple[List[str], List[str]]:
+    """Parse sitemap XML bytes into a list of URLs and excluded URLs."""
+
+    entries, excluded = parse_sitemap_entries(sitemap_xml, canonicalizer=canonicalizer)
+    return [url for url, _ in entries], excluded
 
 
 def split_item_urls(urls: List[str]) -> Tuple[List[str], List[str]]:
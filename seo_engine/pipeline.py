@@ -2,106 +2,765 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 import os
-from typing import Any, Dict, List, Optional
-
-from seo_engine.extract.locations import extract_locations
-from seo_engine.ingest.ahrefs import build_ahrefs_overview
-from seo_engine.ingest.sitemap import parse_sitemap, split_item_urls
-from seo_engine.render.clipboard import render_clipboard
-from seo_engine.schemas import AhrefsSummary, CorePages, DishTaxonomy, Locations, SiteFacts
-from seo_engine.select.core_pages import rank_core_pages
+import shutil
+from functools import partial
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from seo_engine.ingest.canonical import UrlCanonicalizer
+from seo_engine.ingest.ahrefs import build_ahrefs_overview, iter_keyword_rows
+from seo_engine.ingest.site_stats import SiteStats
+from seo_engine.ingest.sitemap import parse_sitemap_entries, split_item_urls
+from seo_engine.render.clipboard import ClipboardBudget, write_clipboard
+from seo_engine.schemas import (
+    AhrefsSummary,
+    CorePages,
+    DishTaxonomy,
+    ExtractedPages,
+    KeywordPositions,
+    KeywordScores,
+    Locations,
+    SiteFacts,
+)
+from seo_engine.select.core_pages import iter_ranked_core_pages, location_page_urls, rank_core_pages
 from seo_engine.select.dishes import build_dish_taxonomy
-from seo_engine.utils.json_stable import json_dump_stable
+from seo_engine.select.keyword_join import join_keywords
+from seo_engine.store.checkpoints import CheckpointStore, checkpointed, input_fingerprint
+from seo_engine.store.generations import (
+    ARTIFACTS_DIRNAME,
+    KEEP_GENERATIONS,
+    discard_staging_dir,
+    new_staging_dir,
+    publish_generation,
+)
+from seo_engine.utils.arena import BufferRef, InputArena
+from seo_engine.utils.dag import DagReport, Stage, run_dag
+from seo_engine.utils.external_sort import external_sort
+from seo_engine.utils.guard import GuardedRunner, ResourceLimits
+from seo_engine.utils.json_stable import json_dump_stable_stream
+from seo_engine.utils.jsonl import jsonl_filename, write_jsonl_artifact
+from seo_engine.utils.profiling import make_profiler
+
+if TYPE_CHECKING:
+    from seo_engine.ingest.fetch import FetchConfig, FetchSession
+
+ARTIFACT_FORMATS = ("json", "jsonl")
+PROFILES_DIRNAME = "profiles"
+QUARANTINE_DIRNAME = "quarantine"
+SPILL_DIRNAME = "spill"
+# Above this many core pages they are sorted externally in runs of this
+# size, spilled under ``out_dir/spill`` and streamed into the artifact.
+CORE_PAGES_SORT_THRESHOLD = 500_000
+# Location inputs per checkpointed batch.
+LOCATION_BATCH_SIZE = 256
+# Stages whose outputs are checkpointed when ``run_pipeline`` gets a
+# ``checkpoint_dir``; artifact writers are cheap and always rerun.
+CHECKPOINT_STAGES = ("sitemap", "core_pages", "locations", "dish_taxonomy", "ahrefs", "keyword_join")
+# Extractors run alongside ``locations`` on every HTML document, sharing its
+# parse. Each one's results go to its own artifact (``Extractor.artifact``).
+DEFAULT_EXTRACTORS: tuple = ()
+
+# Stages backed by heavy dependencies (BeautifulSoup, sqlite3, difflib) are
+# imported inside ``run_pipeline`` only when the run actually uses them, so
+# importing this module stays cheap for short scheduled jobs.
+
+
+def _normalized_core_page(page: Dict[str, Any]) -> Dict[str, Any]:
+    page_copy = dict(page)
+    reasons = page_copy.get("reasons")
+    if isinstance(reasons, set):
+        page_copy["reasons"] = sorted(reasons)
+    elif isinstance(reasons, tuple):
+        page_copy["reasons"] = list(reasons)
+    return page_copy
+
+
+def _core_page_order(item: Dict[str, Any]) -> Tuple[Any, str]:
+    return (-(item.get("score") or 0), item.get("url") or "")
 
 
 def _stable_core_pages(core_pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Return core pages in a deterministic order."""
 
-    normalized: List[Dict[str, Any]] = []
-    for page in core_pages:
-        page_copy = dict(page)
-        reasons = page_copy.get("reasons")
-        if isinstance(reasons, set):
-            page_copy["reasons"] = sorted(reasons)
-        elif isinstance(reasons, tuple):
-            page_copy["reasons"] = list(reasons)
-        normalized.append(page_copy)
-    return sorted(
-        normalized,
-        key=lambda item: (-(item.get("score") or 0), item.get("url") or ""),
-    )
+    return sorted((_normalized_core_page(page) for page in core_pages), key=_core_page_order)
 
 
-def _ensure_artifacts_dir(out_dir: str) -> str:
+def _ensure_artifacts_dir(artifacts_dir: str) -> str:
     """Create or clear the artifacts directory."""
 
-    artifacts_dir = os.path.join(out_dir, "artifacts")
     os.makedirs(artifacts_dir, exist_ok=True)
     for filename in os.listdir(artifacts_dir):
         file_path = os.path.join(artifacts_dir, filename)
         if os.path.isfile(file_path):
             os.remove(file_path)
+    profiles_dir = os.path.join(artifacts_dir, PROFILES_DIRNAME)
+    if os.path.isdir(profiles_dir):
+        shutil.rmtree(profiles_dir)
     return artifacts_dir
 
 
+def _remove_spill_dir(spill_dir: str) -> None:
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    try:
+        # Shared by concurrent runs; only removed once the last one is done.
+        os.rmdir(os.path.dirname(spill_dir))
+    except OSError:
+        pass
+
+
+def _sitemap_stage(sitemap_xml: bytes) -> Dict[str, Any]:
+    canonicalizer = UrlCanonicalizer()
+    stats = SiteStats()
+    entries, excluded_urls = parse_sitemap_entries(sitemap_xml, canonicalizer=canonicalizer, stats=stats)
+    urls = [url for url, _ in entries]
+    item_urls, non_item_urls = split_item_urls(urls)
+    return {
+        "excluded_urls": excluded_urls,
+        "urls": urls,
+        "item_urls": item_urls,
+        "non_item_urls": non_item_urls,
+        "duplicates_dropped": canonicalizer.duplicates_dropped,
+        "stats": stats.to_dict(),
+        "skipped": [],
+    }
+
+
+def _guarded_sitemap_stage(
+    sitemap_xml: Union[bytes, BufferRef],
+    limits: ResourceLimits,
+    quarantine_dir: str,
+) -> Dict[str, Any]:
+    with GuardedRunner(limits, quarantine_dir=quarantine_dir, suffix=".xml") as guard:
+        sitemap, reason = guard.run(_sitemap_stage, sitemap_xml, source="sitemap")
+    if reason is None:
+        return sitemap
+    empty = _sitemap_stage(b"<urlset/>")
+    empty["skipped"] = guard.skipped
+    return empty
+
+
+def _core_pages_stage(
+    sitemap: Dict[str, Any],
+    spill_dir: Optional[str] = None,
+    sort_threshold: Optional[int] = None,
+) -> Iterable[Dict[str, Any]]:
+    urls = sitemap["non_item_urls"]
+    if spill_dir is None or sort_threshold is None or len(urls) <= sort_threshold:
+        return _stable_core_pages(rank_core_pages(urls))
+    return external_sort(
+        (_normalized_core_page(page) for page in iter_ranked_core_pages(urls)),
+        key=_core_page_order,
+        spill_dir=spill_dir,
+        run_size=sort_threshold,
+    )
+
+
+def _extracted_record(source: str, result: Any) -> Dict[str, Any]:
+    if isinstance(result, dict):
+        return {"source": source, **result}
+    return {"source": source, "result": result}
+
+
+def _location_batch(
+    html_files: List[Union[bytes, BufferRef]],
+    page_urls: List[str],
+    start: int,
+    guard: Optional[GuardedRunner],
+    fetcher: Optional[FetchSession],
+    extractors: Sequence[str],
+) -> Dict[str, Any]:
+    from seo_engine.extract.registry import extract_documents
+
+    fetched: List[Dict[str, Any]] = []
+    extracted: Dict[str, List[Dict[str, Any]]] = {name: [] for name in extractors}
+    candidates: List[Dict[str, Any]] = []
+    sources = [f"html[{start + index}]" for index in range(len(html_files))]
+
+    def fetched_pages() -> Iterator[bytes]:
+        assert fetcher is not None
+        for result in fetcher.iter_pages(page_urls):
+            fetched.append(result.to_dict())
+            if result.ok:
+                sources.append(result.url)
+                yield result.body
+
+    pages = chain(html_files, fetched_pages()) if page_urls else html_files
+    skipped_before = len(guard.skipped) if guard else 0
+    for index, results in extract_documents(pages, ("locations", *extractors), guard=guard, start=start):
+        candidates.extend(results["locations"])
+        for name, records in extracted.items():
+            records.append(_extracted_record(sources[index - start], results[name]))
+    return {
+        "documents": len(sources),
+        "candidates": candidates,
+        "fetched": fetched,
+        "skipped": guard.skipped[skipped_before:] if guard else [],
+        "extracted": extracted,
+    }
+
+
+def _locations_stage(
+    html_files: List[Union[bytes, BufferRef]],
+    core_pages: Optional[List[Dict[str, Any]]] = None,
+    fetch_config: Optional[FetchConfig] = None,
+    fetch_cache_dir: Optional[str] = None,
+    limits: Optional[ResourceLimits] = None,
+    quarantine_dir: Optional[str] = None,
+    extractors: Sequence[str] = DEFAULT_EXTRACTORS,
+    checkpoints: Optional[CheckpointStore] = None,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    page_urls = location_page_urls(core_pages) if core_pages is not None else []
+    extracted: Dict[str, List[Dict[str, Any]]] = {name: [] for name in extractors}
+    if not html_files and not page_urls:
+        return {"locations": [], "merges": [], "fetched": [], "skipped": [], "extracted": extracted}
+    from seo_engine.extract.dedupe import LocationDedupeAudit, dedupe_locations
+
+    # Inputs (uploaded documents, then location page URLs) are processed in
+    # fixed batches, each checkpointed, so a resumed run skips finished ones.
+    batch_size = batch_size or LOCATION_BATCH_SIZE
+    guard = GuardedRunner(limits, quarantine_dir=quarantine_dir, suffix=".html") if limits else None
+    fetcher = None
+    if page_urls:
+        from seo_engine.ingest.fetch import FetchSession
+
+        # One loop, connection pool and cache for every batch of the stage.
+        fetcher = FetchSession(fetch_config, fetch_cache_dir)
+    merged: Dict[str, List[Dict[str, Any]]] = {"candidates": [], "fetched": [], "skipped": []}
+    start = 0
+    try:
+        for offset in range(0, len(html_files) + len(page_urls), batch_size):
+            stop = offset + batch_size
+            batch = checkpointed(
+                checkpoints,
+                f"locations-{offset:08d}",
+                partial(
+                    _location_batch,
+                    html_files[offset:stop],
+                    page_urls[max(offset - len(html_files), 0) : max(stop - len(html_files), 0)],
+                    start,
+                    guard,
+                    fetcher,
+                    extractors,
+                ),
+            )
+            start += batch["documents"]
+            for key, records in merged.items():
+                records.extend(batch[key])
+            for name, records in extracted.items():
+                records.extend(batch["extracted"][name])
+    finally:
+        if guard is not None:
+            guard.close()
+        if fetcher is not None:
+            fetcher.close()
+    location_audit = LocationDedupeAudit()
+    return {
+        "locations": dedupe_locations(merged["candidates"], audit=location_audit),
+        "merges": location_audit.decisions,
+        "fetched": merged["fetched"],
+        "skipped": merged["skipped"],
+        "extracted": extracted,
+    }
+
+
+def _dish_taxonomy_stage(
+    sitemap: Dict[str, Any],
+    dish_state_path: Optional[str],
+    verify_incremental: bool,
+    token_stats_path: Optional[str],
+    site: Optional[str],
+    run_id: Optional[str],
+) -> Dict[str, Any]:
+    urls = sitemap["urls"]
+    item_urls = sitemap["item_urls"]
+    token_store = None
+    if token_stats_path:
+        from seo_engine.store.token_stats import TokenStatsStore
+
+        token_store = TokenStatsStore(token_stats_path)
+    site_name = site or (urlparse(urls[0]).hostname if urls else "") or ""
+    run_name = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    try:
+        if dish_state_path:
+            from seo_engine.select.dish_state import build_dish_taxonomy_incremental
+
+            return build_dish_taxonomy_incremental(
+                item_urls,
+                dish_state_path,
+                verify=verify_incremental,
+                token_store=token_store,
+                site=site_name,
+                run_id=run_name,
+            )
+        return build_dish_taxonomy(
+            item_urls,
+            token_store=token_store,
+            site=site_name,
+            run_id=run_name,
+        )
+    finally:
+        if token_store is not None:
+            token_store.close()
+
+
+def _keyword_join_stage(
+    keyword_csv: Optional[bytes],
+    sitemap: Dict[str, Any],
+    core_pages: List[Dict[str, Any]],
+    positions_spill_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    return join_keywords(
+        iter_keyword_rows(keyword_csv),
+        core_pages,
+        sitemap["item_urls"],
+        positions_spill_dir=positions_spill_dir,
+    )
+
+
+def _write_artifact(artifacts_dir: str, filename: str, payload: Dict[str, Any], artifact_format: str) -> Dict[str, Any]:
+    if artifact_format == "jsonl":
+        write_jsonl_artifact(os.path.join(artifacts_dir, jsonl_filename(filename)), filename, payload)
+    else:
+        json_dump_stable_stream(payload, os.path.join(artifacts_dir, filename))
+    return payload
+
+
+def _write_sqlite_stage(artifacts_dir: str, filenames: Dict[str, str], **payloads: Dict[str, Any]) -> str:
+    from seo_engine.store.sqlite_sink import SQLITE_FILENAME, write_sqlite_artifacts
+
+    artifacts = {filenames[name]: payload for name, payload in payloads.items()}
+    return write_sqlite_artifacts(os.path.join(artifacts_dir, SQLITE_FILENAME), artifacts)
+
+
+def _clipboard_stage(
+    artifacts_dir: str,
+    core_pages: List[Dict[str, Any]],
+    locations: Dict[str, Any],
+    dish_taxonomy: Dict[str, Any],
+    ahrefs: Dict[str, Any],
+    budget: Optional[ClipboardBudget],
+) -> str:
+    clipboard_path = os.path.join(artifacts_dir, "clipboard_package.txt")
+    with open(clipboard_path, "w", encoding="utf-8") as handle:
+        write_clipboard(
+            handle,
+            locations=locations["locations"],
+            core_pages=core_pages,
+            dish_categories=dish_taxonomy.get("categories", []),
+            ahrefs_snapshot=ahrefs,
+            dish_taxonomy=dish_taxonomy,
+            include_unknown_tokens=False,
+            budget=budget,
+        )
+    return clipboard_path
+
+
+# Write stage name -> artifact filename, besides extractor artifacts.
+ARTIFACT_STAGES = {
+    "write_site_facts": "site_facts.json",
+    "write_locations": "locations.json",
+    "write_core_pages": "core_pages.json",
+    "write_dish_taxonomy": "dish_taxonomy.json",
+    "write_ahrefs_summary": "ahrefs_summary.json",
+    "write_keyword_scores": "keyword_scores.json",
+}
+
+
+def build_stages(
+    sitemap_xml: bytes,
+    html_files: List[bytes],
+    out_dir: str,
+    keyword_csv: Optional[bytes] = None,
+    performance_csv: Optional[bytes] = None,
+    dish_state_path: Optional[str] = None,
+    verify_incremental: bool = False,
+    token_stats_path: Optional[str] = None,
+    site: Optional[str] = None,
+    run_id: Optional[str] = None,
+    sqlite_artifacts: bool = False,
+    artifact_format: str = "json",
+    clipboard_budget: Optional[ClipboardBudget] = None,
+    use_processes: bool = False,
+    fetch_locations: bool = False,
+    fetch_config: Optional[FetchConfig] = None,
+    fetch_cache_dir: Optional[str] = None,
+    limits: Optional[ResourceLimits] = None,
+    extractors: Sequence[str] = DEFAULT_EXTRACTORS,
+    checkpoints: Optional[CheckpointStore] = None,
+    core_pages_sort_threshold: Optional[int] = CORE_PAGES_SORT_THRESHOLD,
+    keyword_positions: bool = False,
+    artifacts_dir: Optional[str] = None,
+    spill_dir: Optional[str] = None,
+    arena: Optional[InputArena] = None,
+) -> List[Stage]:
+    """Return the pipeline as a stage DAG.
+
+    The sitemap, HTML and CSV branches are independent until the clipboard;
+    each artifact is written as soon as its payload is ready. With
+    ``fetch_locations`` the location branch waits for core pages and fetches
+    the ``Locations`` pages itself. With ``checkpoints``, the outputs of
+    ``CHECKPOINT_STAGES`` and of each location batch are reused if present
+    and saved otherwise. Artifacts go to ``artifacts_dir`` (default
+    ``out_dir/artifacts``) and sort runs to ``spill_dir`` (default
+    ``out_dir/spill``). With an ``arena``, HTML documents and the guarded
+    sitemap are placed in it once and worker processes receive refs.
+    With ``keyword_positions``, keyword rows are also spilled to
+    ``spill_dir`` and streamed into ``keyword_positions.json``.
+    """
+
+    quarantine_dir = os.path.join(out_dir, QUARANTINE_DIRNAME)
+    spill_dir = spill_dir or os.path.join(out_dir, SPILL_DIRNAME)
+    sitemap_input: Union[bytes, BufferRef] = sitemap_xml
+    html_inputs: List[Union[bytes, BufferRef]] = list(html_files)
+    if arena is not None:
+        html_inputs = list(arena.extend(html_files))
+        if limits:
+            sitemap_input = arena.add(sitemap_xml)
+
+    def write(filename: str, build: Callable[..., Any]) -> Callable[..., Dict[str, Any]]:
+        def stage(artifacts_dir: str, **inputs: Any) -> Dict[str, Any]:
+            return _write_artifact(artifacts_dir, filename, build(**inputs).to_dict(), artifact_format)
+
+        return stage
+
+    stages = [
+        Stage(
+            "sitemap",
+            partial(_guarded_sitemap_stage, sitemap_input, limits, quarantine_dir)
+            if limits
+            else partial(_sitemap_stage, sitemap_xml),
+        ),
+        Stage(
+            "core_pages",
+            partial(
+                _core_pages_stage,
+                spill_dir=spill_dir,
+                sort_threshold=core_pages_sort_threshold,
+            ),
+            ("sitemap",),
+        ),
+        Stage(
+            "locations",
+            partial(
+                _locations_stage,
+                html_inputs,
+                fetch_config=fetch_config,
+                fetch_cache_dir=fetch_cache_dir,
+                limits=limits,
+                quarantine_dir=quarantine_dir,
+                extractors=tuple(extractors),
+                checkpoints=checkpoints,
+            ),
+            ("core_pages",) if fetch_locations else (),
+            process=use_processes and (bool(html_files) or fetch_locations),
+        ),
+        Stage(
+            "dish_taxonomy",
+            partial(
+                _dish_taxonomy_stage,
+                dish_state_path=dish_state_path,
+                verify_incremental=verify_incremental,
+                token_stats_path=token_stats_path,
+                site=site,
+                run_id=run_id,
+            ),
+            ("sitemap",),
+        ),
+        Stage("ahrefs", partial(build_ahrefs_overview, keyword_csv, performance_csv)),
+        Stage(
+            "keyword_join",
+            partial(_keyword_join_stage, keyword_csv, positions_spill_dir=spill_dir if keyword_positions else None),
+            ("sitemap", "core_pages"),
+        ),
+        Stage(
+            "artifacts_dir",
+            partial(_ensure_artifacts_dir, artifacts_dir or os.path.join(out_dir, ARTIFACTS_DIRNAME)),
+        ),
+        Stage(
+            "write_site_facts",
+            write(
+                "site_facts.json",
+                lambda sitemap: SiteFacts(
+                    duplicate_urls_dropped=sitemap["duplicates_dropped"],
+                    skipped=sitemap["skipped"],
+                    **sitemap["stats"],
+                ),
+            ),
+            ("artifacts_dir", "sitemap"),
+        ),
+        Stage(
+            "write_locations",
+            write(
+                "locations.json",
+                lambda locations: Locations(
+                    locations=locations["locations"],
+                    merges=locations["merges"],
+                    fetched=locations["fetched"],
+                    skipped=locations["skipped"],
+                ),
+            ),
+            ("artifacts_dir", "locations"),
+        ),
+        Stage(
+            "write_core_pages",
+            write(
+                "core_pages.json",
+                lambda sitemap, core_pages: CorePages(
+                    urls=core_pages,
+                    excluded=[
+                        {"url": url, "reasons": ["exclude:malformed_url"]}
+                        for url in sitemap["excluded_urls"]
+                    ],
+                ),
+            ),
+            ("artifacts_dir", "sitemap", "core_pages"),
+        ),
+        Stage(
+            "write_dish_taxonomy",
+            write("dish_taxonomy.json", lambda dish_taxonomy: DishTaxonomy(dishes=dish_taxonomy)),
+            ("artifacts_dir", "dish_taxonomy"),
+        ),
+        Stage(
+            "write_ahrefs_summary",
+            write("ahrefs_summary.json", lambda ahrefs: AhrefsSummary(overview=ahrefs)),
+            ("artifacts_dir", "ahrefs"),
+        ),
+        Stage(
+            "write_keyword_scores",
+            write(
+                "keyword_scores.json",
+                lambda keyword_join: KeywordScores(
+                    **{key: value for key, value in keyword_join.items() if key != "keywords"}
+                ),
+            ),
+            ("artifacts_dir", "keyword_join"),
+        ),
+    ]
+    if keyword_positions:
+        stages.append(
+            Stage(
+                "write_keyword_positions",
+                write(
+                    "keyword_positions.json",
+                    lambda keyword_join: KeywordPositions(keywords=keyword_join["keywords"]),
+                ),
+                ("artifacts_dir", "keyword_join"),
+            )
+        )
+    if checkpoints is not None:
+        stages = [
+            Stage(stage.name, partial(checkpointed, checkpoints, stage.name, stage.func), stage.deps, stage.process)
+            if stage.name in CHECKPOINT_STAGES
+            else stage
+            for stage in stages
+        ]
+    artifact_stages = dict(ARTIFACT_STAGES)
+    if keyword_positions:
+        artifact_stages["write_keyword_positions"] = "keyword_positions.json"
+    if extractors:
+        from seo_engine.extract.registry import get_extractor
+
+        for name in extractors:
+            artifact = get_extractor(name).artifact
+            stage_name = f"write_{os.path.splitext(artifact)[0]}"
+            if stage_name in artifact_stages:
+                raise ValueError(f"Extractor {name!r} artifact {artifact!r} is already written")
+            artifact_stages[stage_name] = artifact
+            stages.append(
+                Stage(
+                    stage_name,
+                    write(
+                        artifact,
+                        lambda locations, name=name: ExtractedPages(pages=locations["extracted"][name]),
+                    ),
+                    ("artifacts_dir", "locations"),
+                )
+            )
+    if sqlite_artifacts:
+        written = [stage.name for stage in stages if stage.name in artifact_stages]
+        stages.append(
+            Stage(
+                "write_sqlite",
+                partial(_write_sqlite_stage, filenames=artifact_stages),
+                ("artifacts_dir", *written),
+            )
+        )
+    stages.append(
+        Stage(
+            "clipboard",
+            partial(_clipboard_stage, budget=clipboard_budget),
+            ("artifacts_dir", "core_pages", "locations", "dish_taxonomy", "ahrefs"),
+        )
+    )
+    return stages
+
+
 def run_pipeline(
     sitemap_xml: bytes,
     html_files: List[bytes],
     out_dir: str,
     keyword_csv: Optional[bytes] = None,
     performance_csv: Optional[bytes] = None,
+    dish_state_path: Optional[str] = None,
+    verify_incremental: bool = False,
+    token_stats_path: Optional[str] = None,
+    site: Optional[str] = None,
+    run_id: Optional[str] = None,
+    sqlite_artifacts: bool = False,
+    artifact_format: str = "json",
+    profile: bool = False,
+    clipboard_budget: Optional[ClipboardBudget] = None,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    stage_report: Optional[DagReport] = None,
+    fetch_locations: bool = False,
+    fetch_config: Optional[FetchConfig] = None,
+    fetch_cache_dir: Optional[str] = None,
+    limits: Optional[ResourceLimits] = None,
+    extractors: Sequence[str] = DEFAULT_EXTRACTORS,
+    checkpoint_dir: Optional[str] = None,
+    core_pages_sort_threshold: Optional[int] = CORE_PAGES_SORT_THRESHOLD,
+    keyword_positions: bool = False,
+    keep_generations: int = KEEP_GENERATIONS,
 ) -> str:
-    """Run the SEO intake pipeline and return the artifacts directory."""
+    """Run the SEO intake pipeline and return the published artifacts directory.
 
-    urls, excluded_urls = parse_sitemap(sitemap_xml)
-    item_urls, non_item_urls = split_item_urls(urls)
-    core_pages = _stable_core_pages(rank_core_pages(non_item_urls))
-    locations = extract_locations(html_files)
-    dish_taxonomy = build_dish_taxonomy(item_urls)
-
-    artifacts_dir = _ensure_artifacts_dir(out_dir)
-
-    site_facts = SiteFacts()
-    core_pages_schema = CorePages(
-        urls=core_pages,
-        excluded=[
-            {"url": url, "reasons": ["exclude:malformed_url"]} for url in excluded_urls
-        ],
-    )
-    locations_schema = Locations(locations=locations)
-    dish_schema = DishTaxonomy(dishes=dish_taxonomy)
-    ahrefs_overview = build_ahrefs_overview(keyword_csv, performance_csv)
-    ahrefs_schema = AhrefsSummary(overview=ahrefs_overview)
-
-    json_dump_stable(site_facts.to_dict(), os.path.join(artifacts_dir, "site_facts.json"))
-    json_dump_stable(
-        locations_schema.to_dict(),
-        os.path.join(artifacts_dir, "locations.json"),
-    )
-    json_dump_stable(
-        core_pages_schema.to_dict(),
-        os.path.join(artifacts_dir, "core_pages.json"),
-    )
-    json_dump_stable(
-        dish_schema.to_dict(),
-        os.path.join(artifacts_dir, "dish_taxonomy.json"),
-    )
-    json_dump_stable(
-        ahrefs_schema.to_dict(),
-        os.path.join(artifacts_dir, "ahrefs_summary.json"),
+    Each run writes into a private staging directory and publishes it as a
+    new generation under ``out_dir/generations``, atomically repointing the
+    ``out_dir/artifacts`` link and keeping the newest ``keep_generations``.
+    The returned path is this run's generation, which is never modified;
+    concurrent runs on the same ``out_dir`` are safe.
+
+    When ``dish_state_path`` is set, the dish taxonomy is updated
+    incrementally from the state persisted there by the previous run.
+    ``token_stats_path`` names a SQLite database that accumulates unknown
+    dish tokens per ``site`` (default: first sitemap host) and ``run_id``
+    (default: current UTC time). ``sqlite_artifacts`` additionally writes
+    every artifact into one indexed ``artifacts.sqlite``. ``artifact_format``
+    selects ``"json"`` documents or streamable ``"jsonl"`` files. With
+    ``profile``, per-stage CPU profiles and tracemalloc snapshots are saved
+    under ``artifacts/profiles``. ``clipboard_budget`` switches the clipboard
+    package to a size-capped summary.
+
+    Independent stages run concurrently on up to ``max_workers`` threads
+    (location extraction in a worker process with ``use_processes``);
+    profiling forces serial execution. Stage timings and the critical path
+    are recorded into ``stage_report`` when given.
+
+    ``fetch_locations`` fetches the sitemap's location pages over HTTP
+    (conditional GETs cached in ``fetch_cache_dir``) and streams them into
+    extraction after any uploaded ``html_files``.
+
+    With ``limits``, the sitemap and every HTML document are parsed in
+    killable worker processes; documents that exceed a limit are copied to
+    ``out_dir/quarantine`` and listed under ``skipped`` in ``site_facts.json``
+    or ``locations.json`` instead of failing the run. With ``limits`` or
+    ``use_processes``, input documents are written once to an ``InputArena``
+    and workers read them by reference; the arena is removed when the run
+    ends.
+
+    ``extractors`` names additional HTML extractors (e.g. ``"page_meta"``)
+    that share each document's single parse with location extraction; each
+    one's per-document results are written to its ``Extractor.artifact``.
+
+    With ``checkpoint_dir``, stage outputs and location batches are
+    checkpointed there under a fingerprint of the inputs; rerunning the same
+    inputs after a crash resumes from them and writes the same artifacts.
+    Checkpoints are removed once the run completes.
+
+    More than ``core_pages_sort_threshold`` core pages (``None`` disables
+    this) are sorted with an external merge sort whose runs are spilled
+    under ``out_dir/spill`` and streamed into ``core_pages.json``.
+    ``keyword_positions`` also writes each keyword's best-ranking row to
+    ``keyword_positions.json`` (spilled the same way), which ``seo-intake
+    diff`` needs to compare keyword movement.
+    """
+
+    if artifact_format not in ARTIFACT_FORMATS:
+        raise ValueError(f"Unknown artifact format: {artifact_format!r}")
+
+    checkpoints = None
+    if checkpoint_dir:
+        fingerprint = input_fingerprint(
+            [sitemap_xml, keyword_csv, performance_csv, *html_files],
+            (
+                fetch_locations,
+                fetch_config,
+                limits,
+                tuple(extractors),
+                dish_state_path,
+                verify_incremental,
+                keyword_positions,
+            ),
+        )
+        checkpoints = CheckpointStore(checkpoint_dir, fingerprint)
+    # Documents crossing into worker processes (guards, process stages) are
+    # shared through one arena instead of being pickled per worker.
+    arena = None
+    if limits or use_processes:
+        arena = InputArena(size_hint=len(sitemap_xml) + sum(len(html) for html in html_files))
+    staging_dir = new_staging_dir(out_dir)
+    # Concurrent runs on one out_dir get their own sort runs; a resumed run
+    # finds the ones its checkpoints reference.
+    spill_dir = os.path.join(
+        out_dir,
+        SPILL_DIRNAME,
+        checkpoints.fingerprint if checkpoints else os.path.basename(staging_dir),
     )
 
-    clipboard_text = render_clipboard(
-        locations=locations,
-        core_pages=core_pages,
-        dish_categories=dish_taxonomy.get("categories", []),
-        ahrefs_snapshot=ahrefs_schema.overview,
-        dish_taxonomy=dish_taxonomy,
-        include_unknown_tokens=False,
+    stages = build_stages(
+        sitemap_xml,
+        html_files,
+        out_dir,
+        keyword_csv=keyword_csv,
+        performance_csv=performance_csv,
+        dish_state_path=dish_state_path,
+        verify_incremental=verify_incremental,
+        token_stats_path=token_stats_path,
+        site=site,
+        run_id=run_id,
+        sqlite_artifacts=sqlite_artifacts,
+        artifact_format=artifact_format,
+        clipboard_budget=clipboard_budget,
+        use_processes=use_processes,
+        fetch_locations=fetch_locations,
+        fetch_config=fetch_config,
+        fetch_cache_dir=fetch_cache_dir,
+        limits=limits,
+        extractors=extractors,
+        checkpoints=checkpoints,
+        core_pages_sort_threshold=core_pages_sort_threshold,
+        keyword_positions=keyword_positions,
+        artifacts_dir=staging_dir,
+        spill_dir=spill_dir,
+        arena=arena,
     )
-    clipboard_path = os.path.join(artifacts_dir, "clipboard_package.txt")
-    with open(clipboard_path, "w", encoding="utf-8") as handle:
-        handle.write(clipboard_text)
+    profiler = make_profiler(profile)
+    try:
+        results = run_dag(
+            stages,
+            max_workers=1 if profile else max_workers,
+            report=stage_report,
+            stage_context=profiler.stage if profile else None,
+        )
+        profiler.write(os.path.join(results["artifacts_dir"], PROFILES_DIRNAME))
+        artifacts_dir = publish_generation(out_dir, staging_dir, keep=keep_generations)
+    except BaseException:
+        discard_staging_dir(staging_dir)
+        raise
+    finally:
+        profiler.close()
+        if arena is not None:
+            arena.close()
+        # Checkpointed runs may still reference spilled runs on resume.
+        if checkpoints is None:
+            _remove_spill_dir(spill_dir)
 
+    if checkpoints is not None:
+        checkpoints.clear()
+        _remove_spill_dir(spill_dir)
     return artifacts_dir
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import heapq
+import io
+from collections import Counter
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 def _collect_unknown_tokens(dish_taxonomy: Optional[Dict[str, Any]]) -> List[Tuple[str, Optional[int]]]:
@@ -31,71 +35,234 @@ def _collect_unknown_tokens(dish_taxonomy: Optional[Dict[str, Any]]) -> List[Tup
     return collected
 
 
-def render_clipboard(
-    locations: List[Dict[str, Any]],
-    core_pages: List[Dict[str, Any]],
+@dataclass
+class ClipboardBudget:
+    """Limits for the summary clipboard mode.
+
+    Each list section keeps at most its ``max_*`` entries (core pages are the
+    top ones by score) followed by an "…and N more" marker. ``max_chars``
+    is a hard cap on the total text: entries that would exceed it are
+    counted instead, and once a heading or marker no longer fits the rest
+    is cut and replaced by a final "…truncated" line.
+    """
+
+    max_locations: int = 20
+    max_core_pages: int = 25
+    max_dish_categories: int = 20
+    max_keywords: int = 10
+    max_unknown_tokens: int = 20
+    max_chars: Optional[int] = 20000
+
+
+TRUNCATED_MARKER = "…truncated"
+# Room kept after list entries for the "…and N more" line that may follow.
+_MORE_RESERVE = len("  - …and 9999999 more") + 1
+
+
+class _LineWriter:
+    """Write lines within ``max_chars``, reserving room for the final marker."""
+
+    def __init__(self, handle: IO[str], max_chars: Optional[int] = None) -> None:
+        self.handle = handle
+        self.max_chars = max_chars
+        self.chars = 0
+        self.truncated = False
+
+    def _fits(self, text: str, reserve: int = 0) -> bool:
+        if self.max_chars is None:
+            return True
+        needed = self.chars + bool(self.chars) + len(text) + reserve
+        return needed + len(TRUNCATED_MARKER) + 1 <= self.max_chars
+
+    def _write(self, text: str) -> None:
+        if self.chars:
+            text = "\n" + text
+        self.handle.write(text)
+        self.chars += len(text)
+
+    def line(self, text: str) -> None:
+        """Write a heading or marker; the first one that does not fit ends the output."""
+
+        if self.truncated:
+            return
+        if not self._fits(text):
+            self.truncated = True
+            return
+        self._write(text)
+
+    def item(self, text: str) -> bool:
+        """Write an optional line unless it would exceed the budget."""
+
+        if self.truncated or not self._fits(text, _MORE_RESERVE):
+            return False
+        self._write(text)
+        return True
+
+    def finish(self) -> int:
+        """Mark cut output and return the characters written."""
+
+        if self.truncated and self.max_chars is not None:
+            if self.chars + bool(self.chars) + len(TRUNCATED_MARKER) <= self.max_chars:
+                self._write(TRUNCATED_MARKER)
+        return self.chars
+
+
+def _write_items(
+    writer: _LineWriter,
+    items: Iterable[Any],
+    render: Callable[[Any], Optional[str]],
+    limit: Optional[int],
+    indent: str = "",
+    omitted: int = 0,
+) -> None:
+    """Write ``items`` as a list, ending with one marker for everything left out."""
+
+    shown = 0
+    for item in items:
+        text = render(item)
+        if text is None:
+            continue
+        if (limit is not None and shown >= limit) or not writer.item(f"{indent}- {text}"):
+            omitted += 1
+        else:
+            shown += 1
+    if omitted:
+        writer.line(f"{indent}- …and {omitted} more")
+
+
+def _page_sort_key(page: Dict[str, Any]) -> Tuple[Any, str]:
+    return (-(page.get("score") or 0), page.get("url") or "")
+
+
+def _write_core_pages_summary(
+    writer: _LineWriter, core_pages: Iterable[Dict[str, Any]], limit: int
+) -> None:
+    labels: Counter = Counter()
+    total = 0
+
+    def counted() -> Iterable[Dict[str, Any]]:
+        nonlocal total
+        for page in core_pages:
+            total += 1
+            labels[page.get("label") or "Other"] += 1
+            yield page
+
+    top = heapq.nsmallest(limit, counted(), key=_page_sort_key)
+    writer.line(f"Core Pages ({total} total):")
+    for label, count in sorted(labels.items(), key=lambda item: (-item[1], item[0])):
+        writer.item(f"- {label}: {count}")
+    writer.line("Top Core Pages by score:")
+    _write_items(writer, top, lambda page: page.get("url", ""), None, omitted=total - len(top))
+
+
+def _category_line(category: Dict[str, Any]) -> Optional[str]:
+    label = category.get("category", "")
+    if not label:
+        return None
+    count = category.get("count")
+    return label if count is None else f"{label} ({count})"
+
+
+def _keyword_line(entry: Dict[str, Any]) -> str:
+    keyword = entry.get("keyword") or ""
+    volume = entry.get("volume")
+    position = entry.get("position")
+    url = entry.get("url") or ""
+    return f"{keyword} — {volume} — {position} — {url}"
+
+
+def _token_line(entry: Tuple[str, Optional[int]]) -> str:
+    token, count = entry
+    return token if count is None else f"{token}: {count}"
+
+
+def write_clipboard(
+    handle: IO[str],
+    locations: Iterable[Dict[str, Any]],
+    core_pages: Iterable[Dict[str, Any]],
     dish_categories: List[Dict[str, Any]],
     ahrefs_snapshot: Dict[str, Any],
     dish_taxonomy: Optional[Dict[str, Any]] = None,
     include_unknown_tokens: bool = False,
-) -> str:
-    """Render a simple clipboard package text."""
+    budget: Optional[ClipboardBudget] = None,
+) -> int:
+    """Stream the clipboard package to ``handle`` and return characters written.
+
+    Without ``budget`` every location and core page is listed. With a
+    ``budget`` the summary is computed in one pass over each input.
+    """
 
-    lines = ["SEO Intake Summary"]
-    lines.append("Locations:")
-    for location in locations:
-        lines.append(f"- {location.get('location_name') or location.get('name', '')}")
-    lines.append("Core Pages:")
-    for page in core_pages:
-        lines.append(f"- {page.get('url', '')}")
-    lines.append("Dish Categories:")
+    writer = _LineWriter(handle, budget.max_chars if budget else None)
+    writer.line("SEO Intake Summary")
+    writer.line("Locations:")
+    _write_items(
+        writer,
+        locations,
+        lambda location: location.get("location_name") or location.get("name", ""),
+        budget.max_locations if budget else None,
+    )
+    if budget:
+        _write_core_pages_summary(writer, core_pages, budget.max_core_pages)
+    else:
+        writer.line("Core Pages:")
+        _write_items(writer, core_pages, lambda page: page.get("url", ""), None)
+    writer.line("Dish Categories:")
     if dish_categories:
-        for category in dish_categories:
-            label = category.get("category", "")
-            count = category.get("count")
-            if label:
-                if count is None:
-                    lines.append(f"- {label}")
-                else:
-                    lines.append(f"- {label} ({count})")
+        _write_items(writer, dish_categories, _category_line, budget.max_dish_categories if budget else None)
     else:
-        lines.append("No dish categories mapped (strict mode)")
+        writer.line("No dish categories mapped (strict mode)")
     if not ahrefs_snapshot:
-        lines.append("Ahrefs Snapshot: Not provided")
+        writer.line("Ahrefs Snapshot: Not provided")
     else:
-        lines.append("Ahrefs Snapshot:")
+        writer.line("Ahrefs Snapshot:")
         traffic_trend = ahrefs_snapshot.get("traffic_trend", {})
         direction = traffic_trend.get("direction") or "Unknown"
         confidence = traffic_trend.get("confidence") or "Unknown"
-        lines.append(f"- Trend: {direction} (confidence: {confidence})")
+        writer.line(f"- Trend: {direction} (confidence: {confidence})")
 
         distribution = ahrefs_snapshot.get("position_distribution", {})
         latest_counts = distribution.get("latest_counts", {})
         if latest_counts:
-            lines.append("- Latest bucket counts:")
+            writer.line("- Latest bucket counts:")
             for bucket, count in latest_counts.items():
-                lines.append(f"  - {bucket}: {count}")
+                writer.line(f"  - {bucket}: {count}")
         else:
-            lines.append("- Latest bucket counts: None")
+            writer.line("- Latest bucket counts: None")
 
         top_keywords = ahrefs_snapshot.get("top_keywords", [])
         if top_keywords:
-            lines.append("- Top keywords:")
-            for entry in top_keywords:
-                keyword = entry.get("keyword") or ""
-                volume = entry.get("volume")
-                position = entry.get("position")
-                url = entry.get("url") or ""
-                lines.append(f"  - {keyword} — {volume} — {position} — {url}")
+            writer.line("- Top keywords:")
+            _write_items(writer, top_keywords, _keyword_line, budget.max_keywords if budget else None, "  ")
         else:
-            lines.append("- Top keywords: None")
+            writer.line("- Top keywords: None")
     if include_unknown_tokens:
         unknown_tokens = _collect_unknown_tokens(dish_taxonomy)
         if unknown_tokens:
-            lines.append("DISH UNKNOWN TOKENS (for tuning)")
-            for token, count in unknown_tokens:
-                if count is None:
-                    lines.append(f"- {token}")
-                else:
-                    lines.append(f"- {token}: {count}")
-    return "\n".join(lines)
+            writer.line("DISH UNKNOWN TOKENS (for tuning)")
+            _write_items(writer, unknown_tokens, _token_line, budget.max_unknown_tokens if budget else None)
+    return writer.finish()
+
+
+def render_clipboard(
+    locations: List[Dict[str, Any]],
+    core_pages: List[Dict[str, Any]],
+    dish_categories: List[Dict[str, Any]],
+    ahrefs_snapshot: Dict[str, Any],
+    dish_taxonomy: Optional[Dict[str, Any]] = None,
+    include_unknown_tokens: bool = False,
+    budget: Optional[ClipboardBudget] = None,
+) -> str:
+    """Render a simple clipboard package text."""
+
+    buffer = io.StringIO()
+    write_clipboard(
+        buffer,
+        locations,
+        core_pages,
+        dish_categories,
+        ahrefs_snapshot,
+        dish_taxonomy=dish_taxonomy,
+        include_unknown_tokens=include_unknown_tokens,
+        budget=budget,
+    )
+    return buffer.getvalue()
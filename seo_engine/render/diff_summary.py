@@ -0,0 +1,74 @@
+"""Render a clipboard-friendly summary of a run diff."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+def _append_capped(lines: List[str], entries: List[str], limit: int) -> None:
+    for entry in entries[:limit]:
+        lines.append(f"  - {entry}")
+    if len(entries) > limit:
+        lines.append(f"  - …and {len(entries) - limit} more")
+
+
+def render_diff_summary(diff: Dict[str, Any], limit: int = 20) -> str:
+    """Render a short text summary of ``diff_artifacts`` output."""
+
+    lines = ["SEO Intake Changes"]
+
+    core_pages = diff.get("core_pages", {})
+    added = core_pages.get("added", [])
+    removed = core_pages.get("removed", [])
+    changed = core_pages.get("changed", [])
+    lines.append(f"Core Pages: +{len(added)} / -{len(removed)} / ~{len(changed)}")
+    if added:
+        lines.append("- New:")
+        _append_capped(lines, added, limit)
+    if removed:
+        lines.append("- Removed:")
+        _append_capped(lines, removed, limit)
+    if changed:
+        lines.append("- Changed:")
+        _append_capped(lines, [entry["url"] for entry in changed], limit)
+
+    locations = diff.get("locations", {})
+    moved = locations.get("moved", [])
+    lines.append(
+        "Locations: "
+        f"+{len(locations.get('added', []))} / -{len(locations.get('removed', []))} / moved {len(moved)}"
+    )
+    _append_capped(
+        lines,
+        [f"{entry['location_name']}: {entry['before']} -> {entry['after']}" for entry in moved],
+        limit,
+    )
+
+    dish_changes = diff.get("dish_categories", [])
+    if dish_changes:
+        lines.append("Dish Categories:")
+        _append_capped(
+            lines,
+            [
+                f"{entry['category']}: {entry['before']} -> {entry['after']} ({entry['delta']:+d})"
+                for entry in dish_changes
+            ],
+            limit,
+        )
+    else:
+        lines.append("Dish Categories: unchanged")
+
+    keywords = diff.get("keywords")
+    keyword_moves = keywords.get("moved", []) if keywords else []
+    if keywords is None:
+        lines.append("Keyword Positions: not recorded (run with --keyword-positions)")
+    elif keyword_moves:
+        lines.append("Keyword Positions:")
+        _append_capped(
+            lines,
+            [f"{entry['keyword']}: {entry['before']} -> {entry['after']}" for entry in keyword_moves],
+            limit,
+        )
+    else:
+        lines.append("Keyword Positions: unchanged")
+    return "\n".join(lines)
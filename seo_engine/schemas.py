@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
 @dataclass
@@ -12,6 +12,16 @@ class SiteFacts:
 
     domain: str | None = None
     notes: List[str] = field(default_factory=list)
+    duplicate_urls_dropped: int = 0
+    domains: List[str] = field(default_factory=list)
+    url_count: int = 0
+    urls_per_host: Dict[str, int] = field(default_factory=dict)
+    urls_per_section: Dict[str, int] = field(default_factory=dict)
+    depth_histogram: Dict[str, int] = field(default_factory=dict)
+    distinct_slugs_estimate: int = 0
+    distinct_path_segments_estimate: int = 0
+    top_path_prefixes: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a JSON-serializable dict."""
@@ -24,6 +34,9 @@ class Locations:
     """Extracted location data."""
 
     locations: List[Dict[str, Any]] = field(default_factory=list)
+    merges: List[Dict[str, Any]] = field(default_factory=list)
+    fetched: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a JSON-serializable dict."""
@@ -66,3 +79,107 @@ class AhrefsSummary:
         """Return a JSON-serializable dict."""
 
         return asdict(self)
+
+
+@dataclass
+class KeywordScores:
+    """Keyword volume, count and best position per core page and dish."""
+
+    page_scores: List[Dict[str, Any]] = field(default_factory=list)
+    dish_scores: List[Dict[str, Any]] = field(default_factory=list)
+    unmatched: Dict[str, Any] = field(default_factory=dict)
+    rows: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict."""
+
+        return asdict(self)
+
+
+@dataclass
+class KeywordPositions:
+    """Each keyword's best-ranking row, sorted by keyword (opt-in)."""
+
+    keywords: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict."""
+
+        return asdict(self)
+
+
+@dataclass
+class ExtractedPages:
+    """Per-document results of one HTML extractor, e.g. titles and meta tags."""
+
+    pages: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict."""
+
+        return asdict(self)
+
+
+# Artifact of the built-in ``page_meta`` extractor.
+PageMeta = ExtractedPages
+
+
+# Record lists inside each artifact, by JSON path. Streaming and indexed
+# sinks store these one record at a time; everything else is metadata.
+RECORD_PATHS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "core_pages.json": (("excluded",), ("urls",)),
+    "locations.json": (("fetched",), ("locations",), ("merges",), ("skipped",)),
+    "dish_taxonomy.json": (
+        ("dishes", "audit", "mapped"),
+        ("dishes", "audit", "top_unknown_tokens"),
+        ("dishes", "audit", "unmapped"),
+        ("dishes", "categories"),
+    ),
+    "ahrefs_summary.json": (("overview", "top_keywords"),),
+    "site_facts.json": (),
+    "page_meta.json": (("pages",),),
+    "keyword_scores.json": (("dish_scores",), ("page_scores",)),
+    "keyword_positions.json": (("keywords",),),
+}
+
+
+def split_record_sections(
+    name: str,
+    payload: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[Tuple[Tuple[str, ...], List[Any]]]]:
+    """Split an artifact payload into its metadata skeleton and record lists.
+
+    Only the dicts along each record path are copied; the record lists (or
+    lazy record sources such as ``SortedRuns``) are returned as they are and
+    ``payload`` is left unchanged. Paths missing from ``payload`` are left
+    out of the returned sections.
+    """
+
+    skeleton = dict(payload)
+    copies = {id(skeleton)}
+    sections: List[Tuple[Tuple[str, ...], List[Any]]] = []
+    for path in RECORD_PATHS.get(name, ()):
+        node: Any = skeleton
+        for key in path[:-1]:
+            child = node.get(key) if isinstance(node, dict) else None
+            if isinstance(child, dict) and id(child) not in copies:
+                child = node[key] = dict(child)
+                copies.add(id(child))
+            node = child
+        if isinstance(node, dict) and path[-1] in node:
+            sections.append((path, node.pop(path[-1])))
+    return skeleton, sections
+
+
+def merge_record_sections(
+    skeleton: Dict[str, Any],
+    sections: List[Tuple[Tuple[str, ...], List[Any]]],
+) -> Dict[str, Any]:
+    """Inverse of ``split_record_sections``."""
+
+    for path, records in sections:
+        node = skeleton
+        for key in path[:-1]:
+            node = node[key]
+        node[path[-1]] = records
+    return skeleton
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 CORE_KEYWORDS = {
     "/menu": "Menu",
@@ -12,15 +12,25 @@ CORE_KEYWORDS = {
 }
 
 
-def rank_core_pages(urls: List[str]) -> List[Dict[str, str]]:
-    """Rank core pages based on known path keywords."""
+def iter_ranked_core_pages(urls: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Yield ``rank_core_pages`` records one URL at a time."""
 
-    ranked: List[Dict[str, str]] = []
     for url in urls:
         label = "Other"
         for path, name in CORE_KEYWORDS.items():
             if path in url:
                 label = name
                 break
-        ranked.append({"url": url, "label": label})
-    return ranked
+        yield {"url": url, "label": label}
+
+
+def rank_core_pages(urls: List[str]) -> List[Dict[str, str]]:
+    """Rank core pages based on known path keywords."""
+
+    return list(iter_ranked_core_pages(urls))
+
+
+def location_page_urls(core_pages: Iterable[Dict[str, Any]]) -> List[str]:
+    """Return the URLs of core pages labelled as location pages."""
+
+    return [page["url"] for page in core_pages if page.get("label") == CORE_KEYWORDS["/locations"]]
@@ -0,0 +1,85 @@
+"""Vectorized item-URL slug extraction and dish mapping (requires pandas).
+
+Mirrors ``item_slug`` and ``map_dish_slug`` over a column of URLs: slugs are
+extracted with pandas string operations, normalized in bulk, mapped once per
+distinct normalized slug and joined back to the URLs through their factorized
+codes. URLs the vectorized patterns do not cover exactly (non-http schemes,
+whitespace, bracketed hosts) fall back to ``item_slug``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from seo_engine.select.dishes import (
+    _KNOWN_TOKENS,
+    _TRAILING_SUFFIX_RE,
+    DishMappingAudit,
+    _map_normalized_slug,
+    _tokenize_slug,
+    item_slug,
+)
+
+_SEGMENT = r"[^/?#;\x00-\x20\x7f]+"
+# Plain absolute http(s) item URLs, capturing the last non-empty path
+# segment after the first ``items`` segment. ``urlparse`` splits these
+# exactly like the pattern does; anything else (params, whitespace,
+# bracketed hosts, other schemes, no slug) is left to ``item_slug``.
+_ITEM_URL_RE = (
+    r"^(?i:https?)://[A-Za-z0-9.\-:@_~%!$&'()*+,=]*/+"
+    rf"(?:{_SEGMENT}/+)*?items/+(?:{_SEGMENT}/+)*({_SEGMENT})/*"
+    r"(?:[?#][^\x00-\x20\x7f]*)?$"
+)
+
+
+def item_slugs(item_urls: Sequence[str]) -> pd.Series:
+    """Return ``item_slug`` for each URL as an object series (``None`` if absent)."""
+
+    urls = pd.Series(item_urls, dtype=object)
+    slugs = urls.str.extract(_ITEM_URL_RE, expand=False).astype(object)
+    slow = slugs.isna()
+    if slow.any():
+        slugs[slow] = [item_slug(url) for url in urls[slow]]
+    return slugs.where(slugs.notna(), None)
+
+
+def map_item_urls(item_urls: Sequence[str], audit: DishMappingAudit) -> Dict[str, int]:
+    """Return category counts for ``item_urls``, filling ``audit`` in URL order."""
+
+    slugs = item_slugs(item_urls).dropna()
+    if slugs.empty:
+        return {}
+    slug_codes, distinct_slugs = pd.factorize(slugs)
+    normalized = (
+        pd.Series(distinct_slugs, dtype=object)
+        .str.strip()
+        .str.lower()
+        .str.replace(_TRAILING_SUFFIX_RE, "", regex=True)
+    )
+    norm_codes, distinct_normalized = pd.factorize(normalized)
+    codes = norm_codes[slug_codes]
+    categories = [_map_normalized_slug(slug) for slug in distinct_normalized]
+    mapped = np.array([category is not None for category in categories], dtype=bool)
+    occurrences = np.bincount(codes, minlength=len(categories))
+
+    per_url = pd.Categorical.from_codes(codes, categories=distinct_normalized)
+    url_mapped = mapped[codes]
+    audit.mapped.extend(per_url[url_mapped].tolist())
+    audit.unmapped.extend(per_url[~url_mapped].tolist())
+
+    counts: Dict[str, int] = defaultdict(int)
+    for index, category in enumerate(categories):
+        count = int(occurrences[index])
+        if category is not None:
+            counts[category] += count
+            continue
+        unknown: List[str] = [
+            token for token in _tokenize_slug(distinct_normalized[index]) if token not in _KNOWN_TOKENS
+        ]
+        for token in unknown:
+            audit.unknown_token_counts[token] += count
+    return dict(counts)
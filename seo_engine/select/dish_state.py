@@ -0,0 +1,178 @@
+"""Incremental dish taxonomy keyed by lexicon fingerprint and item URL.
+
+A URL's mapping depends only on the URL itself and the lexicon, so state
+persisted under the same lexicon fingerprint is reused URL by URL.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from seo_engine.select.dish_lexicon import BEV, CATEGORY_MAP, INGREDIENTS, MARKETING, PREP
+from seo_engine.select.dishes import (
+    _TRAILING_SUFFIX_RE,
+    DishMappingAudit,
+    build_dish_taxonomy,
+    item_slug,
+    map_dish_slug,
+    record_token_stats,
+    taxonomy_payload,
+)
+from seo_engine.utils.json_stable import json_dump_stable_atomic, json_load
+
+if TYPE_CHECKING:
+    from seo_engine.store.token_stats import TokenStatsStore
+
+STATE_VERSION = 2
+
+# Per-URL record layout: [normalized_slug, category, unknown_tokens]
+_SLUG, _CATEGORY, _UNKNOWN = range(3)
+
+
+def lexicon_fingerprint() -> str:
+    """Return a digest of everything that influences slug mapping."""
+
+    payload = json.dumps(
+        {
+            "category_map": {key: list(value) for key, value in sorted(CATEGORY_MAP.items())},
+            "non_category": [list(MARKETING), list(PREP), list(INGREDIENTS), list(BEV)],
+            "suffix_re": _TRAILING_SUFFIX_RE.pattern,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _map_url(url: str) -> List[Any]:
+    slug = item_slug(url)
+    if slug is None:
+        return [None, None, []]
+    scratch = DishMappingAudit()
+    category = map_dish_slug(slug, audit=scratch)
+    normalized = (scratch.mapped or scratch.unmapped)[0]
+    unknown = sorted(Counter(scratch.unknown_token_counts).elements())
+    return [normalized, category, unknown]
+
+
+def _apply(
+    record: List[Any],
+    times: int,
+    counts: Dict[str, int],
+    unknown_counts: Dict[str, int],
+) -> None:
+    if record[_SLUG] is None or times == 0:
+        return
+    if record[_CATEGORY]:
+        _bump(counts, record[_CATEGORY], times)
+        return
+    for token in record[_UNKNOWN]:
+        _bump(unknown_counts, token, times)
+
+
+def _bump(counts: Dict[str, int], key: str, delta: int) -> None:
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "version": STATE_VERSION,
+        "lexicon": lexicon_fingerprint(),
+        "items": {},
+        "occurrences": {},
+        "counts": {},
+        "unknown_token_counts": {},
+    }
+
+
+def load_dish_state(path: str) -> Dict[str, Any]:
+    """Load persisted taxonomy state, or an empty one if missing or stale."""
+
+    if not os.path.exists(path):
+        return _empty_state()
+    state = json_load(path)
+    if state.get("version") != STATE_VERSION or state.get("lexicon") != lexicon_fingerprint():
+        return _empty_state()
+    return state
+
+
+def build_dish_taxonomy_incremental(
+    item_urls: Sequence[str],
+    state_path: str,
+    *,
+    min_count: int = 5,
+    top_n: int = 15,
+    verify: bool = False,
+    token_store: Optional[TokenStatsStore] = None,
+    site: str = "",
+    run_id: str = "",
+) -> Dict[str, object]:
+    """Build the dish taxonomy, mapping only URLs added since the last run.
+
+    A URL already in the persisted state reuses its stored mapping; category
+    and unknown-token counts are adjusted by deltas for added and removed
+    URLs, and removed URLs are dropped from the state. State is rebuilt from
+    scratch when the lexicon changes. With ``verify`` the result is compared
+    with ``build_dish_taxonomy`` and a mismatch raises ``RuntimeError``.
+    """
+
+    state = load_dish_state(state_path)
+    old_items: Dict[str, List[Any]] = state["items"]
+    old_occurrences: Dict[str, int] = state["occurrences"]
+    counts: Dict[str, int] = state["counts"]
+    unknown_counts: Dict[str, int] = state["unknown_token_counts"]
+
+    occurrences = Counter(item_urls)
+    items: Dict[str, List[Any]] = {}
+    audit = DishMappingAudit()
+    added = 0
+    for url in item_urls:
+        record = items.get(url)
+        if record is None:
+            record = old_items.get(url)
+            if record is not None:
+                _apply(record, occurrences[url] - old_occurrences.get(url, 1), counts, unknown_counts)
+            else:
+                record = _map_url(url)
+                added += 1
+                _apply(record, occurrences[url], counts, unknown_counts)
+            items[url] = record
+        if record[_SLUG] is None:
+            continue
+        if record[_CATEGORY]:
+            audit.record_mapped(record[_SLUG])
+        else:
+            audit.unmapped.append(record[_SLUG])
+
+    removed = 0
+    for url, previous in old_items.items():
+        if url not in items:
+            removed += 1
+            _apply(previous, -old_occurrences.get(url, 1), counts, unknown_counts)
+
+    audit.unknown_token_counts.update(unknown_counts)
+    record_token_stats(audit, token_store, site, run_id)
+    taxonomy = taxonomy_payload(counts, audit, min_count=min_count, top_n=top_n)
+
+    if verify:
+        expected = build_dish_taxonomy(
+            list(item_urls),
+            min_count=min_count,
+            top_n=top_n,
+        )
+        if expected != taxonomy:
+            raise RuntimeError("Incremental dish taxonomy diverged from a full rebuild")
+
+    state["items"] = items
+    state["occurrences"] = {url: times for url, times in occurrences.items() if times != 1}
+    state["last_delta"] = {"added": added, "removed": removed}
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    json_dump_stable_atomic(state, state_path)
+    return taxonomy
@@ -4,12 +4,20 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass, field
+from importlib.util import find_spec
 import re
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 from seo_engine.select.dish_lexicon import BEV, CATEGORY_MAP, INGREDIENTS, MARKETING, PREP
 
+if TYPE_CHECKING:
+    from seo_engine.store.token_stats import TokenStatsStore
+
+# ``build_dish_taxonomy`` switches to the pandas batch path (see
+# ``dish_batch``) at this many item URLs when pandas is installed.
+BATCH_MIN_URLS = 50_000
+
 _TRAILING_SUFFIX_RE = re.compile(
     r"-(?:[0-9]{6,}|[0-9a-f]{6,}|(?=[a-z0-9]*[0-9])[a-z0-9]{8,})$",
     re.IGNORECASE,
@@ -75,7 +83,10 @@ _KNOWN_TOKENS = _NON_CATEGORY_TOKENS | _CATEGORY_TOKENS
 def map_dish_slug(slug: str, audit: Optional[DishMappingAudit] = None) -> Optional[str]:
     """Map a dish slug to a taxonomy label."""
 
-    normalized = normalize_dish_slug(slug)
+    return _map_normalized_slug(normalize_dish_slug(slug), audit)
+
+
+def _map_normalized_slug(normalized: str, audit: Optional[DishMappingAudit] = None) -> Optional[str]:
     tokens = _tokenize_slug(normalized)
     if tokens and all(token in _NON_CATEGORY_TOKENS for token in tokens):
         if audit is not None:
@@ -92,31 +103,29 @@ def map_dish_slug(slug: str, audit: Optional[DishMappingAudit] = None) -> Option
     return None
 
 
-def build_dish_taxonomy(
-    item_urls: List[str],
-    *,
-    min_count: int = 5,
-    top_n: int = 15,
-) -> Dict[str, object]:
-    """Build dish taxonomy from item URLs."""
+def item_slug(url: str) -> Optional[str]:
+    """Return the last path segment after ``/items/``, if any."""
 
-    audit = DishMappingAudit()
-    counts: Dict[str, int] = defaultdict(int)
+    path = urlparse(url).path
+    parts = [part for part in path.split("/") if part]
+    try:
+        items_index = parts.index("items")
+    except ValueError:
+        return None
+    item_parts = parts[items_index + 1 :]
+    if not item_parts:
+        return None
+    return item_parts[-1]
 
-    for url in item_urls:
-        path = urlparse(url).path
-        parts = [part for part in path.split("/") if part]
-        try:
-            items_index = parts.index("items")
-        except ValueError:
-            continue
-        item_parts = parts[items_index + 1 :]
-        if not item_parts:
-            continue
-        slug = item_parts[-1]
-        category = map_dish_slug(slug, audit=audit)
-        if category:
-            counts[category] += 1
+
+def taxonomy_payload(
+    counts: Dict[str, int],
+    audit: DishMappingAudit,
+    *,
+    min_count: int,
+    top_n: int,
+) -> Dict[str, object]:
+    """Assemble the dish taxonomy artifact from category counts and audit."""
 
     sorted_categories = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
     strict_categories = [
@@ -136,3 +145,56 @@ def build_dish_taxonomy(
         },
         "categories": strict_categories,
     }
+
+
+def record_token_stats(
+    audit: DishMappingAudit,
+    token_store: Optional[TokenStatsStore],
+    site: str,
+    run_id: str,
+) -> None:
+    """Persist a run's unknown token counts when a store is configured."""
+
+    if token_store is not None:
+        token_store.record_run(site, run_id, audit.unknown_token_counts)
+
+
+def build_dish_taxonomy(
+    item_urls: List[str],
+    *,
+    min_count: int = 5,
+    top_n: int = 15,
+    token_store: Optional[TokenStatsStore] = None,
+    site: str = "",
+    run_id: str = "",
+    batch: Optional[bool] = None,
+) -> Dict[str, object]:
+    """Build dish taxonomy from item URLs.
+
+    With ``token_store`` the run's unknown token counts are also upserted
+    under ``site``/``run_id`` for cross-run lexicon tuning. ``batch`` forces
+    the vectorized path on or off; by default it is used for at least
+    ``BATCH_MIN_URLS`` URLs when pandas is available. Both paths produce
+    identical payloads.
+    """
+
+    audit = DishMappingAudit()
+    counts: Dict[str, int] = defaultdict(int)
+    if batch is None:
+        batch = len(item_urls) >= BATCH_MIN_URLS and find_spec("pandas") is not None
+
+    if batch:
+        from seo_engine.select.dish_batch import map_item_urls
+
+        counts.update(map_item_urls(item_urls, audit))
+    else:
+        for url in item_urls:
+            slug = item_slug(url)
+            if slug is None:
+                continue
+            category = map_dish_slug(slug, audit=audit)
+            if category:
+                counts[category] += 1
+
+    record_token_stats(audit, token_store, site, run_id)
+    return taxonomy_payload(counts, audit, min_count=min_count, top_n=top_n)
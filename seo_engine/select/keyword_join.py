@@ -0,0 +1,148 @@
+"""Hash-join of Ahrefs keyword rows onto core pages and dish categories."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from seo_engine.ingest.canonical import canonicalize_url, url_fingerprint
+from seo_engine.select.dishes import item_slug, map_dish_slug
+from seo_engine.utils.external_sort import SortedRuns, external_sort
+
+# Keyword exports repeat the same ranking URL for many keywords, so URL
+# canonicalization is memoized up to this many distinct URLs.
+URL_CACHE_SIZE = 65536
+# Keyword rows per sorted run when per-keyword positions are spilled.
+POSITIONS_RUN_SIZE = 100_000
+_POSITION_FIELDS = ("keyword", "position", "url", "volume")
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _fingerprint(url: str) -> Optional[int]:
+    try:
+        return url_fingerprint(canonicalize_url(url))
+    except ValueError:
+        return None
+
+
+def _new_score() -> Dict[str, Any]:
+    return {"volume": 0, "keywords": 0, "best_position": None}
+
+
+def _position_order(row: Dict[str, Any]) -> Tuple[str, bool, int]:
+    # Per keyword, ranked rows first by position; unranked rows last.
+    return (row["keyword"], not row["position"], row["position"] or 0)
+
+
+class BestKeywordRows:
+    """Re-iterable view of each keyword's best-ranking row over sorted runs."""
+
+    def __init__(self, runs: SortedRuns) -> None:
+        self.runs = runs
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        previous = None
+        for row in self.runs:
+            if row["keyword"] != previous:
+                previous = row["keyword"]
+                yield row
+
+
+def _add(score: Dict[str, Any], row: Dict[str, Any]) -> None:
+    score["keywords"] += 1
+    score["volume"] += row["volume"] or 0
+    position = row["position"]
+    if position and (score["best_position"] is None or position < score["best_position"]):
+        score["best_position"] = position
+
+
+class KeywordIndex:
+    """Map URL fingerprints to the page or dish category they score."""
+
+    def __init__(self, core_pages: Iterable[Dict[str, Any]], item_urls: Iterable[str]) -> None:
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.categories: Dict[str, Dict[str, Any]] = {}
+        self._targets: Dict[int, Dict[str, Any]] = {}
+        for page in core_pages:
+            score = self.pages.setdefault(page["url"], _new_score())
+            self._targets[url_fingerprint(page["url"])] = score
+        for url in item_urls:
+            slug = item_slug(url)
+            category = map_dish_slug(slug) if slug else None
+            if category is None:
+                continue
+            score = self.categories.setdefault(category, _new_score())
+            self._targets.setdefault(url_fingerprint(url), score)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the score bucket for a keyword's ranking URL, if indexed."""
+
+        if not url:
+            return None
+        fingerprint = _fingerprint(url)
+        return None if fingerprint is None else self._targets.get(fingerprint)
+
+
+def join_keywords(
+    rows: Iterable[Dict[str, Any]],
+    core_pages: List[Dict[str, Any]],
+    item_urls: List[str],
+    positions_spill_dir: Optional[str] = None,
+    positions_run_size: int = POSITIONS_RUN_SIZE,
+) -> Dict[str, Any]:
+    """Aggregate keyword volume, count and best position per page and dish.
+
+    ``rows`` is streamed once (see ``iter_keyword_rows``); each row costs one
+    hash lookup, so the join is linear in the size of the export. With
+    ``positions_spill_dir``, rows are also externally sorted there and
+    ``"keywords"`` streams each keyword's best-ranking row (``BestKeywordRows``)
+    without holding them in memory.
+    """
+
+    index = KeywordIndex(core_pages, item_urls)
+    unmatched = _new_score()
+    rows_read = 0
+
+    def scored() -> Iterator[Dict[str, Any]]:
+        nonlocal rows_read
+        for row in rows:
+            rows_read += 1
+            target = index.lookup(row["url"])
+            _add(unmatched if target is None else target, row)
+            yield row
+
+    positions = None
+    if positions_spill_dir is None:
+        for _ in scored():
+            pass
+    else:
+        positions = BestKeywordRows(
+            external_sort(
+                ({key: row[key] for key in _POSITION_FIELDS} for row in scored()),
+                key=_position_order,
+                spill_dir=positions_spill_dir,
+                run_size=positions_run_size,
+            )
+        )
+    result: Dict[str, Any] = {
+        "rows": rows_read,
+        "page_scores": [
+            {"url": url, **score}
+            for url, score in sorted(index.pages.items(), key=_rank)
+            if score["keywords"]
+        ],
+        "dish_scores": [
+            {"category": category, **score}
+            for category, score in sorted(index.categories.items(), key=_rank)
+            if score["keywords"]
+        ],
+        "unmatched": unmatched,
+    }
+    if positions is not None:
+        result["keywords"] = positions
+    return result
+
+
+def _rank(entry: Tuple[str, Dict[str, Any]]) -> Tuple[int, int, str]:
+    key, score = entry
+    return (-score["volume"], -score["keywords"], key)
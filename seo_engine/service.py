@@ -0,0 +1,478 @@
+"""Local HTTP service running pipeline jobs on a pre-warmed worker pool.
+
+Endpoints:
+
+- ``POST /jobs``: submit a job (JSON, see ``JOB_INPUTS``); ``202`` with the
+  job id, or ``503`` with ``Retry-After`` when the queue is full.
+- ``GET /jobs/<id>``: job status.
+- ``GET /jobs/<id>/artifacts`` and ``/jobs/<id>/artifacts/<name>``: list or
+  download artifacts of a finished job.
+- ``GET /metrics``: queue depth, job counts and latency percentiles.
+
+Each input is ``{"path": "..."}`` or ``{"content_b64": "..."}``; uploads are
+stored under the job directory so workers only receive paths. Paths are
+resolved inside ``<work_dir>/inputs``, and the ``dish_state_path`` and
+``token_stats_path`` options inside ``<work_dir>/state``; anything outside
+is rejected. Job directories are removed once their job is no longer
+retained.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from seo_engine.utils.guard import worker_context
+
+# Request fields naming input documents: field -> is a list of documents.
+JOB_INPUTS = {"sitemap": False, "html": True, "keywords": False, "performance": False}
+# ``run_pipeline`` keyword arguments a job may set.
+JOB_OPTIONS = {
+    "artifact_format",
+    "sqlite_artifacts",
+    "extractors",
+    "site",
+    "run_id",
+    "dish_state_path",
+    "token_stats_path",
+    "fetch_locations",
+    "keyword_positions",
+    "guard",
+}
+# Options naming files the job reads and writes; resolved under STATE_DIRNAME.
+STATE_OPTIONS = ("dish_state_path", "token_stats_path")
+INPUTS_DIRNAME = "inputs"
+STATE_DIRNAME = "state"
+JOBS_DIRNAME = "jobs"
+# Imported once by each pool worker's forkserver, so the parse workers of
+# guarded jobs start with the pipeline already loaded.
+FORKSERVER_PRELOAD = ["seo_engine.pipeline", "seo_engine.extract.registry", "bs4"]
+MAX_REQUEST_BYTES = 200 * 1024 * 1024
+MAX_RETAINED_JOBS = 1000
+LATENCY_WINDOW = 200
+
+
+def _warm_worker() -> None:
+    """Import the pipeline and exercise parsers once per worker process."""
+
+    from seo_engine.extract.registry import available_extractors, extract_document
+    from seo_engine.ingest.canonical import canonicalize_url
+    from seo_engine.ingest.sitemap import parse_sitemap_entries
+    from seo_engine.pipeline import run_pipeline  # noqa: F401
+    from seo_engine.select.dishes import build_dish_taxonomy
+
+    extract_document(b'<html><body><span class="location-name">Warm</span></body></html>', available_extractors())
+    parse_sitemap_entries(b"<urlset><url><loc>https://warm.test/items/pizza</loc></url></urlset>")
+    canonicalize_url("https://warm.test/")
+    build_dish_taxonomy(["https://warm.test/items/margherita-pizza"])
+
+    context = worker_context()
+    if context.get_start_method() == "forkserver":
+        from multiprocessing import forkserver
+
+        context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        forkserver.ensure_running()
+
+
+def _run_job(job_dir: str, inputs: Dict[str, Any], options: Dict[str, Any]) -> str:
+    from seo_engine.pipeline import run_pipeline
+    from seo_engine.utils.guard import ResourceLimits
+
+    options = dict(options)
+    # Guarded jobs parse in killable workers; the rest run in this warm process.
+    limits = ResourceLimits() if options.pop("guard", False) else None
+
+    def read(path: Optional[str]) -> Optional[bytes]:
+        if not path:
+            return None
+        with open(path, "rb") as handle:
+            return handle.read()
+
+    return run_pipeline(
+        read(inputs.get("sitemap")) or b"",
+        [read(path) or b"" for path in inputs.get("html", [])],
+        job_dir,
+        keyword_csv=read(inputs.get("keywords")),
+        performance_csv=read(inputs.get("performance")),
+        limits=limits,
+        **options,
+    )
+
+
+def _contained(root: str, path: str) -> Optional[str]:
+    """Return ``path`` resolved under ``root``, or ``None`` if it escapes."""
+
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 6)
+
+
+@dataclass
+class Job:
+    """One submitted pipeline job."""
+
+    job_id: str
+    job_dir: str
+    inputs: Dict[str, Any]
+    options: Dict[str, Any]
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    artifacts_dir: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class IntakeService:
+    """Bounded job queue in front of a warm process pool.
+
+    If a pool worker dies, the jobs it was running fail and the pool is
+    replaced, so later jobs keep running.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        workers: int = 2,
+        queue_size: int = 8,
+        retain_jobs: int = MAX_RETAINED_JOBS,
+    ) -> None:
+        self.work_dir = work_dir
+        self.workers = workers
+        self.retain_jobs = retain_jobs
+        self.inputs_dir = os.path.join(work_dir, INPUTS_DIRNAME)
+        self.state_dir = os.path.join(work_dir, STATE_DIRNAME)
+        self.jobs_dir = os.path.join(work_dir, JOBS_DIRNAME)
+        # Jobs of an earlier service process can no longer be queried.
+        shutil.rmtree(self.jobs_dir, ignore_errors=True)
+        for directory in (self.inputs_dir, self.state_dir, self.jobs_dir):
+            os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=queue_size)
+        self._reserved = 0
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0}
+        self._running = 0
+        self._waits: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._runs: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._pool = self._new_pool()
+        # Start every worker now so the warm-up is paid before the first job.
+        for future in [self._pool.submit(time.sleep, 0) for _ in range(workers)]:
+            future.result()
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch, name=f"seo-intake-dispatch-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._dispatchers:
+            thread.start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=worker_context(), initializer=_warm_worker)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Swap a broken pool for a fresh one (once) and return the live pool."""
+
+        with self._lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+            return self._pool
+
+    def _run_in_pool(self, job: Job) -> str:
+        pool = self._pool
+        try:
+            future = pool.submit(_run_job, job.job_dir, job.inputs, job.options)
+        except BrokenProcessPool:
+            # A worker died during an earlier job; this one has not run yet.
+            pool = self._replace_pool(pool)
+            future = pool.submit(_run_job, job.job_dir, job.inputs, job.options)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # The worker died under this job (OOM, crash or kill): fail the
+            # job and give later jobs a working pool.
+            self._replace_pool(pool)
+            raise
+
+    def _store_inputs(self, job_dir: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        inputs_dir = os.path.join(job_dir, "inputs")
+        stored: Dict[str, Any] = {}
+        for name, many in JOB_INPUTS.items():
+            value = payload.get(name)
+            if value is None:
+                continue
+            documents = value if many else [value]
+            if not isinstance(documents, list):
+                raise ValueError(f"{name!r} must be a list")
+            paths = []
+            for index, document in enumerate(documents):
+                if not isinstance(document, dict):
+                    raise ValueError(f"{name!r} entries must be objects")
+                if "path" in document:
+                    resolved = _contained(self.inputs_dir, str(document["path"]))
+                    if resolved is None:
+                        raise ValueError(f"{name!r} path must be inside {INPUTS_DIRNAME}/")
+                    if not os.path.isfile(resolved):
+                        raise ValueError(f"{name!r} path not found: {document['path']}")
+                    path = resolved
+                else:
+                    try:
+                        content = base64.b64decode(document.get("content_b64", ""), validate=True)
+                    except (binascii.Error, ValueError) as exc:
+                        raise ValueError(f"{name!r} content_b64 is not valid base64") from exc
+                    os.makedirs(inputs_dir, exist_ok=True)
+                    path = os.path.join(inputs_dir, f"{name}-{index}")
+                    with open(path, "wb") as handle:
+                        handle.write(content)
+                paths.append(path)
+            stored[name] = paths if many else paths[0]
+        if "sitemap" not in stored:
+            raise ValueError("'sitemap' is required")
+        return stored
+
+    def _resolve_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = set(options) - JOB_OPTIONS
+        if unknown:
+            raise ValueError(f"Unsupported options: {sorted(unknown)}")
+        resolved = dict(options)
+        for name in STATE_OPTIONS:
+            if resolved.get(name):
+                path = _contained(self.state_dir, str(resolved[name]))
+                if path is None:
+                    raise ValueError(f"{name!r} must be inside {STATE_DIRNAME}/")
+                resolved[name] = path
+        return resolved
+
+    def submit(self, payload: Dict[str, Any]) -> Tuple[Optional[Job], Optional[str]]:
+        """Queue a job; return ``(job, None)`` or ``(None, "queue_full")``.
+
+        A queue slot is reserved before uploads are written, so rejected
+        jobs never touch the disk. Raises ``ValueError`` for invalid requests.
+        """
+
+        options = self._resolve_options(payload.get("options") or {})
+        with self._lock:
+            if self._queue.qsize() + self._reserved >= self._queue.maxsize:
+                self._counts["rejected"] += 1
+                return None, "queue_full"
+            self._reserved += 1
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        try:
+            job = Job(job_id, job_dir, self._store_inputs(job_dir, payload), options)
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._reserved -= 1
+            # Dispatchers only take from the queue, so the reserved slot is free.
+            self._queue.put_nowait(job)
+            self._jobs[job_id] = job
+            self._counts["submitted"] += 1
+            self._trim_jobs()
+        return job, None
+
+    def _trim_jobs(self) -> None:
+        while len(self._jobs) > self.retain_jobs:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ("queued", "running"):
+                break
+            del self._jobs[oldest_id]
+            shutil.rmtree(oldest.job_dir, ignore_errors=True)
+
+    def _dispatch(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                job.status = "running"
+                job.started_at = time.time()
+                self._running += 1
+                self._waits.append(job.started_at - job.submitted_at)
+            try:
+                job.artifacts_dir = self._run_in_pool(job)
+                status, error = "succeeded", None
+            except Exception as exc:  # reported through the job status
+                status, error = "failed", f"{type(exc).__name__}: {exc}"
+            with self._lock:
+                job.status = status
+                job.error = error
+                job.finished_at = time.time()
+                self._running -= 1
+                self._counts[status] += 1
+                self._runs.append(job.finished_at - (job.started_at or job.finished_at))
+
+    def job(self, job_id: str) -> Optional[Job]:
+        """Return the job with ``job_id``, if known."""
+
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def artifact_path(self, job: Job, name: str) -> Optional[str]:
+        """Return the path of artifact ``name`` of a finished job."""
+
+        if not job.artifacts_dir or name not in os.listdir(job.artifacts_dir):
+            return None
+        path = os.path.join(job.artifacts_dir, name)
+        return path if os.path.isfile(path) else None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth, job counters and latency percentiles."""
+
+        with self._lock:
+            waits = list(self._waits)
+            runs = list(self._runs)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "running": self._running,
+                "workers": self.workers,
+                "jobs": dict(self._counts),
+                "queue_wait_seconds": {"p50": _percentile(waits, 0.5), "p95": _percentile(waits, 0.95)},
+                "run_seconds": {"p50": _percentile(runs, 0.5), "p95": _percentile(runs, 0.95)},
+            }
+
+    def close(self) -> None:
+        """Stop dispatching and shut the worker pool down."""
+
+        for _ in self._dispatchers:
+            self._queue.put(None)
+        for thread in self._dispatchers:
+            thread.join()
+        self._pool.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: IntakeService
+    retry_after = 5
+
+    def log_message(self, *args: Any) -> None:
+        return None
+
+    def _json(self, status: int, payload: Any, **headers: str) -> None:
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/jobs":
+            self._json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self._json(413, {"error": "request too large"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            job, reason = self.service.submit(payload)
+        except ValueError as exc:
+            self._json(400, {"error": str(exc)})
+            return
+        if job is None:
+            self._json(503, {"error": reason}, Retry_After=str(self.retry_after))
+            return
+        self._json(202, job.to_dict(), Location=f"/jobs/{job.job_id}")
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["metrics"]:
+            self._json(200, self.service.metrics())
+            return
+        if parts == ["healthz"]:
+            self._json(200, {"status": "ok"})
+            return
+        if len(parts) < 2 or parts[0] != "jobs":
+            self._json(404, {"error": "not found"})
+            return
+        job = self.service.job(parts[1])
+        if job is None:
+            self._json(404, {"error": "unknown job"})
+        elif len(parts) == 2:
+            self._json(200, job.to_dict())
+        elif parts[2:] == ["artifacts"]:
+            if job.status != "succeeded" or not job.artifacts_dir:
+                self._json(409, {"error": f"job is {job.status}"})
+            else:
+                names = sorted(
+                    name
+                    for name in os.listdir(job.artifacts_dir)
+                    if os.path.isfile(os.path.join(job.artifacts_dir, name))
+                )
+                self._json(200, {"artifacts": names})
+        elif len(parts) == 4 and parts[2] == "artifacts":
+            path = self.service.artifact_path(job, parts[3])
+            if path is None:
+                self._json(404, {"error": "unknown artifact"})
+                return
+            with open(path, "rb") as handle:
+                body = handle.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._json(404, {"error": "not found"})
+
+
+def make_server(service: IntakeService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Return an HTTP server bound to ``host:port`` serving ``service``."""
+
+    handler = type("IntakeHandler", (_Handler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(work_dir: str, host: str = "127.0.0.1", port: int = 8765, workers: int = 2, queue_size: int = 8) -> None:
+    """Run the service until interrupted."""
+
+    service = IntakeService(work_dir, workers=workers, queue_size=queue_size)
+    server = make_server(service, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
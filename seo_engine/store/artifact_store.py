@@ -0,0 +1,212 @@
+"""Content-addressed storage for pipeline artifacts across runs."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from seo_engine.utils.json_stable import json_dump_stable_atomic, json_dumps_stable, json_load
+from seo_engine.utils.locks import file_lock
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_artifact_files(artifacts_dir: str) -> List[str]:
+    relative_paths: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(artifacts_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            full_path = os.path.join(dirpath, filename)
+            relative_paths.append(os.path.relpath(full_path, artifacts_dir).replace(os.sep, "/"))
+    return relative_paths
+
+
+class ArtifactStore:
+    """Store run artifacts as hash-keyed blobs referenced by run manifests.
+
+    Layout under ``root``::
+
+        blobs/<ab>/<sha256>      immutable artifact contents
+        manifests/<run_id>.json  artifact name -> digest for one run
+        index.json               site -> [[run_date, run_id], ...] sorted
+        index.lock               held by publish_run, remove_run and gc
+
+    Unchanged artifacts are stored once no matter how many runs reference
+    them, so publishing a run mostly costs hashing its files.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.blobs_dir = os.path.join(root, "blobs")
+        self.manifests_dir = os.path.join(root, "manifests")
+        self.index_path = os.path.join(root, "index.json")
+        self.lock_path = os.path.join(root, "index.lock")
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    def blob_path(self, digest: str) -> str:
+        """Return the on-disk path of a blob."""
+
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def put_file(self, path: str) -> str:
+        """Add a file's contents as a blob and return its digest."""
+
+        digest = _file_digest(path)
+        target = self.blob_path(digest)
+        if os.path.exists(target):
+            return digest
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(target))
+        os.close(fd)
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def _load_index(self) -> Dict[str, List[List[str]]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        return json_load(self.index_path).get("sites", {})
+
+    def _manifest_path(self, run_id: str) -> str:
+        return os.path.join(self.manifests_dir, f"{run_id}.json")
+
+    def publish_run(
+        self,
+        artifacts_dir: str,
+        site: str,
+        run_date: str,
+        run_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Publish an artifacts directory and return its manifest.
+
+        ``run_date`` should sort lexically (ISO 8601). When ``run_id`` is not
+        given it is derived from the site, date and artifact digests, so
+        republishing identical output is a no-op.
+        """
+
+        # Blobs are unreferenced until the manifest lands, so ``gc`` must not
+        # run in between: hold the lock from the first blob to the index.
+        with file_lock(self.lock_path):
+            artifacts: Dict[str, Dict[str, Any]] = {}
+            for relative_path in _iter_artifact_files(artifacts_dir):
+                full_path = os.path.join(artifacts_dir, relative_path)
+                artifacts[relative_path] = {
+                    "sha256": self.put_file(full_path),
+                    "size": os.path.getsize(full_path),
+                }
+            if run_id is None:
+                fingerprint = hashlib.sha256(json_dumps_stable(artifacts).encode("utf-8")).hexdigest()
+                run_id = f"{site}-{run_date}-{fingerprint[:12]}"
+            manifest = {
+                "run_id": run_id,
+                "site": site,
+                "run_date": run_date,
+                "artifacts": artifacts,
+            }
+            json_dump_stable_atomic(manifest, self._manifest_path(run_id))
+
+            index = self._load_index()
+            entries = index.setdefault(site, [])
+            entry = [run_date, run_id]
+            position = bisect_left(entries, entry)
+            if position == len(entries) or entries[position] != entry:
+                entries.insert(position, entry)
+            json_dump_stable_atomic({"sites": index}, self.index_path)
+        return manifest
+
+    def load_manifest(self, run_id: str) -> Dict[str, Any]:
+        """Return the manifest of a published run."""
+
+        return json_load(self._manifest_path(run_id))
+
+    def find_runs(
+        self,
+        site: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """Return runs for a site with ``start <= run_date <= end``, oldest first."""
+
+        entries = self._load_index().get(site, [])
+        low = 0 if start is None else bisect_left(entries, [start])
+        high = len(entries) if end is None else bisect_right(entries, [end, "\uffff"])
+        return [{"run_date": run_date, "run_id": run_id} for run_date, run_id in entries[low:high]]
+
+    def latest_run(self, site: str) -> Optional[Dict[str, str]]:
+        """Return the most recent run for a site, if any."""
+
+        runs = self.find_runs(site)
+        return runs[-1] if runs else None
+
+    def checkout(self, run_id: str, dest_dir: str) -> str:
+        """Materialize a run's artifacts into ``dest_dir`` via hardlinks."""
+
+        manifest = self.load_manifest(run_id)
+        for relative_path, entry in sorted(manifest["artifacts"].items()):
+            target = os.path.join(dest_dir, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.lexists(target):
+                os.remove(target)
+            source = self.blob_path(entry["sha256"])
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+        return dest_dir
+
+    def remove_run(self, run_id: str) -> None:
+        """Drop a run's manifest and index entry; blobs are left for ``gc``."""
+
+        manifest = self.load_manifest(run_id)
+        with file_lock(self.lock_path):
+            index = self._load_index()
+            entries = index.get(manifest["site"], [])
+            index[manifest["site"]] = [entry for entry in entries if entry[1] != run_id]
+            if not index[manifest["site"]]:
+                del index[manifest["site"]]
+            json_dump_stable_atomic({"sites": index}, self.index_path)
+        os.remove(self._manifest_path(run_id))
+
+    def gc(self) -> int:
+        """Delete blobs no manifest references and return how many were removed.
+
+        Runs under the index lock, so blobs of a run still being published
+        are never collected.
+        """
+
+        with file_lock(self.lock_path):
+            referenced = set()
+            for filename in os.listdir(self.manifests_dir):
+                if not filename.endswith(".json"):
+                    continue
+                manifest = json_load(os.path.join(self.manifests_dir, filename))
+                for entry in manifest.get("artifacts", {}).values():
+                    referenced.add(entry["sha256"])
+            removed = 0
+            for prefix in sorted(os.listdir(self.blobs_dir)):
+                prefix_dir = os.path.join(self.blobs_dir, prefix)
+                for digest in sorted(os.listdir(prefix_dir)):
+                    if digest in referenced or digest.startswith(".tmp-"):
+                        continue
+                    os.remove(os.path.join(prefix_dir, digest))
+                    removed += 1
+        return removed
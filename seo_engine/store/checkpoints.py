@@ -0,0 +1,94 @@
+"""Atomic stage and batch checkpoints for resuming interrupted runs."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Callable, Iterable, Optional
+
+
+def input_fingerprint(parts: Iterable[Optional[bytes]], options: Any = None) -> str:
+    """Return a digest identifying a run's inputs and output-affecting options."""
+
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            digest.update(b"-")
+            continue
+        digest.update(f"{len(part)}:".encode("ascii"))
+        digest.update(part)
+    digest.update(repr(options).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """Pickled values keyed by name under ``root/<fingerprint>``.
+
+    Each value is written to a temporary file and renamed into place, so a
+    run killed mid-write leaves either no checkpoint or a complete one.
+    Checkpoints are only read back for the same input fingerprint; the
+    directory is local scratch space and must not hold untrusted files.
+    """
+
+    def __init__(self, root: str, fingerprint: str) -> None:
+        self.root = root
+        self.fingerprint = fingerprint
+        self.path = os.path.join(root, fingerprint)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.pickle")
+
+    def has(self, key: str) -> bool:
+        """Return whether ``key`` has been checkpointed."""
+
+        return os.path.exists(self._file(key))
+
+    def load(self, key: str) -> Any:
+        """Return the value checkpointed under ``key``."""
+
+        with open(self._file(key), "rb") as handle:
+            return pickle.load(handle)
+
+    def save(self, key: str, value: Any) -> None:
+        """Atomically checkpoint ``value`` under ``key``."""
+
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.path)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self._file(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """Remove every checkpoint of this fingerprint."""
+
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def checkpointed(
+    checkpoints: Optional[CheckpointStore],
+    key: str,
+    func: Callable[..., Any],
+    **inputs: Any,
+) -> Any:
+    """Return ``func(**inputs)``, reusing or saving its checkpoint under ``key``."""
+
+    if checkpoints is not None and checkpoints.has(key):
+        try:
+            return checkpoints.load(key)
+        except FileNotFoundError:
+            # Cleared by a concurrent run of the same inputs that finished.
+            pass
+    value = func(**inputs)
+    if checkpoints is not None:
+        checkpoints.save(key, value)
+    return value
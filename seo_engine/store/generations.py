@@ -0,0 +1,122 @@
+"""Staged artifact generations published by an atomic symlink swap.
+
+Layout under a run's ``out_dir``::
+
+    generations/.staging-<name>/  artifacts being written by one run
+    generations/<name>/           complete, never modified again
+    artifacts -> generations/<name>
+    .generations.lock             held while the link is swapped and pruned
+
+Each run writes into its own staging directory, renames it into place and
+then atomically replaces the ``artifacts`` link, so concurrent runs never
+touch each other's files and readers see either the previous complete set
+or the new one. Readers should resolve the link once (``os.path.realpath``)
+and read every file of one view from that directory.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import os
+import shutil
+import uuid
+from typing import List, Optional
+
+from seo_engine.utils.locks import file_lock
+
+ARTIFACTS_DIRNAME = "artifacts"
+GENERATIONS_DIRNAME = "generations"
+STAGING_PREFIX = ".staging-"
+LOCK_FILENAME = ".generations.lock"
+KEEP_GENERATIONS = 3
+
+
+def new_staging_dir(out_dir: str) -> str:
+    """Create and return a private staging directory for one run."""
+
+    name = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:8]}"
+    staging_dir = os.path.join(out_dir, GENERATIONS_DIRNAME, f"{STAGING_PREFIX}{name}")
+    os.makedirs(staging_dir)
+    return staging_dir
+
+
+def current_generation(out_dir: str) -> Optional[str]:
+    """Return the name of the generation ``artifacts`` points to, if any."""
+
+    link = os.path.join(out_dir, ARTIFACTS_DIRNAME)
+    if not os.path.islink(link):
+        return None
+    return os.path.basename(os.readlink(link))
+
+
+def list_generations(out_dir: str) -> List[str]:
+    """Return published generation names, oldest first."""
+
+    generations_dir = os.path.join(out_dir, GENERATIONS_DIRNAME)
+    if not os.path.isdir(generations_dir):
+        return []
+    return sorted(name for name in os.listdir(generations_dir) if not name.startswith("."))
+
+
+def _adopt_legacy_dir(out_dir: str) -> None:
+    # Output directories written before generations hold a real
+    # ``artifacts`` directory; move it aside so the link can replace it.
+    link = os.path.join(out_dir, ARTIFACTS_DIRNAME)
+    if os.path.isdir(link) and not os.path.islink(link):
+        legacy = f"00000000T000000000000Z-legacy-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(link, os.path.join(out_dir, GENERATIONS_DIRNAME, legacy))
+        except FileNotFoundError:
+            pass
+
+
+def prune_generations(out_dir: str, keep: int = KEEP_GENERATIONS, newest: Optional[str] = None) -> List[str]:
+    """Remove generations older than the current one, keeping ``keep`` in all.
+
+    Only generations older than the ``artifacts`` target (and than
+    ``newest``, a run's own generation) are candidates: newer ones may have
+    just been published by a concurrent run, and the few before the current
+    one may still be open by readers that resolved the link earlier.
+    """
+
+    current = current_generation(out_dir)
+    if current is None:
+        return []
+    bound = current if newest is None else min(current, newest)
+    older = [name for name in list_generations(out_dir) if name < bound]
+    removed = older[: max(len(older) - max(keep - 1, 0), 0)]
+    for name in removed:
+        shutil.rmtree(os.path.join(out_dir, GENERATIONS_DIRNAME, name), ignore_errors=True)
+    return removed
+
+
+def publish_generation(out_dir: str, staging_dir: str, keep: int = KEEP_GENERATIONS) -> str:
+    """Publish a complete staging directory and return its final path.
+
+    The staging directory is renamed to its generation name and the
+    ``artifacts`` link is swapped to it with ``os.replace``, unless a run
+    that started later has already published. Older generations beyond
+    ``keep`` are then pruned (see ``prune_generations``). The check, swap
+    and prune run under one lock so concurrent publishers see each other's
+    link.
+    """
+
+    name = os.path.basename(staging_dir)[len(STAGING_PREFIX) :]
+    generation_dir = os.path.join(out_dir, GENERATIONS_DIRNAME, name)
+    os.rename(staging_dir, generation_dir)
+    with file_lock(os.path.join(out_dir, LOCK_FILENAME)):
+        _adopt_legacy_dir(out_dir)
+        current = current_generation(out_dir)
+        if current is None or current < name:
+            link = os.path.join(out_dir, ARTIFACTS_DIRNAME)
+            tmp_link = os.path.join(out_dir, f".{ARTIFACTS_DIRNAME}-{name}")
+            os.symlink(os.path.join(GENERATIONS_DIRNAME, name), tmp_link)
+            os.replace(tmp_link, link)
+        prune_generations(out_dir, keep, newest=name)
+    return generation_dir
+
+
+def discard_staging_dir(staging_dir: str) -> None:
+    """Remove an unpublished staging directory."""
+
+    shutil.rmtree(staging_dir, ignore_errors=True)
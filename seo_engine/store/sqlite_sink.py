@@ -0,0 +1,183 @@
+"""Indexed SQLite sink for run artifacts."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from seo_engine.schemas import merge_record_sections, split_record_sections
+from seo_engine.utils.json_stable import json_dump_stable
+
+SQLITE_FILENAME = "artifacts.sqlite"
+
+# Table holding each record list listed in ``RECORD_PATHS``. Every other part
+# of an artifact is kept verbatim in the ``artifacts`` table.
+RECORD_TABLES: Dict[Tuple[str, ...], str] = {
+    ("excluded",): "excluded_urls",
+    ("urls",): "core_pages",
+    ("locations",): "locations",
+    ("merges",): "location_merges",
+    ("fetched",): "location_fetches",
+    ("skipped",): "location_skips",
+    ("dishes", "audit", "mapped"): "dish_mapped",
+    ("dishes", "audit", "top_unknown_tokens"): "dish_unknown_tokens",
+    ("dishes", "audit", "unmapped"): "dish_unmapped",
+    ("dishes", "categories"): "dish_categories",
+    ("overview", "top_keywords"): "ahrefs_keywords",
+    ("pages",): "page_meta",
+    ("page_scores",): "keyword_page_scores",
+    ("dish_scores",): "keyword_dish_scores",
+    ("keywords",): "keyword_positions",
+}
+
+# Indexed columns per table: column name -> record key (``None`` for scalars).
+TABLE_COLUMNS: Dict[str, Dict[str, Optional[str]]] = {
+    "core_pages": {"url": "url", "label": "label", "score": "score"},
+    "excluded_urls": {"url": "url"},
+    "locations": {"location_name": "location_name", "postal": "postal", "phone": "phone"},
+    "location_merges": {"reason": "reason"},
+    "location_fetches": {"url": "url", "status": "status"},
+    "location_skips": {"reason": "reason", "sha256": "sha256"},
+    "dish_categories": {"category": "category", "count": "count"},
+    "dish_mapped": {"slug": None},
+    "dish_unmapped": {"slug": None},
+    "dish_unknown_tokens": {"token": "token", "count": "count"},
+    "page_meta": {"source": "source", "canonical": "canonical", "title": "title"},
+    "keyword_page_scores": {"url": "url", "volume": "volume", "best_position": "best_position"},
+    "keyword_dish_scores": {"category": "category", "volume": "volume", "best_position": "best_position"},
+    "keyword_positions": {"keyword": "keyword", "url": "url", "position": "position"},
+    "ahrefs_keywords": {"keyword": "keyword", "url": "url", "volume": "volume", "position": "position"},
+}
+
+
+def _schema() -> str:
+    statements = [
+        "CREATE TABLE IF NOT EXISTS artifacts ("
+        "name TEXT PRIMARY KEY, skeleton TEXT NOT NULL, present TEXT NOT NULL)"
+    ]
+    for table, columns in TABLE_COLUMNS.items():
+        column_defs = "".join(f", {column}" for column in columns)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} (ord INTEGER PRIMARY KEY{column_defs}, record TEXT NOT NULL)"
+        )
+        for column in columns:
+            statements.append(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})")
+    return ";\n".join(statements) + ";"
+
+
+def _column_value(record: Any, key: Optional[str]) -> Any:
+    value = record if key is None else (record.get(key) if isinstance(record, dict) else None)
+    return value if isinstance(value, (str, int, float)) else None
+
+
+def _row(index: int, record: Any, columns: Dict[str, Optional[str]]) -> Tuple[Any, ...]:
+    values = [_column_value(record, key) for key in columns.values()]
+    return (index, *values, json.dumps(record, sort_keys=True, ensure_ascii=False))
+
+
+def write_sqlite_artifacts(db_path: str, artifacts: Dict[str, Dict[str, Any]]) -> str:
+    """Write artifact payloads (keyed by JSON filename) into one SQLite file.
+
+    All rows are bulk-inserted inside a single transaction, replacing any
+    previous contents. Record sections are streamed into ``executemany``, so
+    spilled ``SortedRuns`` sources are never materialized.
+    """
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(_schema())
+        with conn:
+            for name, payload in sorted(artifacts.items()):
+                skeleton, sections = split_record_sections(name, payload)
+                present: List[List[str]] = []
+                for path, records in sections:
+                    table = RECORD_TABLES[path]
+                    present.append(list(path))
+                    columns = TABLE_COLUMNS[table]
+                    placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+                    conn.executemany(
+                        f"INSERT INTO {table} VALUES ({placeholders})",
+                        (_row(index, record, columns) for index, record in enumerate(records)),
+                    )
+                conn.execute(
+                    "INSERT INTO artifacts VALUES (?, ?, ?)",
+                    (name, json.dumps(skeleton, sort_keys=True), json.dumps(present)),
+                )
+    finally:
+        conn.close()
+    return db_path
+
+
+class SqliteArtifacts:
+    """Read artifacts back from a SQLite sink without loading everything."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+
+        self.conn.close()
+
+    def __enter__(self) -> "SqliteArtifacts":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def artifact_names(self) -> List[str]:
+        """Return the artifact filenames stored in the sink."""
+
+        return [row[0] for row in self.conn.execute("SELECT name FROM artifacts ORDER BY name")]
+
+    def iter_records(self, table: str, **filters: Any) -> Iterator[Any]:
+        """Yield records of ``table`` in artifact order, filtered by indexed columns."""
+
+        columns = TABLE_COLUMNS[table]
+        clauses = []
+        params = []
+        for column, value in sorted(filters.items()):
+            if column not in columns:
+                raise ValueError(f"{column!r} is not an indexed column of {table}")
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        for (record,) in self.conn.execute(f"SELECT record FROM {table}{where} ORDER BY ord", params):
+            yield json.loads(record)
+
+    def core_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the core page record for ``url``, if present."""
+
+        return next(self.iter_records("core_pages", url=url), None)
+
+    def load_artifact(self, name: str) -> Dict[str, Any]:
+        """Rebuild one artifact payload exactly as the JSON writer saw it."""
+
+        row = self.conn.execute(
+            "SELECT skeleton, present FROM artifacts WHERE name = ?",
+            (name,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(name)
+        sections = [
+            (tuple(path), list(self.iter_records(RECORD_TABLES[tuple(path)])))
+            for path in json.loads(row[1])
+        ]
+        return merge_record_sections(json.loads(row[0]), sections)
+
+
+def export_json_artifacts(db_path: str, out_dir: str) -> List[str]:
+    """Write every artifact in the sink back out as stable JSON files."""
+
+    written: List[str] = []
+    with SqliteArtifacts(db_path) as sink:
+        for name in sink.artifact_names():
+            path = os.path.join(out_dir, name)
+            json_dump_stable(sink.load_artifact(name), path)
+            written.append(path)
+    return written
@@ -0,0 +1,131 @@
+"""SQLite-backed statistics of unknown dish tokens across sites and runs."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import islice
+import sqlite3
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_counts (
+    site TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    token TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (site, run_id, token)
+);
+CREATE INDEX IF NOT EXISTS idx_token_counts_recorded_at ON token_counts (recorded_at, token);
+CREATE INDEX IF NOT EXISTS idx_token_counts_token ON token_counts (token, recorded_at);
+"""
+
+_DELETE_RUN = "DELETE FROM token_counts WHERE site = ? AND run_id = ?"
+
+_INSERT = """
+INSERT INTO token_counts (site, run_id, recorded_at, token, count)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _batches(rows: Iterable[Tuple[Any, ...]], size: int) -> Iterator[List[Tuple[Any, ...]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class TokenStatsStore:
+    """Embedded store of per-site, per-run unknown token counts."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+
+        self._conn.close()
+
+    def __enter__(self) -> "TokenStatsStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def record_run(
+        self,
+        site: str,
+        run_id: str,
+        counts: Mapping[str, int],
+        *,
+        recorded_at: Optional[str] = None,
+        batch_size: int = 5000,
+    ) -> int:
+        """Replace a run's token counts in one transaction; return rows written.
+
+        Re-recording a ``(site, run_id)`` drops its previous rows first, so
+        tokens that no longer appear do not keep their stale counts.
+        """
+
+        timestamp = recorded_at or _utc_now()
+        rows = ((site, run_id, timestamp, token, int(count)) for token, count in sorted(counts.items()))
+        written = 0
+        with self._conn:
+            self._conn.execute(_DELETE_RUN, (site, run_id))
+            for batch in _batches(rows, batch_size):
+                self._conn.executemany(_INSERT, batch)
+                written += len(batch)
+        return written
+
+    def top_unknown_tokens(
+        self,
+        limit: int = 20,
+        *,
+        site: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Tuple[str, int, int]]:
+        """Return ``(token, total_count, site_count)`` ordered by total count.
+
+        ``since``/``until`` bound ``recorded_at`` (ISO 8601, inclusive).
+        """
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if site is not None:
+            clauses.append("site = ?")
+            params.append(site)
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("recorded_at <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT token, SUM(count) AS total, COUNT(DISTINCT site) AS sites "
+            f"FROM token_counts {where} "
+            "GROUP BY token ORDER BY total DESC, token ASC LIMIT ?"
+        )
+        params.append(limit)
+        return [(row[0], row[1], row[2]) for row in self._conn.execute(query, params)]
+
+    def token_history(self, token: str, *, site: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """Return ``(recorded_at, site, count)`` rows for one token, oldest first."""
+
+        query = "SELECT recorded_at, site, count FROM token_counts WHERE token = ?"
+        params: List[Any] = [token]
+        if site is not None:
+            query += " AND site = ?"
+            params.append(site)
+        query += " ORDER BY recorded_at, site"
+        return [(row[0], row[1], row[2]) for row in self._conn.execute(query, params)]
@@ -0,0 +1,177 @@
+"""Shared input arena: documents written once, read by reference in workers.
+
+``InputArena`` appends input buffers to one file (in ``/dev/shm`` when it
+has room, so it lives in memory) and hands out ``BufferRef`` tuples of
+``(path, offset, length)``. Passing a ref to a worker process pickles a few
+dozen bytes instead of the document; the worker maps the file and reads it
+through a ``memoryview``.
+
+The creating process owns the file and unlinks it on ``close`` (or when
+the arena is garbage collected or the interpreter exits). Workers only
+hold read-only mappings, so a crashed or killed worker leaves nothing
+behind; arenas of a crashed owner are removed by the next
+``InputArena`` created in the same directory.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import threading
+import uuid
+import weakref
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+ARENA_PREFIX = "seo-arena-"
+_SHM_DIR = "/dev/shm"
+_MAX_MAPPINGS = 8
+
+
+class BufferRef(NamedTuple):
+    """Location of one buffer inside an arena file."""
+
+    path: str
+    offset: int
+    length: int
+
+
+_maps: Dict[str, mmap.mmap] = {}
+_maps_lock = threading.Lock()
+
+
+def _mapping(path: str, end: int) -> mmap.mmap:
+    with _maps_lock:
+        mapped = _maps.get(path)
+        if mapped is None or len(mapped) < end:
+            with open(path, "rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            _maps.pop(path, None)
+            while len(_maps) >= _MAX_MAPPINGS:
+                # Dropped, not closed: views handed out earlier stay valid
+                # and the mapping goes away with the last of them.
+                _maps.pop(next(iter(_maps)))
+            _maps[path] = mapped
+        return mapped
+
+
+def read_view(ref: BufferRef) -> memoryview:
+    """Return a zero-copy view of ``ref`` in this process."""
+
+    if not ref.length:
+        return memoryview(b"")
+    return memoryview(_mapping(ref.path, ref.offset + ref.length))[ref.offset : ref.offset + ref.length]
+
+
+def as_bytes(data: Union[bytes, BufferRef]) -> bytes:
+    """Return ``data`` as ``bytes``, copying out of the arena if it is a ref.
+
+    Only for consumers that need ``bytes`` (e.g. parsers); use
+    ``read_view`` where a buffer is enough.
+    """
+
+    return bytes(read_view(data)) if isinstance(data, BufferRef) else data
+
+
+def as_buffer(data: Union[bytes, BufferRef]) -> Union[bytes, memoryview]:
+    """Return a bytes-like view of ``data`` without copying."""
+
+    return read_view(data) if isinstance(data, BufferRef) else data
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale_arenas(directory: str) -> List[str]:
+    """Remove arena files whose owning process no longer exists."""
+
+    removed: List[str] = []
+    for name in os.listdir(directory):
+        if not name.startswith(ARENA_PREFIX):
+            continue
+        pid, _, _ = name[len(ARENA_PREFIX) :].partition("-")
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+    return removed
+
+
+def _forget(path: str) -> None:
+    with _maps_lock:
+        _maps.pop(path, None)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _default_directory(size_hint: int) -> str:
+    if os.access(_SHM_DIR, os.W_OK):
+        stats = os.statvfs(_SHM_DIR)
+        # Container /dev/shm is often tiny; leave it at least half free.
+        if stats.f_bavail * stats.f_frsize >= 2 * size_hint:
+            return _SHM_DIR
+    return tempfile.gettempdir()
+
+
+class InputArena:
+    """Append-only file of input buffers shared with worker processes.
+
+    ``size_hint`` (expected total bytes) decides whether the default
+    location, ``/dev/shm``, has room; otherwise the temp directory is used.
+    """
+
+    def __init__(self, directory: Optional[str] = None, size_hint: int = 0) -> None:
+        if directory is None:
+            directory = _default_directory(size_hint)
+        os.makedirs(directory, exist_ok=True)
+        sweep_stale_arenas(directory)
+        self.path = os.path.join(directory, f"{ARENA_PREFIX}{os.getpid()}-{uuid.uuid4().hex}")
+        self._handle = open(self.path, "xb")
+        self._size = 0
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _forget, self.path)
+
+    def _append(self, data: bytes) -> BufferRef:
+        ref = BufferRef(self.path, self._size, len(data))
+        self._handle.write(data)
+        self._size += len(data)
+        return ref
+
+    def add(self, data: bytes) -> BufferRef:
+        """Append ``data`` and return its reference."""
+
+        with self._lock:
+            ref = self._append(data)
+            self._handle.flush()
+        return ref
+
+    def extend(self, buffers: Iterable[bytes]) -> List[BufferRef]:
+        """Append every buffer and return their references in order."""
+
+        with self._lock:
+            refs = [self._append(data) for data in buffers]
+            self._handle.flush()
+        return refs
+
+    def close(self) -> None:
+        """Close and remove the arena file."""
+
+        self._handle.close()
+        self._finalizer()
+
+    def __enter__(self) -> "InputArena":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,173 @@
+"""Declared stage DAG and a concurrent scheduler for pipeline runs.
+
+Each stage names the stages it depends on and receives their results as
+keyword arguments. Ready stages run concurrently on a thread pool, or on a
+process pool when marked ``process=True`` (the function and its inputs
+must then be picklable). Results are keyed by stage name, so output does
+not depend on completion order.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+from seo_engine.utils.guard import worker_context
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage: ``func(**{dep: result})`` runs after ``deps``."""
+
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    process: bool = False
+
+
+@dataclass
+class DagReport:
+    """Stage timings and the critical path of a scheduler run."""
+
+    timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timings": self.timings,
+            "critical_path": self.critical_path,
+            "critical_path_seconds": round(self.critical_path_seconds, 6),
+            "wall_seconds": round(self.wall_seconds, 6),
+        }
+
+
+def topological_order(stages: Sequence[Stage]) -> List[Stage]:
+    """Return stages in dependency order, keeping declaration order for ties."""
+
+    by_name: Dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage: {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stage {dep!r}")
+
+    ordered: List[Stage] = []
+    done: set = set()
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if all(dep in done for dep in stage.deps)]
+        if not ready:
+            raise ValueError(f"Stage cycle among: {sorted(stage.name for stage in pending)}")
+        stage = ready[0]
+        ordered.append(stage)
+        done.add(stage.name)
+        pending.remove(stage)
+    return ordered
+
+
+def _critical_path(ordered: Sequence[Stage], report: DagReport) -> None:
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for stage in ordered:
+        longest_dep = max(stage.deps, key=lambda dep: finish[dep], default=None)
+        start = finish[longest_dep] if longest_dep else 0.0
+        finish[stage.name] = start + report.timings[stage.name]["seconds"]
+        previous[stage.name] = longest_dep
+    if not finish:
+        return
+    tail: Optional[str] = max(finish, key=lambda name: finish[name])
+    report.critical_path_seconds = finish[tail]
+    path: List[str] = []
+    while tail is not None:
+        path.append(tail)
+        tail = previous[tail]
+    report.critical_path = path[::-1]
+
+
+def run_dag(
+    stages: Sequence[Stage],
+    max_workers: Optional[int] = None,
+    report: Optional[DagReport] = None,
+    stage_context: Optional[Callable[[str], ContextManager[Any]]] = None,
+) -> Dict[str, Any]:
+    """Run ``stages`` and return their results keyed by stage name.
+
+    ``max_workers=1`` runs stages serially in topological order, which is
+    required when ``stage_context`` (e.g. a profiler) wraps each stage. The
+    first stage failure is re-raised once running stages have finished.
+    """
+
+    ordered = topological_order(stages)
+    report = report if report is not None else DagReport()
+    results: Dict[str, Any] = {}
+    run_start = time.perf_counter()
+
+    def record(name: str, start: float, end: float) -> None:
+        report.timings[name] = {
+            "start": round(start - run_start, 6),
+            "end": round(end - run_start, 6),
+            "seconds": round(end - start, 6),
+        }
+
+    if max_workers == 1:
+        for stage in ordered:
+            start = time.perf_counter()
+            with stage_context(stage.name) if stage_context else nullcontext():
+                results[stage.name] = stage.func(**{dep: results[dep] for dep in stage.deps})
+            record(stage.name, start, time.perf_counter())
+    else:
+        _run_concurrent(ordered, max_workers, results, record)
+
+    report.wall_seconds = time.perf_counter() - run_start
+    _critical_path(ordered, report)
+    return results
+
+
+def _run_concurrent(
+    ordered: Sequence[Stage],
+    max_workers: Optional[int],
+    results: Dict[str, Any],
+    record: Callable[[str, float, float], None],
+) -> None:
+    pending = list(ordered)
+    running: Dict[Future, Tuple[Stage, float]] = {}
+    error: Optional[BaseException] = None
+    with ExitStack() as stack:
+        threads = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+        processes: Optional[Executor] = None
+        while pending or running:
+            if error is None:
+                for stage in [stage for stage in pending if all(dep in results for dep in stage.deps)]:
+                    pending.remove(stage)
+                    executor: Executor = threads
+                    if stage.process:
+                        if processes is None:
+                            # Stages already run on threads here; forking this
+                            # process could copy a held lock into the worker.
+                            processes = stack.enter_context(
+                                ProcessPoolExecutor(max_workers=max_workers, mp_context=worker_context())
+                            )
+                        executor = processes
+                    kwargs = {dep: results[dep] for dep in stage.deps}
+                    running[executor.submit(stage.func, **kwargs)] = (stage, time.perf_counter())
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda item: ordered.index(running[item][0])):
+                stage, start = running.pop(future)
+                record(stage.name, start, time.perf_counter())
+                exc = future.exception()
+                if exc is not None:
+                    error = error or exc
+                else:
+                    results[stage.name] = future.result()
+    if error is not None:
+        raise error
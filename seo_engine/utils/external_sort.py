@@ -0,0 +1,90 @@
+"""External merge sort for record streams that may not fit in memory."""
+
+from __future__ import annotations
+
+import heapq
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List
+
+
+def _write_run(records: List[Any], spill_dir: str) -> str:
+    fd, path = tempfile.mkstemp(prefix="run-", suffix=".pickle", dir=spill_dir)
+    with os.fdopen(fd, "wb") as handle:
+        pickler = pickle.Pickler(handle, protocol=pickle.HIGHEST_PROTOCOL)
+        for record in records:
+            pickler.dump(record)
+            # Records are independent; don't let the memo pin them all.
+            pickler.clear_memo()
+    return path
+
+
+def _read_run(path: str) -> Iterator[Any]:
+    with open(path, "rb") as handle:
+        unpickler = pickle.Unpickler(handle)
+        while True:
+            try:
+                yield unpickler.load()
+            except EOFError:
+                return
+
+
+class SortedRuns:
+    """Re-iterable, merged view over sorted runs spilled to disk.
+
+    Iterating merges the runs lazily with ``heapq.merge``, holding one
+    record per run in memory. Ties keep their input order, as with
+    ``sorted``. ``key`` must be a picklable top-level function when the
+    view is passed to a worker process or checkpointed.
+    """
+
+    def __init__(self, paths: List[str], key: Callable[[Any], Any], count: int) -> None:
+        self.paths = paths
+        self.key = key
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        return heapq.merge(*(_read_run(path) for path in self.paths), key=self.key)
+
+    def remove(self) -> None:
+        """Delete the run files."""
+
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def external_sort(
+    records: Iterable[Any],
+    key: Callable[[Any], Any],
+    spill_dir: str,
+    run_size: int = 100_000,
+) -> SortedRuns:
+    """Sort ``records`` by ``key`` in runs of at most ``run_size`` records.
+
+    Each run is sorted in memory and spilled to ``spill_dir``; the returned
+    ``SortedRuns`` merges them in ``sorted(records, key=key)`` order.
+    """
+
+    if run_size < 1:
+        raise ValueError("run_size must be positive")
+    os.makedirs(spill_dir, exist_ok=True)
+    paths: List[str] = []
+    count = 0
+    run: List[Any] = []
+    for record in records:
+        run.append(record)
+        if len(run) >= run_size:
+            run.sort(key=key)
+            paths.append(_write_run(run, spill_dir))
+            count += len(run)
+            run = []
+    if run:
+        run.sort(key=key)
+        paths.append(_write_run(run, spill_dir))
+        count += len(run)
+    return SortedRuns(paths, key, count)
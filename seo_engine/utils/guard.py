@@ -0,0 +1,221 @@
+"""Resource guards for parsing untrusted documents.
+
+Documents are checked against byte and element limits up front, then parsed
+in a separate worker process that is killed if it exceeds the time limit
+(or, with ``max_memory_bytes``, dies on its address-space limit). Rejected
+inputs are copied to a quarantine directory and reported with a
+``skip:<reason>`` code instead of failing the run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from seo_engine.utils.arena import BufferRef, as_buffer, as_bytes
+
+_ELEMENT_RE = re.compile(rb"<[A-Za-z]")
+
+SKIP_TOO_LARGE = "skip:too_many_bytes"
+SKIP_TOO_MANY_ELEMENTS = "skip:too_many_elements"
+SKIP_TIMEOUT = "skip:timeout"
+SKIP_WORKER_DIED = "skip:worker_died"
+SKIP_PARSE_ERROR = "skip:parse_error"
+
+
+@dataclass
+class ResourceLimits:
+    """Per-document limits; ``None`` disables a check."""
+
+    max_bytes: Optional[int] = 50 * 1024 * 1024
+    max_seconds: Optional[float] = 60.0
+    max_elements: Optional[int] = 1_000_000
+    max_memory_bytes: Optional[int] = None
+
+
+def count_elements(data: Union[bytes, memoryview], limit: Optional[int] = None) -> int:
+    """Return an upper bound on the number of elements in markup ``data``.
+
+    With ``limit``, counting stops at the first element past it, so checking
+    a hostile document takes constant memory.
+    """
+
+    count = 0
+    for count, _ in enumerate(_ELEMENT_RE.finditer(data), 1):
+        if limit is not None and count > limit:
+            break
+    return count
+
+
+def check_static_limits(data: Union[bytes, memoryview], limits: ResourceLimits) -> Optional[str]:
+    """Return a skip reason if ``data`` fails the byte or element limit."""
+
+    if limits.max_bytes is not None and len(data) > limits.max_bytes:
+        return SKIP_TOO_LARGE
+    if limits.max_elements is not None and count_elements(data, limits.max_elements) > limits.max_elements:
+        return SKIP_TOO_MANY_ELEMENTS
+    return None
+
+
+def _worker_main(conn: Connection, max_memory_bytes: Optional[int]) -> None:
+    if max_memory_bytes:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        func, data = message
+        try:
+            # Arena refs are read here; only the ref crossed the pipe.
+            conn.send(("ok", func(as_bytes(data))))
+        except MemoryError:
+            conn.send(("error", SKIP_WORKER_DIED))
+            return
+        except Exception as exc:  # reported back as a parse failure
+            conn.send(("error", f"{SKIP_PARSE_ERROR}: {type(exc).__name__}: {exc}"))
+
+
+def worker_context() -> Any:
+    """Return the multiprocessing context used for worker processes.
+
+    The pipeline runs stages on threads, and forking such a process directly
+    is unsafe, so workers come from a forkserver where available.
+    """
+
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class GuardedRunner:
+    """Run a parse function on documents in a killable worker process.
+
+    ``func`` must be a picklable top-level function taking the document
+    bytes. One worker is reused across documents and replaced after it is
+    killed or dies.
+    """
+
+    def __init__(
+        self,
+        limits: ResourceLimits,
+        quarantine_dir: Optional[str] = None,
+        suffix: str = ".bin",
+    ) -> None:
+        self.limits = limits
+        self.quarantine_dir = quarantine_dir
+        self.suffix = suffix
+        self.skipped: List[Dict[str, Any]] = []
+        self._process: Any = None
+        self._conn: Optional[Connection] = None
+
+    def _start(self) -> Connection:
+        if self._process is None or not self._process.is_alive():
+            parent_conn, child_conn = worker_context().Pipe()
+            self._process = worker_context().Process(
+                target=_worker_main,
+                args=(child_conn, self.limits.max_memory_bytes),
+                daemon=True,
+            )
+            self._process.start()
+            child_conn.close()
+            self._conn = parent_conn
+        assert self._conn is not None
+        return self._conn
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _call(self, func: Callable[[bytes], Any], data: Union[bytes, BufferRef]) -> Tuple[Any, Optional[str]]:
+        conn = self._start()
+        try:
+            conn.send((func, data))
+            if not conn.poll(self.limits.max_seconds):
+                self._kill()
+                return None, SKIP_TIMEOUT
+            status, value = conn.recv()
+        except (EOFError, OSError, BrokenPipeError):
+            self._kill()
+            return None, SKIP_WORKER_DIED
+        if status != "ok":
+            if value == SKIP_WORKER_DIED:
+                self._kill()
+            return None, value
+        return value, None
+
+    def _quarantine(self, data: Union[bytes, memoryview], digest: str) -> Optional[str]:
+        if not self.quarantine_dir:
+            return None
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+        path = os.path.join(self.quarantine_dir, f"{digest}{self.suffix}")
+        if not os.path.exists(path):
+            # Concurrent runs may quarantine the same document.
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.quarantine_dir)
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, path)
+        return path
+
+    def run(
+        self,
+        func: Callable[[bytes], Any],
+        data: Union[bytes, BufferRef],
+        source: str = "",
+    ) -> Tuple[Any, Optional[str]]:
+        """Return ``(result, None)`` or ``(None, reason)`` for one document.
+
+        ``data`` may be an ``InputArena`` ref, in which case only the ref is
+        sent to the worker. Skipped documents are quarantined and appended
+        to ``skipped``.
+        """
+
+        buffer = as_buffer(data)
+        reason = check_static_limits(buffer, self.limits)
+        result = None
+        if reason is None:
+            result, reason = self._call(func, data)
+        if reason is not None:
+            digest = hashlib.sha256(buffer).hexdigest()
+            record: Dict[str, Any] = {
+                "source": source,
+                "sha256": digest,
+                "bytes": len(buffer),
+                "reason": reason,
+            }
+            quarantined = self._quarantine(buffer, digest)
+            if quarantined:
+                record["quarantined"] = os.path.basename(quarantined)
+            self.skipped.append(record)
+        return result, reason
+
+    def close(self) -> None:
+        """Stop the worker process."""
+
+        if self._process is not None and self._process.is_alive() and self._conn is not None:
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._process.join(timeout=1)
+        self._kill()
+
+    def __enter__(self) -> "GuardedRunner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
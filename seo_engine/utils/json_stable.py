@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+import os
+import tempfile
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, Sequence
 
 
 def json_dumps_stable(obj: Any) -> str:
@@ -20,8 +23,204 @@ def json_dump_stable(obj: Any, path: str) -> None:
         handle.write("\n")
 
 
+_STREAM_CHUNK = 1024
+
+
+def _is_streamed(value: Any) -> bool:
+    return not isinstance(value, (dict, list, tuple, str, bytes)) and isinstance(value, Iterable)
+
+
+def json_dump_stable_stream(obj: Dict[str, Any], path: str) -> None:
+    """Write ``obj`` exactly as ``json_dump_stable`` would, streaming arrays.
+
+    Top-level values that are iterables other than lists (e.g. generators or
+    ``SortedRuns``) are consumed one record at a time instead of being
+    serialized in one piece, so they never have to fit in memory.
+    """
+
+    with open(path, "w", encoding="utf-8") as handle:
+        if not obj:
+            handle.write("{}\n")
+            return
+        handle.write("{")
+        for position, key in enumerate(sorted(obj)):
+            handle.write(",\n  " if position else "\n  ")
+            handle.write(json.dumps(key, ensure_ascii=False))
+            handle.write(": ")
+            value = obj[key]
+            if not _is_streamed(value):
+                handle.write(json_dumps_stable(value).replace("\n", "\n  "))
+                continue
+            empty = True
+            records = iter(value)
+            while True:
+                chunk = list(islice(records, _STREAM_CHUNK))
+                if not chunk:
+                    break
+                # Encoding a chunk as one array is much cheaper than one
+                # ``json.dumps`` per record; strip its brackets and re-indent.
+                body = json_dumps_stable(chunk)[2:-2]
+                handle.write(",\n  " if not empty else "[\n  ")
+                handle.write(body.replace("\n", "\n  "))
+                empty = False
+            handle.write("[]" if empty else "\n  ]")
+        handle.write("\n}\n")
+
+
+def json_dump_stable_atomic(obj: Any, path: str) -> None:
+    """Write stable JSON via a temporary file renamed over ``path``.
+
+    Readers see either the previous file or the complete new one.
+    """
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    os.close(fd)
+    try:
+        json_dump_stable(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def json_load(path: str) -> Any:
     """Load JSON from disk."""
 
     with open(path, "r", encoding="utf-8") as handle:
         return json.load(handle)
+
+
+_DELIMITERS = frozenset(",:]} \t\r\n")
+
+
+class _StreamingJsonReader:
+    """Incremental reader over a JSON document held in a text stream."""
+
+    def __init__(self, handle: IO[str], chunk_size: int) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise ``ValueError``."""
+
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON document")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk ("1." + "5"); only trust a
+            # value once it is followed by a delimiter.
+            if (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield items of the array starting at the current position."""
+
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield keys of the object at the current position.
+
+        After each key the reader is positioned at its value, which the
+        caller must consume (or skip) before advancing.
+        """
+
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def skip(self) -> None:
+        """Consume the next value, streaming through arrays and objects."""
+
+        char = self.peek()
+        if char == "[":
+            for _ in self.iter_array():
+                pass
+        elif char == "{":
+            for _ in self.iter_object():
+                self.skip()
+        else:
+            self.value()
+
+
+def iter_json_array(path: str, keys: Sequence[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Stream the items of the array found at ``keys`` inside a JSON file.
+
+    Only one item is decoded at a time; sibling values are skipped without
+    being materialized. Yields nothing when the path does not exist.
+    """
+
+    with open(path, "r", encoding="utf-8") as handle:
+        reader = _StreamingJsonReader(handle, chunk_size)
+        for target in keys:
+            if reader.peek() != "{":
+                return
+            for key in reader.iter_object():
+                if key == target:
+                    break
+                reader.skip()
+            else:
+                return
+        if reader.peek() != "[":
+            return
+        yield from reader.iter_array()
@@ -0,0 +1,182 @@
+"""JSON Lines artifact format with streaming readers and writers.
+
+Each file starts with a header line describing the artifact, followed by
+one line per record::
+
+    {"artifact": "core_pages.json", "format": "seo-intake-jsonl", ...}
+    {"record": {...}, "section": "urls"}
+
+Sections are written in a fixed order and records keep their producer's
+order, so output is deterministic and readers need constant memory.
+
+``find_artifact``, ``load_artifact`` and ``iter_artifact_records`` read an
+artifact from a run directory in whichever format the run wrote it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from seo_engine.schemas import RECORD_PATHS, merge_record_sections, split_record_sections
+from seo_engine.utils.json_stable import iter_json_array, json_load
+
+JSONL_FORMAT = "seo-intake-jsonl"
+JSONL_VERSION = 1
+
+
+def _dumps_line(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def section_name(path: Tuple[str, ...]) -> str:
+    """Return the dotted section name for a record path."""
+
+    return ".".join(path)
+
+
+class JsonlWriter:
+    """Write one artifact as JSON Lines, record by record."""
+
+    def __init__(
+        self,
+        path: str,
+        artifact: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        sections: Optional[List[str]] = None,
+    ) -> None:
+        self.path = path
+        self.artifact = artifact
+        if sections is None:
+            sections = [section_name(path) for path in RECORD_PATHS.get(artifact, ())]
+        self.sections = sections
+        self._handle: IO[str] = open(path, "w", encoding="utf-8")
+        self._current = -1
+        self._handle.write(
+            _dumps_line(
+                {
+                    "artifact": artifact,
+                    "format": JSONL_FORMAT,
+                    "metadata": metadata or {},
+                    "sections": self.sections,
+                    "version": JSONL_VERSION,
+                }
+            )
+        )
+        self._handle.write("\n")
+
+    def write(self, section: str, record: Any) -> None:
+        """Append a record; sections must be written in header order."""
+
+        index = self.sections.index(section)
+        if index < self._current:
+            raise ValueError(f"Section {section!r} written after {self.sections[self._current]!r}")
+        self._current = index
+        self._handle.write(_dumps_line({"record": record, "section": section}))
+        self._handle.write("\n")
+
+    def write_many(self, section: str, records: Iterable[Any]) -> None:
+        """Append every record of ``records`` to ``section``."""
+
+        for record in records:
+            self.write(section, record)
+
+    def close(self) -> None:
+        """Flush and close the file."""
+
+        self._handle.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_jsonl_artifact(path: str, artifact: str, payload: Dict[str, Any]) -> None:
+    """Write a complete artifact payload as JSON Lines."""
+
+    skeleton, sections = split_record_sections(artifact, payload)
+    names = [section_name(record_path) for record_path, _ in sections]
+    with JsonlWriter(path, artifact, metadata=skeleton, sections=names) as writer:
+        for record_path, records in sections:
+            writer.write_many(section_name(record_path), records)
+
+
+def read_jsonl_header(path: str) -> Dict[str, Any]:
+    """Return the header record of a JSONL artifact."""
+
+    with open(path, "r", encoding="utf-8") as handle:
+        header = json.loads(handle.readline())
+    if header.get("format") != JSONL_FORMAT:
+        raise ValueError(f"{path} is not a {JSONL_FORMAT} file")
+    return header
+
+
+def iter_jsonl_records(path: str, section: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(section, record)`` pairs, optionally for one section only."""
+
+    with open(path, "r", encoding="utf-8") as handle:
+        header = json.loads(handle.readline())
+        if header.get("format") != JSONL_FORMAT:
+            raise ValueError(f"{path} is not a {JSONL_FORMAT} file")
+        for line in handle:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if section is None or entry["section"] == section:
+                yield entry["section"], entry["record"]
+
+
+def load_jsonl_artifact(path: str) -> Dict[str, Any]:
+    """Rebuild the full artifact payload (for small artifacts and tests)."""
+
+    header = read_jsonl_header(path)
+    records: Dict[str, List[Any]] = {}
+    for section, record in iter_jsonl_records(path):
+        records.setdefault(section, []).append(record)
+    sections = [
+        (tuple(name.split(".")), records.get(name, []))
+        for name in header["sections"]
+    ]
+    return merge_record_sections(header["metadata"], sections)
+
+
+def jsonl_filename(filename: str) -> str:
+    """Return the JSON Lines filename of artifact ``filename``."""
+
+    return f"{os.path.splitext(filename)[0]}.jsonl"
+
+
+def find_artifact(artifacts_dir: str, filename: str) -> Optional[str]:
+    """Return the path of artifact ``filename`` as JSON or JSON Lines, if present."""
+
+    for candidate in (filename, jsonl_filename(filename)):
+        path = os.path.join(artifacts_dir, candidate)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _require_artifact(artifacts_dir: str, filename: str) -> str:
+    path = find_artifact(artifacts_dir, filename)
+    if path is None:
+        raise ValueError(f"{artifacts_dir} has no {filename} artifact (json or jsonl)")
+    return path
+
+
+def load_artifact(artifacts_dir: str, filename: str) -> Dict[str, Any]:
+    """Load a whole artifact in either format; raises ``ValueError`` if missing."""
+
+    path = _require_artifact(artifacts_dir, filename)
+    return load_jsonl_artifact(path) if path.endswith(".jsonl") else json_load(path)
+
+
+def iter_artifact_records(artifacts_dir: str, filename: str, record_path: Tuple[str, ...]) -> Iterator[Any]:
+    """Stream the records at ``record_path`` of an artifact in either format."""
+
+    path = _require_artifact(artifacts_dir, filename)
+    if path.endswith(".jsonl"):
+        return (record for _, record in iter_jsonl_records(path, section_name(record_path)))
+    return iter_json_array(path, record_path)
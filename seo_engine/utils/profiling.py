@@ -0,0 +1,147 @@
+"""Per-stage CPU and memory profiling for pipeline runs.
+
+Profiles are written in standard formats: ``<stage>.prof`` files load with
+``pstats``/snakeviz, and ``<stage>.tracemalloc`` files with
+``tracemalloc.Snapshot.load``. A ``summary.json`` lists stage durations and
+memory, and ``<stage>.top.txt`` holds the top allocation sites.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Union
+
+from seo_engine.utils.json_stable import json_dump_stable
+
+
+@dataclass
+class StageProfile:
+    """Profiling results captured for one stage."""
+
+    name: str
+    seconds: float
+    profile: cProfile.Profile
+    snapshot: tracemalloc.Snapshot
+    memory_current: int
+    memory_peak: int
+
+
+class NullProfiler:
+    """Profiler stand-in used when profiling is disabled."""
+
+    enabled = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Run a stage without profiling."""
+
+        yield
+
+    def write(self, out_dir: str) -> List[str]:
+        """Nothing to write."""
+
+        return []
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class StageProfiler:
+    """Capture a cProfile and tracemalloc snapshot for each pipeline stage.
+
+    Results stay in memory until ``write`` so stages can run before the
+    artifacts directory is prepared.
+    """
+
+    enabled = True
+
+    def __init__(self, top_n: int = 25, frames: int = 5) -> None:
+        self.top_n = top_n
+        self.stages: List[StageProfile] = []
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(frames)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as stage ``name``."""
+
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            self.stages.append(
+                StageProfile(
+                    name=name,
+                    seconds=seconds,
+                    profile=profile,
+                    snapshot=tracemalloc.take_snapshot(),
+                    memory_current=current,
+                    memory_peak=peak,
+                )
+            )
+
+    def _top_allocations(self, index: int) -> List[str]:
+        snapshot = self.stages[index].snapshot
+        lines = [f"Top {self.top_n} allocation sites after stage {self.stages[index].name!r}:"]
+        for stat in snapshot.statistics("lineno")[: self.top_n]:
+            lines.append(str(stat))
+        if index > 0:
+            lines.append("")
+            lines.append(f"Top {self.top_n} changes since previous stage:")
+            previous = self.stages[index - 1].snapshot
+            for stat in snapshot.compare_to(previous, "lineno")[: self.top_n]:
+                lines.append(str(stat))
+        return lines
+
+    def write(self, out_dir: str) -> List[str]:
+        """Write profiles into ``out_dir`` and return the written paths."""
+
+        os.makedirs(out_dir, exist_ok=True)
+        written: List[str] = []
+        summary: List[Dict[str, Any]] = []
+        for index, stage in enumerate(self.stages):
+            prefix = os.path.join(out_dir, f"{index:02d}_{stage.name}")
+            stage.profile.dump_stats(f"{prefix}.prof")
+            stage.snapshot.dump(f"{prefix}.tracemalloc")
+            with open(f"{prefix}.top.txt", "w", encoding="utf-8") as handle:
+                handle.write("\n".join(self._top_allocations(index)))
+                handle.write("\n")
+            written.extend([f"{prefix}.prof", f"{prefix}.tracemalloc", f"{prefix}.top.txt"])
+            summary.append(
+                {
+                    "stage": stage.name,
+                    "seconds": round(stage.seconds, 6),
+                    "memory_current_bytes": stage.memory_current,
+                    "memory_peak_bytes": stage.memory_peak,
+                }
+            )
+        summary_path = os.path.join(out_dir, "summary.json")
+        json_dump_stable({"stages": summary}, summary_path)
+        written.append(summary_path)
+        return written
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracemalloc = False
+
+
+def make_profiler(enabled: bool) -> Union[StageProfiler, NullProfiler]:
+    """Return a ``StageProfiler`` when enabled, otherwise a no-op profiler."""
+
+    return StageProfiler() if enabled else NullProfiler()
+
@@ -0,0 +1,113 @@
+"""Fixed-memory streaming sketches: HyperLogLog and Space-Saving."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value: str) -> int:
+    """Return the 64-bit hash used by ``HyperLogLog``."""
+
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Distinct-count estimator using ``2 ** precision`` one-byte registers.
+
+    The relative standard error is about ``1.04 / sqrt(2 ** precision)``
+    (1.6% at the default precision of 12, in 4 KiB).
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Add ``value`` to the sketch."""
+
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed: int) -> None:
+        """Add a precomputed 64-bit hash (see ``hash64``)."""
+
+        rest_bits = 64 - self.precision
+        index = hashed >> rest_bits
+        rest = hashed & (_MASK64 >> self.precision)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold ``other`` (same precision) into this sketch."""
+
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(max(pair) for pair in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        """Return the estimated number of distinct values added."""
+
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters over a stream, tracking at most ``capacity`` items.
+
+    Each reported count overestimates the true count by at most its
+    ``error``; any item occurring more than ``total / capacity`` times is
+    guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # Holds every tracked item once; an entry's count may lag behind
+        # ``counts`` and is refreshed when it reaches the top.
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Count ``count`` occurrences of ``item``."""
+
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+        while True:
+            floor, victim = self._heap[0]
+            current = self.counts[victim]
+            if current == floor:
+                break
+            heapq.heapreplace(self._heap, (current, victim))
+        del self.counts[victim]
+        del self.errors[victim]
+        self.counts[item] = floor + count
+        self.errors[item] = floor
+        heapq.heapreplace(self._heap, (floor + count, item))
+
+    def top(self, limit: int = 10) -> List[Tuple[str, int, int]]:
+        """Return ``(item, count, error)`` for the heaviest items."""
+
+        ranked = sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(item, count, self.errors[item]) for item, count in ranked[:limit]]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from pipeline import run_pipeline  # noqa: E402
+from seo_engine.utils.arena import _SHM_DIR, ARENA_PREFIX, InputArena, read_view, sweep_stale_arenas  # noqa: E402
+from seo_engine.utils.guard import SKIP_TIMEOUT, SKIP_TOO_LARGE, GuardedRunner, ResourceLimits  # noqa: E402
+from seo_engine.utils.json_stable import json_load  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _parse(data: bytes) -> str:
+    if data == b"hang":
+        while True:
+            time.sleep(0.01)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_arena_refs_read_back_without_copying(tmp_path: Path) -> None:
+    with InputArena(str(tmp_path)) as arena:
+        refs = arena.extend([b"<p>one</p>", b"", b"<p>three</p>"])
+        later = arena.add(b"<p>four</p>")
+
+        view = read_view(refs[2])
+        assert isinstance(view, memoryview) and view.readonly
+        assert [bytes(read_view(ref)) for ref in (*refs, later)] == [
+            b"<p>one</p>",
+            b"",
+            b"<p>three</p>",
+            b"<p>four</p>",
+        ]
+        assert refs[2].offset == 10
+        del view
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_guarded_workers_read_refs_and_survive_kills(tmp_path: Path) -> None:
+    limits = ResourceLimits(max_bytes=64, max_seconds=0.5)
+    with InputArena(str(tmp_path / "arena")) as arena:
+        ok, hang, big = arena.extend([b"<p>ok</p>", b"hang", b"x" * 65])
+        with GuardedRunner(limits, quarantine_dir=str(tmp_path / "quarantine")) as guard:
+            assert guard.run(_parse, ok) == (hashlib.sha256(b"<p>ok</p>").hexdigest(), None)
+            assert guard.run(_parse, hang)[1] == SKIP_TIMEOUT
+            assert guard.run(_parse, big)[1] == SKIP_TOO_LARGE
+            assert guard.run(_parse, ok)[1] is None
+
+    assert os.listdir(tmp_path / "arena") == []
+    assert [record["bytes"] for record in guard.skipped] == [4, 65]
+    assert (tmp_path / "quarantine" / f"{guard.skipped[0]['sha256']}.bin").read_bytes() == b"hang"
+
+
+def test_process_run_with_guard_reads_arena_and_removes_it(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html_files = [(FIXTURES_DIR / "sample_location.html").read_bytes(), b"<div>" * 50]
+    limits = ResourceLimits(max_elements=40)
+
+    plain = Path(run_pipeline(sitemap_xml, html_files, str(tmp_path / "plain"), limits=limits, max_workers=1))
+    shared = Path(
+        run_pipeline(sitemap_xml, html_files, str(tmp_path / "shared"), limits=limits, use_processes=True)
+    )
+
+    assert (shared / "locations.json").read_bytes() == (plain / "locations.json").read_bytes()
+    locations = json_load(str(shared / "locations.json"))
+    assert locations["locations"]
+    assert [record["bytes"] for record in locations["skipped"]] == [250]
+    owned = f"{ARENA_PREFIX}{os.getpid()}-"
+    for directory in {_SHM_DIR, tempfile.gettempdir()}:
+        if os.path.isdir(directory):
+            assert not [name for name in os.listdir(directory) if name.startswith(owned)]
+
+
+def test_sweep_removes_arenas_of_dead_owners(tmp_path: Path) -> None:
+    stale = tmp_path / f"{ARENA_PREFIX}999999999-dead"
+    stale.write_bytes(b"left behind")
+    live = tmp_path / f"{ARENA_PREFIX}{os.getpid()}-live"
+    live.write_bytes(b"in use")
+
+    assert sweep_stale_arenas(str(tmp_path)) == [stale.name]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [live.name]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.store.artifact_store import ArtifactStore  # noqa: E402
+
+
+def _write_artifacts(directory: Path, locations: str) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "core_pages.json").write_text('{"urls": []}\n', encoding="utf-8")
+    (directory / "locations.json").write_text(locations, encoding="utf-8")
+    return directory
+
+
+def _blob_count(store: ArtifactStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.blobs_dir))
+
+
+def test_unchanged_artifacts_share_blobs(tmp_path: Path) -> None:
+    store = ArtifactStore(str(tmp_path / "store"))
+    first = _write_artifacts(tmp_path / "run1", '{"locations": []}\n')
+    second = _write_artifacts(tmp_path / "run2", '{"locations": [1]}\n')
+
+    store.publish_run(str(first), "example.com", "2026-01-05")
+    manifest = store.publish_run(str(second), "example.com", "2026-01-12")
+
+    assert _blob_count(store) == 3
+    assert [run["run_date"] for run in store.find_runs("example.com")] == [
+        "2026-01-05",
+        "2026-01-12",
+    ]
+    assert store.find_runs("example.com", start="2026-01-06") == [
+        {"run_date": "2026-01-12", "run_id": manifest["run_id"]}
+    ]
+
+    checkout_dir = store.checkout(manifest["run_id"], str(tmp_path / "checkout"))
+    assert Path(checkout_dir, "locations.json").read_text(encoding="utf-8") == '{"locations": [1]}\n'
+
+
+def test_gc_removes_unreferenced_blobs(tmp_path: Path) -> None:
+    store = ArtifactStore(str(tmp_path / "store"))
+    first = _write_artifacts(tmp_path / "run1", '{"locations": []}\n')
+    second = _write_artifacts(tmp_path / "run2", '{"locations": [1]}\n')
+    old = store.publish_run(str(first), "example.com", "2026-01-05")
+    store.publish_run(str(second), "example.com", "2026-01-12")
+
+    store.remove_run(old["run_id"])
+
+    assert store.gc() == 1
+    assert _blob_count(store) == 2
+    assert store.latest_run("example.com")["run_date"] == "2026-01-12"
+
+
+def test_concurrent_publishes_keep_every_index_entry(tmp_path: Path) -> None:
+    root = str(tmp_path / "store")
+    runs = [_write_artifacts(tmp_path / f"run{day:02d}", f'{{"locations": [{day}]}}\n') for day in range(1, 25)]
+
+    def publish(day: int) -> None:
+        ArtifactStore(root).publish_run(str(runs[day - 1]), "example.com", f"2026-01-{day:02d}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(publish, range(1, 25)))
+
+    assert len(ArtifactStore(root).find_runs("example.com")) == 24
+
+
+def test_gc_waits_for_a_publish_reusing_orphaned_blobs(tmp_path: Path) -> None:
+    root = str(tmp_path / "store")
+    store = ArtifactStore(root)
+    run = _write_artifacts(tmp_path / "run1", '{"locations": []}\n')
+    store.remove_run(store.publish_run(str(run), "example.com", "2026-01-05")["run_id"])
+    collector = threading.Thread(target=lambda: ArtifactStore(root).gc())
+    put_file = store.put_file
+
+    def put_then_collect(path: str) -> str:
+        digest = put_file(path)
+        if collector.ident is None:
+            collector.start()
+            collector.join(0.2)
+        return digest
+
+    store.put_file = put_then_collect  # type: ignore[method-assign]
+    manifest = store.publish_run(str(run), "example.com", "2026-01-05")
+    collector.join()
+
+    checkout_dir = store.checkout(manifest["run_id"], str(tmp_path / "checkout"))
+    assert Path(checkout_dir, "locations.json").read_text(encoding="utf-8") == '{"locations": []}\n'
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine import pipeline  # noqa: E402
+from seo_engine.store.checkpoints import CheckpointStore  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+HTML_FIXTURES = [
+    "sample_location.html",
+    "sample_location_duplicate.html",
+    "sample_location_jsonld.html",
+    "sample_locations_multi.html",
+]
+
+
+def _run(out_dir: Path, **kwargs: Any) -> Path:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html_files = [(FIXTURES_DIR / name).read_bytes() for name in HTML_FIXTURES]
+    return Path(
+        pipeline.run_pipeline(sitemap_xml, html_files, str(out_dir), extractors=("page_meta",), **kwargs)
+    )
+
+
+def test_checkpoint_store_round_trips_atomically(tmp_path: Path) -> None:
+    store = CheckpointStore(str(tmp_path), "abc")
+
+    assert not store.has("sitemap")
+    store.save("sitemap", {"urls": ["https://example.com/"], "entries": [("u", None)]})
+
+    assert store.load("sitemap") == {"urls": ["https://example.com/"], "entries": [("u", None)]}
+    assert [path.name for path in (tmp_path / "abc").iterdir()] == ["sitemap.pickle"]
+    store.clear()
+    assert not (tmp_path / "abc").exists()
+
+
+def test_interrupted_run_resumes_from_location_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = _run(tmp_path / "clean")
+    checkpoint_dir = tmp_path / "checkpoints"
+    monkeypatch.setattr(pipeline, "LOCATION_BATCH_SIZE", 1)
+    real_batch = pipeline._location_batch
+    calls = []
+
+    def crashing_batch(*args: Any) -> Any:
+        calls.append(args[2])
+        if len(calls) == 3:
+            raise RuntimeError("killed")
+        return real_batch(*args)
+
+    monkeypatch.setattr(pipeline, "_location_batch", crashing_batch)
+    with pytest.raises(RuntimeError, match="killed"):
+        _run(tmp_path / "resumed", checkpoint_dir=str(checkpoint_dir), max_workers=1)
+    assert calls == [0, 1, 2]
+
+    calls.clear()
+    artifacts_dir = _run(tmp_path / "resumed", checkpoint_dir=str(checkpoint_dir), max_workers=1)
+
+    assert calls == [2, 3]
+    assert list(checkpoint_dir.iterdir()) == []
+    for path in sorted(expected.iterdir()):
+        assert (artifacts_dir / path.name).read_bytes() == path.read_bytes(), path.name
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import pstats
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.cli import main  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Generous enough for slow CI hosts; the module checks below are the real guard.
+IMPORT_BUDGET_SECONDS = 0.5
+HEAVY_MODULES = ("bs4", "pandas", "sqlite3", "seo_engine.extract.locations")
+
+
+def test_cold_import_stays_within_budget() -> None:
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import seo_engine.cli, seo_engine.pipeline\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(elapsed, ','.join(heavy))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, _, heavy = result.stdout.strip().partition(" ")
+
+    assert heavy == ""
+    assert float(elapsed) < IMPORT_BUDGET_SECONDS
+
+
+def test_core_pages_subcommand(tmp_path: Path, capsys) -> None:
+    output = tmp_path / "core_pages.json"
+
+    assert main(["core-pages", str(FIXTURES_DIR / "sample_sitemap.xml"), "-o", str(output)]) == 0
+
+    urls = [page["url"] for page in json.loads(output.read_text(encoding="utf-8"))["urls"]]
+    assert urls[0] == "https://example.com/"
+    assert "https://example.com/items/pizzas/pepperoni" not in urls
+
+
+def test_run_subcommand_writes_artifacts(tmp_path: Path, capsys) -> None:
+    exit_code = main(
+        [
+            "run",
+            "--sitemap",
+            str(FIXTURES_DIR / "sample_sitemap.xml"),
+            "--html",
+            str(FIXTURES_DIR / "sample_location.html"),
+            "--out",
+            str(tmp_path),
+        ]
+    )
+
+    artifacts_dir = Path(capsys.readouterr().out.strip())
+    assert exit_code == 0
+    assert (artifacts_dir / "locations.json").exists()
+
+
+def test_run_with_profile_saves_stage_profiles(tmp_path: Path, capsys) -> None:
+    main(
+        [
+            "run",
+            "--sitemap",
+            str(FIXTURES_DIR / "sample_sitemap.xml"),
+            "--out",
+            str(tmp_path),
+            "--profile",
+        ]
+    )
+
+    profiles_dir = Path(capsys.readouterr().out.strip()) / "profiles"
+    summary = json.loads((profiles_dir / "summary.json").read_text(encoding="utf-8"))
+    assert [stage["stage"] for stage in summary["stages"]][:2] == ["sitemap", "core_pages"]
+    stats = pstats.Stats(str(profiles_dir / "00_sitemap.prof"))
+    assert stats.total_calls > 0
+    snapshot = tracemalloc.Snapshot.load(str(profiles_dir / "00_sitemap.tracemalloc"))
+    assert snapshot.statistics("lineno")
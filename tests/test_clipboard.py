@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.render.clipboard import ClipboardBudget, render_clipboard, write_clipboard  # noqa: E402
+
+
+def _pages(count: int) -> list:
+    return [
+        {"url": f"https://a.test/p{index:03d}", "label": "Menu" if index % 3 else "Other", "score": index % 7}
+        for index in range(count)
+    ]
+
+
+def test_streamed_clipboard_matches_rendered_text() -> None:
+    locations = [{"location_name": "Downtown"}, {"name": "Airport"}]
+    categories = [{"category": "Pizza", "count": 2}, {"category": "Soup"}]
+    handle = io.StringIO()
+
+    written = write_clipboard(handle, iter(locations), iter(_pages(5)), categories, {})
+
+    text = render_clipboard(locations, _pages(5), categories, {})
+    assert handle.getvalue() == text
+    assert written == len(text)
+    assert text.splitlines()[:4] == ["SEO Intake Summary", "Locations:", "- Downtown", "- Airport"]
+
+
+def test_summary_mode_keeps_top_pages_and_counts_labels() -> None:
+    budget = ClipboardBudget(max_locations=2, max_core_pages=3, max_chars=None)
+    locations = [{"location_name": f"Store {index}"} for index in range(5)]
+
+    lines = render_clipboard(locations, iter(_pages(30)), [], {}, budget=budget).splitlines()
+
+    assert lines[2:5] == ["- Store 0", "- Store 1", "- …and 3 more"]
+    assert lines[5:8] == ["Core Pages (30 total):", "- Menu: 20", "- Other: 10"]
+    assert lines[8:13] == [
+        "Top Core Pages by score:",
+        "- https://a.test/p006",
+        "- https://a.test/p013",
+        "- https://a.test/p020",
+        "- …and 27 more",
+    ]
+
+
+def test_summary_mode_respects_character_budget() -> None:
+    budget = ClipboardBudget(max_core_pages=1000, max_chars=400)
+
+    text = render_clipboard([], _pages(500), [], {}, budget=budget)
+
+    assert len(text) <= 400
+    assert "- …and" in text
+
+
+def test_character_budget_is_a_hard_cap() -> None:
+    locations = [{"location_name": f"Store {index}"} for index in range(40)]
+    categories = [{"category": f"Category {index}", "count": index} for index in range(40)]
+    ahrefs = {
+        "traffic_trend": {"direction": "Up", "confidence": "High"},
+        "position_distribution": {"latest_counts": {f"{index}-{index + 3}": index for index in range(12)}},
+        "top_keywords": [
+            {"keyword": f"keyword {index}", "volume": index, "position": 1, "url": "https://a.test/"}
+            for index in range(12)
+        ],
+    }
+    taxonomy = {"audit": {"top_unknown_tokens": [{"token": f"tok{index}", "count": 1} for index in range(30)]}}
+
+    for max_chars in (0, 8, 25, 60, 150, 400, 900):
+        budget = ClipboardBudget(max_chars=max_chars)
+        handle = io.StringIO()
+        written = write_clipboard(
+            handle, locations, _pages(200), categories, ahrefs, taxonomy, include_unknown_tokens=True, budget=budget
+        )
+
+        text = handle.getvalue()
+        assert len(text) == written <= max_chars
+        if max_chars >= 150:
+            assert text.startswith("SEO Intake Summary") and text.endswith("…truncated")
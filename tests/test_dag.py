@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.utils.dag import DagReport, Stage, run_dag, topological_order  # noqa: E402
+
+
+def _sleep(seconds: float, value: str):
+    def stage(**inputs):
+        time.sleep(seconds)
+        return value + "".join(inputs[key] for key in sorted(inputs))
+
+    return stage
+
+
+def test_independent_stages_overlap_and_report_critical_path() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value: str):
+        def stage():
+            barrier.wait()
+            return value
+
+        return stage
+
+    stages = [
+        Stage("a", branch("a")),
+        Stage("b", branch("b")),
+        Stage("slow", _sleep(0.05, "s"), ("a",)),
+        Stage("join", _sleep(0.0, "j"), ("slow", "b")),
+    ]
+    report = DagReport()
+
+    results = run_dag(stages, max_workers=4, report=report)
+
+    assert results == {"a": "a", "b": "b", "slow": "sa", "join": "jbsa"}
+    assert report.critical_path[-2:] == ["slow", "join"]
+    assert report.critical_path_seconds >= 0.05
+
+
+def test_serial_mode_wraps_each_stage_in_order() -> None:
+    seen = []
+
+    class Context:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def __enter__(self) -> None:
+            seen.append(self.name)
+
+        def __exit__(self, *exc_info) -> None:
+            return None
+
+    stages = [Stage("late", _sleep(0, "l"), ("early",)), Stage("early", _sleep(0, "e"))]
+
+    assert run_dag(stages, max_workers=1, stage_context=Context)["late"] == "le"
+    assert seen == ["early", "late"]
+
+
+def test_invalid_graphs_and_failures_raise() -> None:
+    with pytest.raises(ValueError):
+        topological_order([Stage("a", _sleep(0, "a"), ("b",)), Stage("b", _sleep(0, "b"), ("a",))])
+    with pytest.raises(ValueError):
+        topological_order([Stage("a", _sleep(0, "a"), ("missing",))])
+
+    def boom() -> None:
+        raise RuntimeError("boom")
+
+    never_run = []
+    stages = [Stage("boom", boom), Stage("after", lambda boom: never_run.append(boom), ("boom",))]
+    with pytest.raises(RuntimeError, match="boom"):
+        run_dag(stages)
+    assert never_run == []
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+import pytest  # noqa: E402
+
+from seo_engine.diff.artifacts import diff_artifacts, diff_core_pages, diff_locations, write_diff  # noqa: E402
+from seo_engine.utils.json_stable import json_dump_stable, json_load  # noqa: E402
+from seo_engine.utils.jsonl import write_jsonl_artifact  # noqa: E402
+
+
+def _page(url: str, score: int = 0, label: str = "Other") -> dict:
+    return {"url": url, "label": label, "score": score}
+
+
+def test_sorted_merge_pairs_rescored_pages() -> None:
+    old = [_page("https://a.test/x", 5), _page("https://a.test/a"), _page("https://a.test/b")]
+    new = [_page("https://a.test/a"), _page("https://a.test/c"), _page("https://a.test/x", 1)]
+    new.sort(key=lambda page: (-page["score"], page["url"]))
+
+    diff = diff_core_pages(iter(old), iter(new))
+
+    assert diff["added"] == ["https://a.test/c"]
+    assert diff["removed"] == ["https://a.test/b"]
+    assert [entry["url"] for entry in diff["changed"]] == ["https://a.test/x"]
+    assert diff["unchanged_count"] == 1
+
+
+def test_same_name_locations_are_told_apart_by_address() -> None:
+    first = {"location_name": "Brand", "street": "1 Main Street", "postal": "10001", "full_address": "1 Main St"}
+    second = {"location_name": "Brand", "street": "9 Oak Ave", "postal": "10002", "full_address": "9 Oak Ave"}
+    renormalized = {**first, "street": "1 Main St.", "full_address": "1 Main St."}
+
+    diff = diff_locations([first, second], [renormalized])
+
+    assert diff["moved"] == []
+    assert diff["added"] == []
+    assert diff["removed"] == ["Brand — 9 Oak Ave"]
+
+
+def _keywords(*pairs: tuple) -> dict:
+    return {"keywords": [{"keyword": keyword, "position": position} for keyword, position in pairs]}
+
+
+def _write_run(artifacts_dir: Path, pages: list, keywords: dict, artifact_format: str = "json") -> None:
+    artifacts_dir.mkdir()
+    payloads = {
+        "core_pages.json": {"urls": pages},
+        "locations.json": {"locations": []},
+        "dish_taxonomy.json": {"dishes": {"categories": []}},
+        "keyword_positions.json": keywords,
+    }
+    for filename, payload in payloads.items():
+        if artifact_format == "jsonl":
+            write_jsonl_artifact(str(artifacts_dir / filename.replace(".json", ".jsonl")), filename, payload)
+        else:
+            json_dump_stable(payload, str(artifacts_dir / filename))
+
+
+def test_write_diff_reports_all_sections(tmp_path: Path) -> None:
+    old_dir = tmp_path / "old"
+    new_dir = tmp_path / "new"
+    old_dir.mkdir()
+    new_dir.mkdir()
+    json_dump_stable({"urls": [_page("https://a.test/menu", label="Menu")]}, str(old_dir / "core_pages.json"))
+    json_dump_stable({"urls": []}, str(new_dir / "core_pages.json"))
+    json_dump_stable(
+        {"locations": [{"location_name": "Downtown", "full_address": "1 Main St"}]},
+        str(old_dir / "locations.json"),
+    )
+    json_dump_stable(
+        {"locations": [{"location_name": "Downtown", "full_address": "2 Main St"}]},
+        str(new_dir / "locations.json"),
+    )
+    json_dump_stable({"dishes": {"categories": [{"category": "ribs", "count": 5}]}}, str(old_dir / "dish_taxonomy.json"))
+    json_dump_stable({"dishes": {"categories": [{"category": "ribs", "count": 7}]}}, str(new_dir / "dish_taxonomy.json"))
+    json_dump_stable(_keywords(("bbq", 8)), str(old_dir / "keyword_positions.json"))
+    json_dump_stable(_keywords(("bbq", 3)), str(new_dir / "keyword_positions.json"))
+
+    diff = json_load(write_diff(str(old_dir), str(new_dir), str(tmp_path / "out")))
+    summary = (tmp_path / "out" / "diff_summary.txt").read_text(encoding="utf-8")
+
+    assert diff["core_pages"]["removed"] == ["https://a.test/menu"]
+    assert diff["locations"]["moved"] == [
+        {"location_name": "Downtown", "before": "1 Main St", "after": "2 Main St"}
+    ]
+    assert diff["dish_categories"] == [{"category": "ribs", "before": 5, "after": 7, "delta": 2}]
+    assert diff["keywords"]["moved"] == [{"keyword": "bbq", "before": 8, "after": 3, "delta": 5}]
+    assert "ribs: 5 -> 7 (+2)" in summary
+
+
+def test_keyword_diff_covers_every_keyword(tmp_path: Path) -> None:
+    old = [(f"kw{index:03d}", index + 1) for index in range(40)]
+    new = [(keyword, position if keyword != "kw030" else 2) for keyword, position in old[1:]] + [("new kw", 9)]
+    new.sort()
+    _write_run(tmp_path / "old", [], _keywords(*old))
+    _write_run(tmp_path / "new", [], _keywords(*new))
+
+    keywords = diff_artifacts(str(tmp_path / "old"), str(tmp_path / "new"))["keywords"]
+
+    assert keywords["added"] == ["new kw"]
+    assert keywords["removed"] == ["kw000"]
+    assert keywords["moved"] == [{"keyword": "kw030", "before": 31, "after": 2, "delta": 29}]
+
+
+def test_jsonl_runs_are_diffed(tmp_path: Path) -> None:
+    _write_run(tmp_path / "old", [_page("https://a.test/menu")], _keywords(("bbq", 8)), "jsonl")
+    _write_run(tmp_path / "new", [], _keywords(("bbq", 3)), "jsonl")
+
+    diff = diff_artifacts(str(tmp_path / "old"), str(tmp_path / "new"))
+
+    assert diff["core_pages"]["removed"] == ["https://a.test/menu"]
+    assert diff["keywords"]["moved"] == [{"keyword": "bbq", "before": 8, "after": 3, "delta": 5}]
+
+
+def test_keywords_are_skipped_when_no_run_recorded_positions(tmp_path: Path) -> None:
+    for side in ("old", "new"):
+        _write_run(tmp_path / side, [], _keywords())
+        (tmp_path / side / "keyword_positions.json").unlink()
+
+    diff = json_load(write_diff(str(tmp_path / "old"), str(tmp_path / "new"), str(tmp_path / "out")))
+
+    assert diff["keywords"] is None
+    assert "Keyword Positions: not recorded" in (tmp_path / "out" / "diff_summary.txt").read_text(encoding="utf-8")
+
+
+def test_missing_artifact_is_an_error(tmp_path: Path) -> None:
+    _write_run(tmp_path / "old", [], _keywords())
+    _write_run(tmp_path / "new", [], _keywords())
+    (tmp_path / "new" / "core_pages.json").unlink()
+
+    with pytest.raises(ValueError, match="core_pages.json"):
+        diff_artifacts(str(tmp_path / "old"), str(tmp_path / "new"))
@@ -7,6 +7,7 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT_DIR))
 
 from seo_engine.select.dish_lexicon import CATEGORY_MAP  # noqa: E402
+from seo_engine.select.dish_state import build_dish_taxonomy_incremental, load_dish_state  # noqa: E402
 from seo_engine.select.dishes import (  # noqa: E402
     DishMappingAudit,
     build_dish_taxonomy,
@@ -58,3 +59,43 @@ def test_build_dish_taxonomy_counts_ribs_in_strict_mode() -> None:
     assert "award-winning-baby-back-ribs" not in [
         entry["category"] for entry in taxonomy["categories"]
     ]
+
+
+def test_incremental_taxonomy_matches_full_rebuild(tmp_path: Path) -> None:
+    state_path = str(tmp_path / "dish_state.json")
+    first = [
+        f"https://example.com/items/award-winning-baby-back-ribs-{index:06d}" for index in range(6)
+    ] + ["https://example.com/items/pepperoni"]
+    second = first[1:] + [
+        "https://example.com/items/smoked-ribs",
+        "https://example.com/items/greek",
+    ]
+
+    build_dish_taxonomy_incremental(first, state_path, verify=True)
+    taxonomy = build_dish_taxonomy_incremental(second, state_path, verify=True)
+    state = load_dish_state(state_path)
+
+    assert taxonomy == build_dish_taxonomy(second)
+    assert taxonomy["categories"] == [{"category": "ribs", "count": 6}]
+    assert sorted(state["items"]) == sorted(second)
+    assert state["last_delta"] == {"added": 2, "removed": 1}
+
+
+def test_batch_taxonomy_matches_scalar_path() -> None:
+    item_urls = [
+        f"https://example.com/items/award-winning-baby-back-ribs-{index:06d}"
+        for index in range(6)
+    ] + [
+        "HTTP://example.com/items/mains/Smoked-Ribs-A1B2C3D4/",
+        "https://example.com/items/ahi-tuna-guacamole-047843dd?ref=menu",
+        "https://example.com/items/pepperoni;v=2",
+        "https://example.com/menu/items/",
+        "https://[::1]/items/ribs",
+        " https://example.com/items/crispy-wings\n",
+        "https://example.com/items/signature-cocktail#top",
+    ]
+
+    scalar = build_dish_taxonomy(item_urls, batch=False, min_count=1)
+
+    assert build_dish_taxonomy(item_urls, batch=True, min_count=1) == scalar
+    assert scalar["categories"] == [{"category": "ribs", "count": 8}]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.pipeline import run_pipeline  # noqa: E402
+from seo_engine.utils.external_sort import external_sort  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _order(record: dict) -> tuple:
+    return (-record["score"], record["url"])
+
+
+def test_external_sort_matches_stable_sorted(tmp_path: Path) -> None:
+    rng = random.Random(7)
+    records = [{"url": f"u{rng.randrange(50)}", "score": rng.randrange(3), "seq": index} for index in range(1000)]
+
+    runs = external_sort(iter(records), key=_order, spill_dir=str(tmp_path), run_size=64)
+
+    assert len(runs.paths) == 16
+    assert len(runs) == 1000
+    assert list(runs) == sorted(records, key=_order)
+    assert list(runs) == list(runs)
+    runs.remove()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("artifact_format", ["json", "jsonl"])
+def test_spilled_core_pages_match_in_memory_artifacts(tmp_path: Path, artifact_format: str) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    outputs = {}
+    for name, threshold in (("memory", None), ("spilled", 2)):
+        outputs[name] = Path(
+            run_pipeline(
+                sitemap_xml,
+                [],
+                str(tmp_path / name),
+                sqlite_artifacts=True,
+                artifact_format=artifact_format,
+                core_pages_sort_threshold=threshold,
+            )
+        )
+
+    assert not (tmp_path / "spilled" / "spill").exists()
+    for path in sorted(outputs["memory"].iterdir()):
+        assert (outputs["spilled"] / path.name).read_bytes() == path.read_bytes(), path.name
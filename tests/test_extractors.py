@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import bs4
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from pipeline import run_pipeline  # noqa: E402
+from seo_engine.extract import registry  # noqa: E402
+from seo_engine.extract.registry import Extractor, extract_document, register_extractor  # noqa: E402
+from seo_engine.utils.json_stable import json_load  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@register_extractor
+class _LinkCounter(Extractor):
+    name = "test_link_counter"
+    artifact = "links.json"
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def start(self, tag) -> None:
+        self.count += tag.name == "a"
+
+    def result(self) -> int:
+        return self.count
+
+
+def _count_parses(monkeypatch) -> list:
+    parses = []
+    original = bs4.BeautifulSoup
+
+    def counting(*args, **kwargs):
+        parses.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(bs4, "BeautifulSoup", counting)
+    return parses
+
+
+def test_extractors_share_one_parse(monkeypatch) -> None:
+    parses = _count_parses(monkeypatch)
+    html = (FIXTURES_DIR / "sample_location.html").read_bytes()
+
+    results = extract_document(html, ("locations", "page_meta", "test_link_counter"))
+
+    assert len(parses) == 1
+    assert results["locations"][0]["location_name"] == "Downtown"
+    assert results["page_meta"]["title"] == "Locations"
+    assert results["page_meta"]["lang"] == "en"
+    assert results["test_link_counter"] >= 2
+
+
+def test_jsonld_prescan_skips_the_parse(monkeypatch) -> None:
+    parses = _count_parses(monkeypatch)
+    html = (FIXTURES_DIR / "sample_location_jsonld.html").read_bytes()
+
+    assert extract_document(html, ("locations",))["locations"]
+    assert parses == []
+
+
+def test_pipeline_routes_page_meta_to_its_artifact(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html = (FIXTURES_DIR / "sample_location.html").read_bytes()
+
+    artifacts_dir = Path(run_pipeline(sitemap_xml, [html], str(tmp_path), extractors=("page_meta",)))
+
+    pages = json_load(str(artifacts_dir / "page_meta.json"))["pages"]
+    assert [(page["source"], page["title"]) for page in pages] == [("html[0]", "Locations")]
+    assert json_load(str(artifacts_dir / "locations.json"))["locations"]
+
+
+def test_pipeline_routes_registered_extractors_by_artifact(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html = (FIXTURES_DIR / "sample_location.html").read_bytes()
+
+    artifacts_dir = Path(
+        run_pipeline(
+            sitemap_xml,
+            [html],
+            str(tmp_path),
+            extractors=("test_link_counter",),
+            sqlite_artifacts=True,
+            max_workers=1,
+        )
+    )
+
+    pages = json_load(str(artifacts_dir / "links.json"))["pages"]
+    assert [page["source"] for page in pages] == ["html[0]"]
+    assert pages[0]["result"] >= 2
+    assert not (artifacts_dir / "page_meta.json").exists()
+
+
+def test_extractors_must_implement_result() -> None:
+    class Incomplete(Extractor):
+        name = "test_incomplete"
+        artifact = "incomplete.json"
+
+    with pytest.raises(TypeError):
+        Incomplete()
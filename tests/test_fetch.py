@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from pipeline import run_pipeline  # noqa: E402
+from seo_engine.ingest.fetch import FetchCache, FetchConfig, FetchSession, fetch_pages  # noqa: E402
+from seo_engine.pipeline import _locations_stage  # noqa: E402
+from seo_engine.select.core_pages import CORE_KEYWORDS  # noqa: E402
+from seo_engine.utils.json_stable import json_load  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+LOCATION_HTML = (FIXTURES_DIR / "sample_location.html").read_bytes()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: dict = {}
+    peers: set = set()
+    requested_during_slow = 0
+
+    def log_message(self, *args) -> None:
+        return None
+
+    def _send(self, status: int, body: bytes = b"", **headers: str) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        hits = _Handler.hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+        _Handler.peers.add(self.client_address)
+        if self.path == "/locations/downtown":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, ETag='"v1"')
+            else:
+                self._send(200, LOCATION_HTML, ETag='"v1"', Content_Type="text/html")
+        elif self.path == "/locations/flaky" and hits[self.path] == 1:
+            self._send(503, b"busy", Retry_After="0")
+        elif self.path == "/locations/flaky":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"<html><body>", b"flaky</body></html>"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/slow":
+            time.sleep(0.3)
+            _Handler.requested_during_slow = len(hits)
+            self._send(200, b"slow")
+        elif self.path == "/old":
+            self._send(301, Location="/locations/downtown")
+        else:
+            self._send(404, b"missing")
+
+
+@pytest.fixture()
+def server() -> Iterator[str]:
+    _Handler.hits = {}
+    _Handler.peers = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _config() -> FetchConfig:
+    return FetchConfig(requests_per_second=None, backoff=0.01, max_connections_per_host=2, timeout=5)
+
+
+def test_fetch_retries_decodes_chunks_and_revalidates(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/locations/downtown", f"{server}/locations/flaky", f"{server}/nope", f"{server}/old"]
+    cache_dir = str(tmp_path / "cache")
+
+    first = fetch_pages(urls, config=_config(), cache_dir=cache_dir)
+
+    assert [result.url for result in first] == urls
+    assert first[0].ok and first[0].body == LOCATION_HTML
+    assert first[1].ok and first[1].body == b"<html><body>flaky</body></html>" and first[1].attempts == 2
+    assert not first[2].ok and first[2].error == "HTTP 404"
+    assert first[3].ok and first[3].final_url == urls[0]
+    assert len(_Handler.peers) <= 2
+
+    second = fetch_pages(urls[:1], config=_config(), cache_dir=cache_dir)
+
+    assert second[0].from_cache and second[0].status == 304
+    assert second[0].body == LOCATION_HTML
+
+
+def test_slow_url_bounds_results_waiting_behind_it(server: str) -> None:
+    urls = [f"{server}/slow"] + [f"{server}/nope/{index}" for index in range(20)]
+    config = FetchConfig(requests_per_second=None, max_concurrency=16, max_pending=4, timeout=5)
+
+    with FetchSession(config) as session:
+        results = list(session.iter_pages(urls))
+
+    assert [result.url for result in results] == urls
+    assert _Handler.requested_during_slow <= 4
+
+
+def test_cache_saves_from_concurrent_runs_merge(tmp_path: Path) -> None:
+    first = FetchCache(str(tmp_path))
+    second = FetchCache(str(tmp_path))
+    first.store("https://a.test/", {"etag": '"a"'}, b"a")
+    second.store("https://b.test/", {"etag": '"b"'}, b"b")
+
+    first.save()
+    second.save()
+
+    assert sorted(FetchCache(str(tmp_path)).index) == ["https://a.test/", "https://b.test/"]
+    assert len(list((tmp_path / "bodies").iterdir())) == 2
+
+
+def test_location_batches_share_one_fetch_session(server: str) -> None:
+    label = CORE_KEYWORDS["/locations"]
+    core_pages = [{"url": f"{server}/locations/downtown", "label": label} for _ in range(5)]
+
+    result = _locations_stage([], core_pages=core_pages, fetch_config=_config(), batch_size=1)
+
+    assert [entry["status"] for entry in result["fetched"]] == [200] * 5
+    assert len(_Handler.peers) <= 2
+
+
+def test_pipeline_fetches_location_pages(server: str, tmp_path: Path) -> None:
+    sitemap_xml = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<url><loc>{server}/locations/downtown</loc></url>"
+        f"<url><loc>{server}/menu</loc></url>"
+        "</urlset>"
+    ).encode("utf-8")
+
+    artifacts_dir = run_pipeline(sitemap_xml, [], str(tmp_path), fetch_locations=True, fetch_config=_config())
+
+    payload = json_load(str(Path(artifacts_dir) / "locations.json"))
+    assert payload["locations"]
+    assert [entry["status"] for entry in payload["fetched"]] == [200]
+    assert "/menu" not in _Handler.hits
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.pipeline import run_pipeline  # noqa: E402
+from seo_engine.store.generations import (  # noqa: E402
+    current_generation,
+    list_generations,
+    new_staging_dir,
+    publish_generation,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _run(out_dir: Path, **kwargs) -> Path:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html_files = [(FIXTURES_DIR / "sample_location.html").read_bytes()]
+    return Path(run_pipeline(sitemap_xml, html_files, str(out_dir), max_workers=1, **kwargs))
+
+
+def test_runs_publish_generations_and_prune_old_ones(tmp_path: Path) -> None:
+    legacy = tmp_path / "artifacts"
+    legacy.mkdir()
+    (legacy / "core_pages.json").write_text("{}\n", encoding="utf-8")
+
+    first = _run(tmp_path, keep_generations=2)
+    second = _run(tmp_path, keep_generations=2)
+
+    link = tmp_path / "artifacts"
+    assert link.is_symlink()
+    assert os.path.realpath(link) == str(second)
+    assert current_generation(str(tmp_path)) == second.name
+    assert list_generations(str(tmp_path)) == [first.name, second.name]
+    assert (first / "core_pages.json").read_bytes() == (second / "core_pages.json").read_bytes()
+
+    third = _run(tmp_path, keep_generations=2)
+
+    assert list_generations(str(tmp_path)) == [second.name, third.name]
+    assert not first.exists()
+    assert sorted(name for name in os.listdir(tmp_path / "generations") if name.startswith(".")) == []
+
+
+def test_late_publish_keeps_newer_generations_and_its_own(tmp_path: Path) -> None:
+    older = new_staging_dir(str(tmp_path))
+    newer = new_staging_dir(str(tmp_path))
+
+    newer_dir = publish_generation(str(tmp_path), newer, keep=1)
+    older_dir = publish_generation(str(tmp_path), older, keep=1)
+
+    assert current_generation(str(tmp_path)) == os.path.basename(newer_dir)
+    assert list_generations(str(tmp_path)) == [os.path.basename(older_dir), os.path.basename(newer_dir)]
+
+
+def test_concurrent_runs_on_one_out_dir_publish_complete_sets(tmp_path: Path) -> None:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        published = list(pool.map(lambda _: _run(tmp_path, keep_generations=4), range(4)))
+
+    expected = sorted(path.name for path in published[0].iterdir())
+    for generation in published:
+        assert sorted(path.name for path in generation.iterdir()) == expected
+    current = Path(os.path.realpath(tmp_path / "artifacts"))
+    assert current.name == max(path.name for path in published)
+    assert sorted(path.name for path in current.iterdir()) == expected
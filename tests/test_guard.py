@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from pipeline import run_pipeline  # noqa: E402
+from seo_engine.utils.guard import (  # noqa: E402
+    SKIP_PARSE_ERROR,
+    SKIP_TIMEOUT,
+    SKIP_TOO_LARGE,
+    SKIP_TOO_MANY_ELEMENTS,
+    GuardedRunner,
+    ResourceLimits,
+    count_elements,
+)
+from seo_engine.utils.json_stable import json_load  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _parse(data: bytes) -> int:
+    if data == b"hang":
+        while True:
+            time.sleep(0.01)
+    if data == b"bad":
+        raise ValueError("unparseable")
+    return len(data)
+
+
+def test_guard_skips_and_recovers_from_overruns(tmp_path: Path) -> None:
+    limits = ResourceLimits(max_bytes=64, max_seconds=0.5, max_elements=3)
+    quarantine = tmp_path / "quarantine"
+
+    with GuardedRunner(limits, quarantine_dir=str(quarantine), suffix=".html") as guard:
+        assert guard.run(_parse, b"<p>ok</p>") == (9, None)
+        assert guard.run(_parse, b"x" * 65, source="big")[1] == SKIP_TOO_LARGE
+        assert guard.run(_parse, b"<a><b><c><d>")[1] == SKIP_TOO_MANY_ELEMENTS
+        started = time.perf_counter()
+        assert guard.run(_parse, b"hang")[1] == SKIP_TIMEOUT
+        assert time.perf_counter() - started < 5
+        assert guard.run(_parse, b"bad")[1].startswith(SKIP_PARSE_ERROR)
+        assert guard.run(_parse, b"<p>again</p>") == (12, None)
+
+    reasons = [record["reason"].split(":")[1] for record in guard.skipped]
+    assert reasons == ["too_many_bytes", "too_many_elements", "timeout", "parse_error"]
+    assert guard.skipped[0]["source"] == "big"
+    assert sorted(path.name for path in quarantine.iterdir()) == sorted(
+        record["quarantined"] for record in guard.skipped
+    )
+
+
+def test_element_count_stops_past_the_limit() -> None:
+    assert count_elements(b"<p>" * 100) == 100
+    assert count_elements(memoryview(b"<p>" * 100), 3) == 4
+    assert count_elements(b"<p>" * 2, 3) == 2
+
+
+def test_pipeline_records_skipped_documents(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html = (FIXTURES_DIR / "sample_location.html").read_bytes()
+    limits = ResourceLimits(max_elements=5000)
+
+    artifacts_dir = Path(
+        run_pipeline(sitemap_xml, [html, b"<div>" * 6000], str(tmp_path), limits=limits)
+    )
+
+    locations = json_load(str(artifacts_dir / "locations.json"))
+    assert locations["locations"]
+    assert [(record["source"], record["reason"]) for record in locations["skipped"]] == [
+        ("html[1]", SKIP_TOO_MANY_ELEMENTS)
+    ]
+    assert (tmp_path / "quarantine" / locations["skipped"][0]["quarantined"]).exists()
+    assert json_load(str(artifacts_dir / "site_facts.json"))["skipped"] == []
+
+
+def test_process_stages_with_guard_finish(tmp_path: Path) -> None:
+    # Run in a child so a deadlocked worker fails the test instead of hanging it.
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from pathlib import Path;"
+        "from pipeline import run_pipeline;"
+        "from seo_engine.utils.guard import ResourceLimits;"
+        "fixtures = Path(sys.argv[1]) / 'tests' / 'fixtures';"
+        "print(run_pipeline((fixtures / 'sample_sitemap.xml').read_bytes(),"
+        " [(fixtures / 'sample_location.html').read_bytes()] * 2, sys.argv[2],"
+        " use_processes=True, limits=ResourceLimits()))"
+    )
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script, str(ROOT_DIR), str(tmp_path)],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    artifacts_dir = Path(completed.stdout.strip())
+    assert json_load(str(artifacts_dir / "locations.json"))["locations"]
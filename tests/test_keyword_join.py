@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.ingest.ahrefs import iter_keyword_rows  # noqa: E402
+from seo_engine.pipeline import run_pipeline  # noqa: E402
+from seo_engine.select.keyword_join import join_keywords  # noqa: E402
+from seo_engine.utils.json_stable import json_load  # noqa: E402
+
+CSV = (
+    "Keyword,Volume,Position,URL\n"
+    "bbq near me,900,4,https://example.com/menu/\n"
+    "bbq menu,300,2,http://EXAMPLE.com/menu?utm_source=x\n"
+    "ribs,500,7,https://example.com/items/mains/award-winning-baby-back-ribs\n"
+    "baby back ribs,100,,https://example.com/items/mains/baby-back-ribs\n"
+    "jobs,50,12,https://example.com/careers\n"
+)
+
+CORE_PAGES = [
+    {"url": "https://example.com/menu", "label": "Menu"},
+    {"url": "https://example.com/about", "label": "About"},
+]
+ITEM_URLS = [
+    "https://example.com/items/mains/award-winning-baby-back-ribs",
+    "https://example.com/items/mains/baby-back-ribs",
+]
+
+
+def test_join_aggregates_per_page_and_dish_category() -> None:
+    result = join_keywords(iter_keyword_rows(CSV.encode("utf-8")), CORE_PAGES, ITEM_URLS)
+
+    assert result["rows"] == 5
+    assert result["page_scores"] == [
+        {"url": "https://example.com/menu", "volume": 1200, "keywords": 2, "best_position": 2}
+    ]
+    assert result["dish_scores"] == [
+        {"category": "ribs", "volume": 600, "keywords": 2, "best_position": 7}
+    ]
+    assert result["unmatched"] == {"volume": 50, "keywords": 1, "best_position": 12}
+    assert "keywords" not in result
+
+
+def test_keyword_positions_are_spilled_and_keep_each_best_row(tmp_path: Path) -> None:
+    csv = CSV + "ribs,40,3,https://example.com/items/smoked-ribs\nribs,10,,https://example.com/\n"
+
+    result = join_keywords(
+        iter_keyword_rows(csv.encode("utf-8")),
+        CORE_PAGES,
+        ITEM_URLS,
+        positions_spill_dir=str(tmp_path / "spill"),
+        positions_run_size=2,
+    )
+
+    assert len(list((tmp_path / "spill").iterdir())) == 4
+    positions = list(result["keywords"])
+    assert positions == list(result["keywords"])
+    assert [(row["keyword"], row["position"]) for row in positions] == [
+        ("baby back ribs", None),
+        ("bbq menu", 2),
+        ("bbq near me", 4),
+        ("jobs", 12),
+        ("ribs", 3),
+    ]
+
+
+@pytest.mark.parametrize("keyword_positions", [False, True])
+def test_keyword_positions_artifact_is_opt_in(tmp_path: Path, keyword_positions: bool) -> None:
+    sitemap_xml = (ROOT_DIR / "tests" / "fixtures" / "sample_sitemap.xml").read_bytes()
+
+    artifacts_dir = Path(
+        run_pipeline(
+            sitemap_xml,
+            [],
+            str(tmp_path),
+            keyword_csv=CSV.encode("utf-8"),
+            keyword_positions=keyword_positions,
+        )
+    )
+
+    assert (artifacts_dir / "keyword_positions.json").exists() == keyword_positions
+    assert "keywords" not in json_load(str(artifacts_dir / "keyword_scores.json"))
+    if keyword_positions:
+        keywords = json_load(str(artifacts_dir / "keyword_positions.json"))["keywords"]
+        assert [row["keyword"] for row in keywords] == ["baby back ribs", "bbq menu", "bbq near me", "jobs", "ribs"]
+    assert not (tmp_path / "spill").exists()
+
+
+def test_keyword_rows_stream_utf16_tab_exports() -> None:
+    data = CSV.replace(",", "\t").encode("utf-16")
+
+    rows = list(iter_keyword_rows(data))
+
+    assert len(rows) == 5
+    assert rows[0] == {
+        "keyword": "bbq near me",
+        "volume": 900,
+        "position": 4,
+        "url": "https://example.com/menu/",
+    }
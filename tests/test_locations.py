@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sys
+import copy
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.extract.dedupe import (  # noqa: E402
+    LocationDedupeAudit,
+    dedupe_locations,
+    normalize_phone,
+    normalize_street,
+)
+from seo_engine.extract.locations import extract_locations  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _location(name: str, street: str, postal: str, phone: str = "") -> dict:
+    return {
+        "location_name": name,
+        "street": street,
+        "city_state_zip": f"Metropolis, NY {postal}",
+        "city": "Metropolis",
+        "region": "NY",
+        "postal": postal,
+        "full_address": f"{street}, Metropolis, NY {postal}",
+        "confidence": "high",
+        "phone": phone,
+        "email": "",
+    }
+
+
+def test_street_and_phone_normalization() -> None:
+    assert normalize_street("123 Main St.") == normalize_street("123 main street")
+    assert normalize_street("9 Elm Ave #4") == "9 elm ave unit 4"
+    assert normalize_phone("+1 (123) 456-7890") == "1234567890"
+
+
+def test_suffix_variants_merge_with_recorded_reason() -> None:
+    audit = LocationDedupeAudit()
+    locations = [
+        _location("Downtown", "123 Main St.", "10001"),
+        _location("Downtown Store", "123 Main Street", "10001", phone="(123) 456-7890"),
+    ]
+
+    kept = dedupe_locations(locations, audit=audit)
+
+    assert len(kept) == 1
+    assert kept[0]["location_name"] == "Downtown"
+    assert kept[0]["phone"] == "(123) 456-7890"
+    assert [decision["reason"] for decision in audit.decisions] == ["normalized_address"]
+
+
+def test_dedupe_leaves_its_inputs_unchanged() -> None:
+    locations = [
+        _location("Downtown", "123 Main St.", "10001"),
+        _location("Downtown Store", "123 Main Street", "10001", phone="(123) 456-7890"),
+        {**_location("Downtown", "123 Main St", "10001"), "email": "hi@example.com"},
+    ]
+    before = copy.deepcopy(locations)
+
+    kept = dedupe_locations(locations)
+
+    assert locations == before
+    assert kept[0]["phone"] == "(123) 456-7890"
+    assert kept[0]["email"] == "hi@example.com"
+
+
+def test_fuzzy_match_only_within_bucket() -> None:
+    audit = LocationDedupeAudit()
+    locations = [
+        _location("A", "500 Market Street", "10001"),
+        _location("B", "500 Markett Street", "10001"),
+        _location("C", "500 Market Street", "20002"),
+        _location("D", "501 Market Street", "10001"),
+    ]
+
+    kept = dedupe_locations(locations, audit=audit)
+
+    assert [location["location_name"] for location in kept] == ["A", "C", "D"]
+    assert audit.decisions[0]["reason"] == "fuzzy_address"
+    assert audit.decisions[0]["score"] >= 0.9
+
+
+def test_units_and_directionals_must_match_exactly() -> None:
+    audit = LocationDedupeAudit()
+    locations = [
+        _location("Suite 4", "123 Main St Suite 4", "10001"),
+        _location("Suite 5", "123 Main St Suite 5", "10001"),
+        _location("North", "100 N Main St", "10001"),
+        _location("South", "100 S Main St", "10001"),
+        _location("North Typo", "100 North Mainn St", "10001"),
+    ]
+
+    kept = dedupe_locations(locations, audit=audit)
+
+    assert [location["location_name"] for location in kept] == ["Suite 4", "Suite 5", "North", "South"]
+    assert [(decision["merged"]["location_name"], decision["reason"]) for decision in audit.decisions] == [
+        ("North Typo", "fuzzy_address")
+    ]
+
+
+def test_exact_duplicates_across_pages_are_recorded() -> None:
+    html_files = [
+        (FIXTURES_DIR / "sample_location.html").read_bytes(),
+        (FIXTURES_DIR / "sample_location_duplicate.html").read_bytes(),
+    ]
+    audit = LocationDedupeAudit()
+
+    locations = extract_locations(html_files, audit=audit)
+
+    assert len(locations) == 1
+    assert audit.decisions[0]["reason"] == "exact"
+
+
+def test_jsonld_fast_path_skips_dom_markup() -> None:
+    html = (FIXTURES_DIR / "sample_location_jsonld.html").read_bytes()
+
+    locations = extract_locations([html])
+
+    assert locations == [
+        {
+            "location_name": "Harbor",
+            "street": "1 Pier Rd.",
+            "city_state_zip": "Metropolis, NY 10003",
+            "city": "Metropolis",
+            "region": "NY",
+            "postal": "10003",
+            "full_address": "1 Pier Rd., Metropolis, NY 10003",
+            "confidence": "high",
+            "phone": "(123) 555-0100",
+            "email": "harbor@example.com",
+        }
+    ]
+
+
+def test_pages_without_jsonld_use_dom_pattern() -> None:
+    html = (FIXTURES_DIR / "sample_location.html").read_bytes()
+
+    locations = extract_locations([html])
+
+    assert [location["location_name"] for location in locations] == ["Downtown"]
+    assert locations[0]["confidence"] == "high"
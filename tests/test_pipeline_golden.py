@@ -9,7 +9,10 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT_DIR))
 
 from pipeline import run_pipeline  # noqa: E402
+from seo_engine.schemas import split_record_sections  # noqa: E402
+from seo_engine.store.sqlite_sink import SqliteArtifacts, export_json_artifacts  # noqa: E402
 from seo_engine.utils.json_stable import json_dump_stable, json_load  # noqa: E402
+from seo_engine.utils.jsonl import iter_jsonl_records, load_jsonl_artifact  # noqa: E402
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 GOLDEN_DIR = Path(__file__).parent / "golden"
@@ -87,3 +90,57 @@ def test_pipeline_dedupes_duplicate_locations(tmp_path: Path) -> None:
 
     locations = payload.get("locations", [])
     assert len(locations) == 1
+
+
+def test_sqlite_sink_round_trips_json_artifacts(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html_files = [(FIXTURES_DIR / "sample_locations_multi.html").read_bytes()]
+    artifacts_dir = Path(
+        run_pipeline(sitemap_xml, html_files, str(tmp_path / "run"), sqlite_artifacts=True)
+    )
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+
+    exported = export_json_artifacts(str(artifacts_dir / "artifacts.sqlite"), str(export_dir))
+
+    assert len(exported) == 6
+    for path in exported:
+        name = Path(path).name
+        assert Path(path).read_bytes() == (artifacts_dir / name).read_bytes()
+    with SqliteArtifacts(str(artifacts_dir / "artifacts.sqlite")) as sink:
+        assert sink.core_page("https://example.com/menu") == {
+            "label": "Menu",
+            "url": "https://example.com/menu",
+        }
+        assert [location["location_name"] for location in sink.iter_records("locations", postal="10001")] == [
+            "Downtown"
+        ]
+
+
+def test_jsonl_artifacts_match_json_payloads(tmp_path: Path) -> None:
+    sitemap_xml = (FIXTURES_DIR / "sample_sitemap.xml").read_bytes()
+    html_files = [(FIXTURES_DIR / "sample_locations_multi.html").read_bytes()]
+    json_dir = Path(run_pipeline(sitemap_xml, html_files, str(tmp_path / "json")))
+    jsonl_dir = Path(
+        run_pipeline(sitemap_xml, html_files, str(tmp_path / "jsonl"), artifact_format="jsonl")
+    )
+
+    for name in ("core_pages", "locations", "dish_taxonomy", "ahrefs_summary", "site_facts"):
+        expected = _load_json(json_dir / f"{name}.json")
+        assert load_jsonl_artifact(str(jsonl_dir / f"{name}.jsonl")) == expected
+    urls = [record["url"] for _, record in iter_jsonl_records(str(jsonl_dir / "core_pages.jsonl"), "urls")]
+    assert urls == [page["url"] for page in _load_json(json_dir / "core_pages.json")["urls"]]
+
+
+def test_split_record_sections_shares_records_and_keeps_payload() -> None:
+    categories = [{"category": "ribs", "count": 5}]
+    mapped = ["ribs"]
+    payload = {"dishes": {"audit": {"mapped": mapped, "total": 1}, "categories": categories}, "site": "x"}
+
+    skeleton, sections = split_record_sections("dish_taxonomy.json", payload)
+
+    assert skeleton == {"dishes": {"audit": {"total": 1}}, "site": "x"}
+    assert dict(sections)[("dishes", "categories")] is categories
+    assert dict(sections)[("dishes", "audit", "mapped")] is mapped
+    assert payload["dishes"]["audit"]["mapped"] is mapped
+    assert payload["dishes"]["categories"] is categories
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.service import IntakeService, make_server  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _request(url: str, payload: dict | None = None) -> tuple[int, dict, bytes]:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), exc.read()
+
+
+def _wait(base: str, job_id: str) -> str:
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        status = json.loads(_request(f"{base}/jobs/{job_id}")[2])["status"]
+        if status not in ("queued", "running"):
+            break
+        time.sleep(0.05)
+    return status
+
+
+def test_service_runs_jobs_and_applies_backpressure(tmp_path: Path) -> None:
+    service = IntakeService(str(tmp_path), workers=1, queue_size=1, retain_jobs=1)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    shutil.copy(FIXTURES_DIR / "sample_sitemap.xml", tmp_path / "inputs" / "sitemap.xml")
+    payload = {
+        "sitemap": {"path": "sitemap.xml"},
+        "html": [{"content_b64": base64.b64encode((FIXTURES_DIR / "sample_location.html").read_bytes()).decode()}],
+        "options": {"extractors": ["page_meta"]},
+    }
+    try:
+        responses = [_request(f"{base}/jobs", payload) for _ in range(4)]
+        accepted = [json.loads(body)["job_id"] for status, _, body in responses if status == 202]
+        rejected = [headers for status, headers, _ in responses if status == 503]
+        assert accepted and rejected
+        assert all(headers["Retry-After"] for headers in rejected)
+        assert sorted(path.name for path in (tmp_path / "jobs").iterdir()) == sorted(accepted)
+
+        job_id = accepted[0]
+        assert _wait(base, job_id) == "succeeded"
+
+        names = json.loads(_request(f"{base}/jobs/{job_id}/artifacts")[2])["artifacts"]
+        assert {"locations.json", "page_meta.json", "clipboard_package.txt"} <= set(names)
+        locations = json.loads(_request(f"{base}/jobs/{job_id}/artifacts/locations.json")[2])
+        assert locations["locations"][0]["location_name"] == "Downtown"
+        assert _request(f"{base}/jobs/{job_id}/artifacts/..%2Fsecret")[0] == 404
+
+        assert _request(f"{base}/jobs", {"options": {}})[0] == 400
+        outside = str(FIXTURES_DIR / "sample_sitemap.xml")
+        assert _request(f"{base}/jobs", {"sitemap": {"path": outside}})[0] == 400
+        assert _request(f"{base}/jobs", {"sitemap": {"path": "../inputs/../../x"}})[0] == 400
+        escape = {"sitemap": {"path": "sitemap.xml"}, "options": {"dish_state_path": "../dish.json"}}
+        assert _request(f"{base}/jobs", escape)[0] == 400
+        assert not (tmp_path / "dish.json").exists()
+        metrics = json.loads(_request(f"{base}/metrics")[2])
+        assert metrics["jobs"]["rejected"] == len(rejected)
+        assert metrics["queue_capacity"] == 1
+        assert metrics["run_seconds"]["p50"] is not None
+
+        for earlier in accepted:
+            _wait(base, earlier)
+        guarded = json.loads(_request(f"{base}/jobs", {**payload, "options": {"guard": True}})[2])["job_id"]
+        assert _wait(base, guarded) == "succeeded"
+        assert [path.name for path in (tmp_path / "jobs").iterdir()] == [guarded]
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_service_replaces_a_pool_whose_worker_died(tmp_path: Path) -> None:
+    service = IntakeService(str(tmp_path), workers=1, queue_size=2)
+    shutil.copy(FIXTURES_DIR / "sample_sitemap.xml", tmp_path / "inputs" / "sitemap.xml")
+    payload = {"sitemap": {"path": "sitemap.xml"}, "options": {"extractors": ["page_meta"]}}
+    try:
+        broken = service._pool
+        for pid in list(broken._processes):
+            os.kill(pid, signal.SIGKILL)
+        deadline = time.time() + 10
+        while not broken._broken and time.time() < deadline:
+            time.sleep(0.01)
+        assert broken._broken
+
+        for _ in range(2):
+            job, _ = service.submit(payload)
+            deadline = time.time() + 60
+            while job.status in ("queued", "running") and time.time() < deadline:
+                time.sleep(0.05)
+            assert job.status == "succeeded", job.error
+        assert service._pool is not broken
+    finally:
+        service.close()
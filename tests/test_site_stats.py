@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.ingest.site_stats import MAX_TRACKED_KEYS, OTHER_KEY, SiteStats  # noqa: E402
+from seo_engine.ingest.sitemap import parse_sitemap_entries  # noqa: E402
+from seo_engine.utils.sketches import HyperLogLog, SpaceSaving  # noqa: E402
+
+
+def test_hyperloglog_estimates_within_error_bounds() -> None:
+    sketch = HyperLogLog(precision=12)
+    for index in range(50000):
+        sketch.add(f"slug-{index}")
+        sketch.add(f"slug-{index % 100}")
+
+    assert abs(sketch.count() - 50000) / 50000 < 0.05
+
+    small = HyperLogLog()
+    for value in ["a", "b", "c", "a"]:
+        small.add(value)
+    assert small.count() == 3
+
+
+def test_space_saving_keeps_heavy_hitters() -> None:
+    sketch = SpaceSaving(capacity=8)
+    for index in range(5000):
+        sketch.add("/menu" if index % 3 == 0 else f"/noise/{index}")
+        if index % 5 == 0:
+            sketch.add("/items")
+
+    top = sketch.top(2)
+    assert [item for item, _, _ in top] == ["/menu", "/items"]
+    item, count, error = top[0]
+    assert count - error <= 1667 <= count
+    assert len(sketch.counts) == 8
+
+
+def test_sitemap_pass_fills_site_stats() -> None:
+    urls = "".join(
+        f"<url><loc>https://{host}/items/{section}/dish-{index}</loc></url>"
+        for index in range(300)
+        for host, section in (("a.test", "pizza"), ("b.test", "soup"))
+    )
+    stats = SiteStats()
+
+    entries, _ = parse_sitemap_entries(f"<urlset>{urls}<url><loc>https://a.test/</loc></url></urlset>".encode(), stats=stats)
+
+    facts = stats.to_dict()
+    assert facts["url_count"] == len(entries) == 601
+    assert facts["domain"] == "a.test" and facts["domains"] == ["a.test", "b.test"]
+    assert facts["urls_per_section"] == {"/items": 600, "/": 1}
+    assert facts["depth_histogram"] == {"0": 1, "3": 600}
+    assert abs(facts["distinct_slugs_estimate"] - 300) <= 15
+    assert facts["top_path_prefixes"][0] == {"prefix": "/items", "count": 600, "error": 0}
+
+
+def test_exact_counters_are_capped() -> None:
+    stats = SiteStats()
+    for index in range(MAX_TRACKED_KEYS + 10):
+        stats.add(f"https://a.test/section-{index}/page")
+
+    sections = stats.to_dict()["urls_per_section"]
+    assert len(sections) == MAX_TRACKED_KEYS + 1
+    assert sections[OTHER_KEY] == 10
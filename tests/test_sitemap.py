@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.ingest.canonical import (  # noqa: E402
+    FingerprintSet,
+    UrlCanonicalizer,
+    canonicalize_url,
+)
+from seo_engine.ingest.sitemap import parse_sitemap  # noqa: E402
+
+
+def _sitemap(*locs: str) -> bytes:
+    entries = "".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+    ).encode("utf-8")
+
+
+def test_canonicalize_url_variants() -> None:
+    assert canonicalize_url("HTTPS://Example.COM:443/Menu/") == "https://example.com/Menu"
+    assert canonicalize_url("http://example.com:8080") == "http://example.com:8080/"
+    assert (
+        canonicalize_url("https://example.com/menu?utm_source=x&page=2&gclid=abc#top")
+        == "https://example.com/menu?page=2"
+    )
+    assert (
+        canonicalize_url("https://e.com/p?q=a%20b&utm_source=x")
+        == canonicalize_url("https://e.com/p?q=a%20b")
+        == "https://e.com/p?q=a%20b"
+    )
+    assert canonicalize_url("https://e.com/p?UTM%5FSOURCE=x&sort=a+b&empty=") == "https://e.com/p?sort=a+b&empty="
+
+
+def test_parse_sitemap_drops_duplicates_across_children() -> None:
+    canonicalizer = UrlCanonicalizer()
+
+    first, _ = parse_sitemap(
+        _sitemap("https://example.com/menu", "https://EXAMPLE.com/menu/"),
+        canonicalizer=canonicalizer,
+    )
+    second, excluded = parse_sitemap(
+        _sitemap("http://example.com/menu?utm_campaign=spring", "https://example.com/about", "ftp://x"),
+        canonicalizer=canonicalizer,
+    )
+
+    assert first == ["https://example.com/menu"]
+    assert second == ["https://example.com/about"]
+    assert excluded == ["ftp://x"]
+    assert canonicalizer.duplicates_dropped == 2
+
+
+def test_fingerprint_set_grows_without_losing_entries() -> None:
+    fingerprints = FingerprintSet(capacity=4)
+
+    assert all(fingerprints.add(value) for value in range(1, 1001))
+    assert not fingerprints.add(500)
+    assert len(fingerprints) == 1000
+    assert 999 in fingerprints and 1001 not in fingerprints
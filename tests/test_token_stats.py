@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+
+from seo_engine.select.dishes import build_dish_taxonomy  # noqa: E402
+from seo_engine.store.token_stats import TokenStatsStore  # noqa: E402
+
+
+def test_top_unknown_tokens_across_sites_and_windows(tmp_path: Path) -> None:
+    with TokenStatsStore(str(tmp_path / "tokens.sqlite")) as store:
+        store.record_run("a.test", "r1", {"brisket": 3, "slaw": 1}, recorded_at="2026-01-01T00:00:00+00:00")
+        store.record_run("b.test", "r1", {"brisket": 2, "elote": 4}, recorded_at="2026-02-01T00:00:00+00:00")
+        store.record_run("b.test", "r1", {"brisket": 5, "elote": 4}, recorded_at="2026-02-01T00:00:00+00:00")
+
+        assert store.top_unknown_tokens(2) == [("brisket", 8, 2), ("elote", 4, 1)]
+        assert store.top_unknown_tokens(5, since="2026-01-15") == [("brisket", 5, 1), ("elote", 4, 1)]
+        assert store.token_history("brisket", site="a.test") == [("2026-01-01T00:00:00+00:00", "a.test", 3)]
+
+
+def test_rerecording_a_run_replaces_its_rows(tmp_path: Path) -> None:
+    with TokenStatsStore(str(tmp_path / "tokens.sqlite")) as store:
+        store.record_run("a.test", "r1", {"brisket": 3, "slaw": 1})
+        store.record_run("a.test", "r2", {"slaw": 2})
+        store.record_run("a.test", "r1", {"brisket": 4})
+
+        assert store.top_unknown_tokens(5) == [("brisket", 4, 1), ("slaw", 2, 1)]
+
+
+def test_build_dish_taxonomy_upserts_unknown_tokens(tmp_path: Path) -> None:
+    with TokenStatsStore(str(tmp_path / "tokens.sqlite")) as store:
+        build_dish_taxonomy(
+            ["https://example.com/items/pizzas/pepperoni", "https://example.com/items/pepperoni-slice"],
+            token_store=store,
+            site="example.com",
+            run_id="r1",
+        )
+
+        assert store.top_unknown_tokens(5) == [("pepperoni", 2, 1), ("slice", 1, 1)]
@@ -144,6 +144,9 @@ if run_clicked:
 artifacts_dir = st.session_state.get("artifacts_dir")
 
 if artifacts_dir:
+    # Resolve an ``artifacts`` link once so every file below comes from the
+    # same published generation, even if another run publishes meanwhile.
+    artifacts_dir = os.path.realpath(artifacts_dir)
     st.info(f"Artifacts saved to: {artifacts_dir}")
     locations_data = _read_json(os.path.join(artifacts_dir, "locations.json"))
     core_pages_data = _read_json(os.path.join(artifacts_dir, "core_pages.json"))